@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from wallet.core.domain import User, Wallet
+from wallet.core.services.transactions import TransactionService, TransferRequest
+from wallet.infra.pricing.static import FixedPriceProvider
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.setup import setup
+from wallet.infra.sqlite.storage import SqliteStorage
+
+BATCH_SIZES = (10, 100, 1_000, 5_000)
+WALLETS = 3
+
+
+def make_service(db_path: Path) -> TransactionService:
+    conn = connect(db_path)
+    setup(conn)
+    storage = SqliteStorage(conn)
+    with storage.uow():
+        storage.users().create(User(id="u1", api_key="k1"))
+        for i in range(WALLETS):
+            storage.wallets().create(
+                Wallet(address=f"w{i}", user_id="u1", balance_sat=10**15)
+            )
+    return TransactionService(storage=storage, price_provider=FixedPriceProvider())
+
+
+def make_transfers(n: int) -> list[TransferRequest]:
+    return [
+        TransferRequest(f"w{i % WALLETS}", f"w{(i + 1) % WALLETS}", 1_000)
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    sys.stdout.write(
+        f"{'transfers':>10} {'one-by-one tx/s':>16} {'batched tx/s':>13} "
+        f"{'speedup':>8}\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in BATCH_SIZES:
+            transfers = make_transfers(n)
+
+            service = make_service(Path(tmp) / f"single-{n}.db")
+            start = time.perf_counter()
+            for t in transfers:
+                service.transfer("u1", t.from_address, t.to_address, t.amount_sat)
+            single = time.perf_counter() - start
+
+            service = make_service(Path(tmp) / f"batch-{n}.db")
+            start = time.perf_counter()
+            service.transfer_many("u1", transfers)
+            batched = time.perf_counter() - start
+
+            sys.stdout.write(
+                f"{n:>10} {n / single:>16.0f} {n / batched:>13.0f} "
+                f"{single / batched:>7.1f}x\n"
+            )
+
+
+if __name__ == "__main__":
+    main()
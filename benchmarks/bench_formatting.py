@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import random
+import sys
+import time
+from collections.abc import Callable
+from decimal import Decimal
+
+from wallet.core.services.formatting import UsdRate, format_btc_many, format_usd_many
+from wallet.core.services.pricing import quantize_usd
+from wallet.core.services.wallets import sat_to_btc
+
+AMOUNTS = 100_000
+USD_PER_BTC = Decimal("64231.57")
+
+
+def decimal_btc(sats: list[int]) -> list[str]:
+    return [format(sat_to_btc(sat), "f") for sat in sats]
+
+
+def decimal_usd(sats: list[int]) -> list[str]:
+    return [format(quantize_usd(sat_to_btc(sat) * USD_PER_BTC), "f") for sat in sats]
+
+
+def timed_ms(fn: Callable[[], list[str]]) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    out = fn()
+    return (time.perf_counter() - start) * 1000, out
+
+
+def main() -> None:
+    rng = random.Random(0)
+    sats = [rng.randrange(0, 10**12) for _ in range(AMOUNTS)]
+    rate = UsdRate.from_decimal(USD_PER_BTC)
+
+    cases = {
+        "btc": (lambda: decimal_btc(sats), lambda: format_btc_many(sats)),
+        "usd": (lambda: decimal_usd(sats), lambda: format_usd_many(sats, rate)),
+    }
+    sys.stdout.write(
+        f"{AMOUNTS} amounts\n"
+        f"{'case':>6} {'decimal ms':>12} {'integer ms':>12} {'speedup':>8}\n"
+    )
+    for name, (reference, candidate) in cases.items():
+        decimal_ms, expected = timed_ms(reference)
+        integer_ms, actual = timed_ms(candidate)
+        if actual != expected:
+            sys.exit(f"{name}: integer formatting differs from Decimal")
+        sys.stdout.write(
+            f"{name:>6} {decimal_ms:>12.2f} {integer_ms:>12.2f} "
+            f"{decimal_ms / integer_ms:>7.1f}x\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from wallet.core.domain import User, Wallet
+from wallet.core.services.transactions import TransactionService
+from wallet.infra.pricing.static import FixedPriceProvider
+from wallet.infra.sqlite.group_commit import SqliteGroupCommitWriter
+from wallet.infra.sqlite.pool import SqliteConnectionPool
+from wallet.infra.sqlite.setup import setup
+from wallet.infra.sqlite.storage import SqliteStorage
+
+CONCURRENCY = (1, 4, 16, 64)
+TRANSFERS_PER_WORKER = 100
+WINDOWS = (0.0, 0.002)
+
+
+def seed(pool: SqliteConnectionPool, workers: int) -> None:
+    with pool.connection() as conn:
+        setup(conn)
+        storage = SqliteStorage(conn)
+        with storage.uow():
+            for i in range(workers):
+                storage.users().create(User(id=f"u{i}", api_key=f"k{i}"))
+                for side in ("a", "b"):
+                    storage.wallets().create(
+                        Wallet(
+                            address=f"w{i}{side}", user_id=f"u{i}", balance_sat=10**12
+                        )
+                    )
+
+
+def measure(workers: int, transfer: Callable[[int], None]) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(transfer, range(workers)))
+    return workers * TRANSFERS_PER_WORKER / (time.perf_counter() - start)
+
+
+def without_group_commit(db_path: Path, workers: int) -> float:
+    pool = SqliteConnectionPool(db_path=db_path, size=workers)
+    seed(pool, workers)
+
+    def transfer(i: int) -> None:
+        for _ in range(TRANSFERS_PER_WORKER):
+            with pool.connection() as conn:
+                service = TransactionService(
+                    storage=SqliteStorage(conn), price_provider=FixedPriceProvider()
+                )
+                service.transfer(f"u{i}", f"w{i}a", f"w{i}b", 1_000)
+
+    try:
+        return measure(workers, transfer)
+    finally:
+        pool.close()
+
+
+def with_group_commit(db_path: Path, workers: int, window: float) -> float:
+    pool = SqliteConnectionPool(db_path=db_path, size=1)
+    seed(pool, workers)
+    pool.close()
+    writer = SqliteGroupCommitWriter(db_path=db_path, flush_window_seconds=window)
+    writer.start()
+
+    def transfer(i: int) -> None:
+        for _ in range(TRANSFERS_PER_WORKER):
+            writer.transfer(f"u{i}", f"w{i}a", f"w{i}b", 1_000)
+
+    try:
+        return measure(workers, transfer)
+    finally:
+        writer.close()
+
+
+def main() -> None:
+    sys.stdout.write(
+        f"{TRANSFERS_PER_WORKER} transfers per worker, durable profile\n"
+        f"{'workers':>8} {'per-request tx/s':>17} "
+        + "".join(f"{f'group {w * 1000:g}ms tx/s':>18}" for w in WINDOWS)
+        + "\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in CONCURRENCY:
+            plain = without_group_commit(Path(tmp) / f"plain-{workers}.db", workers)
+            grouped = [
+                with_group_commit(Path(tmp) / f"group-{workers}-{w}.db", workers, w)
+                for w in WINDOWS
+            ]
+            sys.stdout.write(
+                f"{workers:>8} {plain:>17.0f}"
+                + "".join(f"{g:>18.0f}" for g in grouped)
+                + "\n"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from functools import partial
+from pathlib import Path
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from wallet.api.models import TransactionPageResponse, TransactionResponse
+from wallet.api.serialization import json_response
+from wallet.core.domain import Transaction
+from wallet.core.services.pricing import BtcUsdQuote
+from wallet.core.services.transactions import TransactionService
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.storage import SqliteStorage
+
+PAGE_SIZES = (10, 100, 500)
+ROUNDS = 200
+QUOTE = BtcUsdQuote(usd_per_btc=Decimal("64231.57"))
+PAGE_ADAPTER = TypeAdapter(TransactionPageResponse)
+
+
+def make_transactions(n: int) -> list[Transaction]:
+    created_at = datetime(2026, 1, 1, tzinfo=UTC)
+    return [
+        Transaction(
+            id=f"{i:08d}-0000-4000-8000-000000000000",
+            from_address="w_" + "a" * 32,
+            to_address="w_" + "b" * 32,
+            amount_sat=1_000 + i * 7_919,
+            fee_sat=15 + i,
+            created_at=created_at + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+def validated(views: list[dict[str, str | int]]) -> bytes:
+    page = TransactionPageResponse(
+        items=[TransactionResponse.model_validate(view) for view in views],
+        next_cursor="cursor",
+    )
+    content = PAGE_ADAPTER.validate_python(page.model_dump())
+    return bytes(JSONResponse(PAGE_ADAPTER.dump_python(content, mode="json")).body)
+
+
+def raw(views: list[dict[str, str | int]]) -> bytes:
+    return bytes(json_response({"items": views, "next_cursor": "cursor"}).body)
+
+
+def per_item_us(fn: Callable[[], bytes], n: int) -> tuple[float, bytes]:
+    body = fn()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - start) / ROUNDS / n * 1e6, body
+
+
+def main() -> None:
+    conn = connect(Path(":memory:"))
+    service = TransactionService(storage=SqliteStorage(conn))
+    sys.stdout.write(
+        f"{'items':>6} {'validated us':>14} {'raw us':>10} {'speedup':>8}\n"
+    )
+    for n in PAGE_SIZES:
+        views = service.tx_views(make_transactions(n), QUOTE)
+        before_us, expected = per_item_us(partial(validated, views), n)
+        after_us, actual = per_item_us(partial(raw, views), n)
+        if actual != expected:
+            sys.exit(f"{n}: raw response body differs from validated body")
+        sys.stdout.write(
+            f"{n:>6} {before_us:>14.2f} {after_us:>10.2f} "
+            f"{before_us / after_us:>7.1f}x\n"
+        )
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from wallet.core.domain import Transaction, User, Wallet
+from wallet.core.repository.storage import Storage
+from wallet.core.services.transactions import TransactionService
+from wallet.core.services.users import UserService
+from wallet.core.services.wallets import WalletService, sat_to_btc
+from wallet.infra.memory.database import MemoryDatabase
+from wallet.infra.memory.storage import MemoryStorage
+from wallet.infra.pricing.static import FixedPriceProvider
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.setup import setup
+from wallet.infra.sqlite.storage import SqliteStorage
+
+SIZES = (1_000, 100_000, 1_000_000)
+BACKENDS = ("sqlite", "memory")
+USERS = 100
+WALLETS_PER_USER = 2
+SEED_CHUNK = 10_000
+ROUNDS = 3
+WARMUP_RUNS = 10
+MIN_RUNS = 3
+MAX_RUNS = 1_000
+MIN_SECONDS = 0.2
+DEFAULT_TOLERANCE = 0.25
+MIN_DELTA_US = 5.0
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+EPOCH = datetime(2024, 1, 1, tzinfo=UTC)
+CASES = (
+    "transfer",
+    "list_user_transactions",
+    "platform_profit_sat",
+    "wallet_view",
+    "register",
+    "register_many_100",
+    "sat_to_btc",
+)
+
+Dataset = Callable[[], AbstractContextManager[Storage]]
+
+
+@dataclass(frozen=True)
+class Measurement:
+    median_us: float
+    runs: int
+
+
+@contextmanager
+def open_dataset(backend: str, tmp: Path, size: int) -> Iterator[Dataset]:
+    if backend == "memory":
+        db = MemoryDatabase()
+        seed(MemoryStorage(db), size)
+        yield lambda: nullcontext(MemoryStorage(clone_memory(db)))
+        return
+
+    conn = connect(tmp / f"services-{size}.db")
+    setup(conn)
+    seed(SqliteStorage(conn), size)
+
+    @contextmanager
+    def copy() -> Iterator[Storage]:
+        path = tmp / f"services-{size}-case.db"
+        target = connect(path)
+        conn.backup(target)
+        try:
+            yield SqliteStorage(target)
+        finally:
+            target.close()
+            path.unlink()
+
+    try:
+        yield copy
+    finally:
+        conn.close()
+
+
+def clone_memory(db: MemoryDatabase) -> MemoryDatabase:
+    return MemoryDatabase(
+        users=dict(db.users),
+        user_ids_by_api_key=dict(db.user_ids_by_api_key),
+        wallets=dict(db.wallets),
+        addresses_by_owner={k: dict(v) for k, v in db.addresses_by_owner.items()},
+        transactions=dict(db.transactions),
+        transactions_by_address={
+            k: list(v) for k, v in db.transactions_by_address.items()
+        },
+        stats=db.stats,
+        rollups=dict(db.rollups),
+    )
+
+
+def seed(storage: Storage, size: int) -> None:
+    wallets = [
+        Wallet(address=f"w{u}-{i}", user_id=f"u{u}", balance_sat=10**15)
+        for u in range(USERS)
+        for i in range(WALLETS_PER_USER)
+    ]
+    addresses = [w.address for w in wallets]
+    with storage.uow():
+        for u in range(USERS):
+            storage.users().create(User(id=f"u{u}", api_key=f"k{u}"))
+        for wallet in wallets:
+            storage.wallets().create(wallet)
+
+    for start in range(0, size, SEED_CHUNK):
+        with storage.uow():
+            storage.transactions().create_many(
+                Transaction(
+                    id=f"t{i}",
+                    from_address=addresses[i % len(addresses)],
+                    to_address=addresses[(i + 1) % len(addresses)],
+                    amount_sat=1_000 + i % 1_000,
+                    fee_sat=15,
+                    created_at=EPOCH + timedelta(seconds=i),
+                )
+                for i in range(start, min(start + SEED_CHUNK, size))
+            )
+
+
+def measure(fn: Callable[[], object]) -> Measurement:
+    samples: list[float] = []
+    for _ in range(WARMUP_RUNS):
+        fn()
+    gc.collect()
+    gc.disable()
+    try:
+        deadline = time.perf_counter() + MIN_SECONDS
+        while len(samples) < MIN_RUNS or (
+            len(samples) < MAX_RUNS and time.perf_counter() < deadline
+        ):
+            start = time.perf_counter_ns()
+            fn()
+            samples.append((time.perf_counter_ns() - start) / 1_000)
+    finally:
+        gc.enable()
+    return Measurement(median_us=statistics.median(samples), runs=len(samples))
+
+
+def case_functions(storage: Storage) -> dict[str, Callable[[], object]]:
+    price_provider = FixedPriceProvider()
+    tx_service = TransactionService(storage=storage, price_provider=price_provider)
+    wallet_service = WalletService(storage=storage, price_provider=price_provider)
+    user_service = UserService(storage=storage)
+    wallet = storage.wallets().read("w0-0")
+
+    return {
+        "transfer": lambda: tx_service.transfer("u0", "w0-0", "w1-0", 1_000),
+        "list_user_transactions": lambda: tx_service.list_user_transactions("u0"),
+        "platform_profit_sat": tx_service.platform_profit_sat,
+        "wallet_view": lambda: wallet_service.wallet_view(wallet),
+        "register": user_service.register,
+        "register_many_100": lambda: user_service.register_many(100),
+        "sat_to_btc": lambda: sat_to_btc(123_456_789),
+    }
+
+
+def run(backends: list[str], sizes: list[int]) -> dict[str, Measurement]:
+    results: dict[str, Measurement] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            for size in sizes:
+                rounds: dict[str, list[Measurement]] = {case: [] for case in CASES}
+                with open_dataset(backend, Path(tmp), size) as dataset:
+                    for _ in range(ROUNDS):
+                        for case in CASES:
+                            with dataset() as storage:
+                                fn = case_functions(storage)[case]
+                                rounds[case].append(measure(fn))
+                for case, measurements in rounds.items():
+                    m = sorted(measurements, key=lambda m: m.median_us)[ROUNDS // 2]
+                    key = f"{backend}/{case}/{size}"
+                    results[key] = m
+                    sys.stdout.write(
+                        f"{key:<40} {m.median_us:>12.1f} us {m.runs:>6} runs\n"
+                    )
+    return results
+
+
+def compare(
+    results: dict[str, Measurement], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    regressions: list[str] = []
+    for key, m in results.items():
+        expected = baseline["results"].get(key)
+        if expected is None:
+            continue
+        ratio = m.median_us / expected["median_us"]
+        if ratio > 1 + tolerance and m.median_us - expected["median_us"] > MIN_DELTA_US:
+            regressions.append(
+                f"{key}: {m.median_us:.1f} us vs {expected['median_us']:.1f} us "
+                f"baseline ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def python_minor(version: str) -> str:
+    return ".".join(version.split(".")[:2])
+
+
+def to_json(results: dict[str, Measurement]) -> dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {
+            key: {"median_us": round(m.median_us, 3), "runs": m.runs}
+            for key, m in sorted(results.items())
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Service-layer benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument(
+        "--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS)
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.backends, args.sizes)
+    document = to_json(results)
+    if args.output is not None:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+        return
+    if not args.baseline.exists():
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    if python_minor(baseline["python"]) != python_minor(platform.python_version()):
+        sys.stdout.write(
+            f"WARNING baseline was recorded on Python {baseline['python']}, "
+            f"not {platform.python_version()}\n"
+        )
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        sys.stdout.write(f"REGRESSION {line}\n")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
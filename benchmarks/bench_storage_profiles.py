@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from wallet.core.domain import User, Wallet
+from wallet.core.services.transactions import TransactionService
+from wallet.infra.pricing.static import FixedPriceProvider
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.setup import setup
+from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.settings import STORAGE_PROFILES, StorageProfile
+
+TRANSFERS = 2_000
+WALLETS = 100
+
+
+def run_transfers(db_path: Path, profile: StorageProfile) -> float:
+    conn = connect(db_path, profile)
+    setup(conn)
+    storage = SqliteStorage(conn)
+    with storage.uow():
+        for i in range(WALLETS):
+            storage.users().create(User(id=f"u{i}", api_key=f"k{i}"))
+            storage.wallets().create(
+                Wallet(address=f"w{i}", user_id=f"u{i}", balance_sat=10**12)
+            )
+
+    service = TransactionService(storage=storage, price_provider=FixedPriceProvider())
+    start = time.perf_counter()
+    for i in range(TRANSFERS):
+        src = i % WALLETS
+        dst = (i + 1) % WALLETS
+        service.transfer(f"u{src}", f"w{src}", f"w{dst}", 1_000)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def main() -> None:
+    sys.stdout.write(f"{TRANSFERS} transfers, one commit each\n")
+    sys.stdout.write(f"{'profile':>12} {'seconds':>9} {'tx/s':>9}\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, profile in STORAGE_PROFILES.items():
+            elapsed = run_transfers(Path(tmp) / f"{name}.db", profile)
+            sys.stdout.write(
+                f"{name:>12} {elapsed:>9.3f} {TRANSFERS / elapsed:>9.0f}\n"
+            )
+
+
+if __name__ == "__main__":
+    main()
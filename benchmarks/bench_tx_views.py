@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import sys
+import time
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+
+from wallet.core.domain import Transaction
+from wallet.core.services.pricing import BtcUsdQuote, PriceProvider
+from wallet.core.services.transactions import TransactionService
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.storage import SqliteStorage
+
+LIST_LENGTHS = (1, 10, 100, 500, 1000)
+PRICE_LATENCY_SECONDS = 0.002
+
+
+class SlowPriceProvider(PriceProvider):
+    def btc_usd(self) -> BtcUsdQuote:
+        time.sleep(PRICE_LATENCY_SECONDS)
+        return BtcUsdQuote(usd_per_btc=Decimal("50000.00"))
+
+
+def make_transactions(n: int) -> list[Transaction]:
+    created_at = datetime(2026, 1, 1, tzinfo=UTC)
+    return [
+        Transaction(
+            id=f"t{i}",
+            from_address="w1",
+            to_address="w2",
+            amount_sat=1_000 + i,
+            fee_sat=15,
+            created_at=created_at,
+        )
+        for i in range(n)
+    ]
+
+
+def per_row(service: TransactionService, txs: list[Transaction]) -> None:
+    for tx in txs:
+        service.tx_view(tx)
+
+
+def batched(service: TransactionService, txs: list[Transaction]) -> None:
+    service.tx_views(txs)
+
+
+def main() -> None:
+    conn = connect(Path(":memory:"))
+    service = TransactionService(
+        storage=SqliteStorage(conn), price_provider=SlowPriceProvider()
+    )
+
+    sys.stdout.write(
+        f"price latency {PRICE_LATENCY_SECONDS * 1000:.1f} ms\n"
+        f"{'txs':>6} {'per-row ms':>12} {'batched ms':>12} {'speedup':>8}\n"
+    )
+    for n in LIST_LENGTHS:
+        txs = make_transactions(n)
+
+        start = time.perf_counter()
+        per_row(service, txs)
+        per_row_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        batched(service, txs)
+        batched_ms = (time.perf_counter() - start) * 1000
+
+        sys.stdout.write(
+            f"{n:>6} {per_row_ms:>12.2f} {batched_ms:>12.2f} "
+            f"{per_row_ms / batched_ms:>7.1f}x\n"
+        )
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
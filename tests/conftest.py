@@ -1,17 +1,25 @@
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from dataclasses import replace
 from decimal import Decimal
 from pathlib import Path
 from sqlite3 import Connection
+from typing import Any
 
 import pytest
+from fastapi.testclient import TestClient
 
+from wallet.api.app import create_app
+from wallet.core.repository.storage import Storage
 from wallet.core.services.pricing import BtcUsdQuote, PriceProvider
 from wallet.core.services.transactions import TransactionService
 from wallet.core.services.users import UserService
 from wallet.core.services.wallets import WalletService
+from wallet.infra.memory.database import MemoryDatabase
+from wallet.infra.memory.storage import MemoryStorage
 from wallet.infra.sqlite.connection import connect
 from wallet.infra.sqlite.setup import setup
 from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.settings import Settings
 
 
 @pytest.fixture
@@ -23,9 +31,11 @@ def connection(tmp_path: Path) -> Generator[Connection]:
     conn.close()
 
 
-@pytest.fixture
-def storage(connection: Connection) -> SqliteStorage:
-    return SqliteStorage(connection)
+@pytest.fixture(params=["sqlite", "memory"])
+def storage(request: pytest.FixtureRequest) -> Storage:
+    if request.param == "memory":
+        return MemoryStorage(MemoryDatabase())
+    return SqliteStorage(request.getfixturevalue("connection"))
 
 
 class FakePriceProvider(PriceProvider):
@@ -33,16 +43,30 @@ class FakePriceProvider(PriceProvider):
         return BtcUsdQuote(usd_per_btc=Decimal("50000.00"))
 
 
+AppClient = Callable[..., TestClient]
+
+
+@pytest.fixture
+def app_client(tmp_path: Path) -> AppClient:
+    def build(**overrides: Any) -> TestClient:
+        settings = Settings(
+            database_path=tmp_path / "app.db", stub_usd_per_btc=Decimal("50000.00")
+        )
+        return TestClient(create_app(replace(settings, **overrides)))
+
+    return build
+
+
 @pytest.fixture
-def wallet_service(storage: SqliteStorage) -> WalletService:
+def wallet_service(storage: Storage) -> WalletService:
     return WalletService(storage=storage, price_provider=FakePriceProvider())
 
 
 @pytest.fixture
-def user_service(storage: SqliteStorage) -> UserService:
+def user_service(storage: Storage) -> UserService:
     return UserService(storage=storage)
 
 
 @pytest.fixture
-def tx_service(storage: SqliteStorage) -> TransactionService:
+def tx_service(storage: Storage) -> TransactionService:
     return TransactionService(storage=storage, price_provider=FakePriceProvider())
@@ -1,11 +1,20 @@
+import asyncio
+import json
 from decimal import Decimal
 from pathlib import Path
 
+import pytest
 from fastapi.testclient import TestClient
 
 from wallet.api.app import create_app
 from wallet.api.dependencies import get_price_provider
-from wallet.core.services.pricing import BtcUsdQuote, PriceProvider
+from wallet.api.models import (
+    TransactionBatchResponse,
+    TransactionPageResponse,
+    WalletBatchResponse,
+)
+from wallet.core.services.pricing import AsyncPriceProvider, BtcUsdQuote, PriceProvider
+from wallet.infra.sqlite.factory import SqliteStorageFactory
 from wallet.settings import Settings
 
 
@@ -14,13 +23,45 @@ class FakePriceProvider(PriceProvider):
         return BtcUsdQuote(usd_per_btc=Decimal("50000.00"))
 
 
+class SlowAsyncPriceProvider(AsyncPriceProvider):
+    async def btc_usd(self) -> BtcUsdQuote:
+        await asyncio.sleep(0.01)
+        return BtcUsdQuote(usd_per_btc=Decimal("50000.00"))
+
+
 def test_full_api_flow(tmp_path: Path) -> None:
     settings = Settings(database_path=tmp_path / "api.db", admin_api_key="ADMIN")
     app = create_app(settings)
     app.dependency_overrides[get_price_provider] = lambda: FakePriceProvider()
 
-    client = TestClient(app)
+    with TestClient(app) as client:
+        _run_full_api_flow(client)
+
+
+def test_full_api_flow_with_async_price_provider(tmp_path: Path) -> None:
+    settings = Settings(database_path=tmp_path / "api.db", admin_api_key="ADMIN")
+    app = create_app(settings)
+    app.dependency_overrides[get_price_provider] = lambda: SlowAsyncPriceProvider()
+
+    with TestClient(app) as client:
+        _run_full_api_flow(client)
+
 
+def test_full_api_flow_with_memory_storage(tmp_path: Path) -> None:
+    settings = Settings(
+        database_path=tmp_path / "unused.db",
+        admin_api_key="ADMIN",
+        storage_backend="memory",
+    )
+    app = create_app(settings)
+    app.dependency_overrides[get_price_provider] = lambda: FakePriceProvider()
+
+    with TestClient(app) as client:
+        _run_full_api_flow(client)
+    assert not (tmp_path / "unused.db").exists()
+
+
+def _run_full_api_flow(client: TestClient) -> None:
     r = client.post("/users")
     assert r.status_code == 200
     user_id = r.json()["user_id"]
@@ -62,12 +103,13 @@ def test_full_api_flow(tmp_path: Path) -> None:
 
     r = client.get("/transactions", headers=headers)
     assert r.status_code == 200
-    txs = r.json()
+    txs = r.json()["items"]
     assert len(txs) == 1
+    assert r.json()["next_cursor"] is None
 
     r = client.get(f"/wallets/{w1['address']}/transactions", headers=headers)
     assert r.status_code == 200
-    assert len(r.json()) == 1
+    assert len(r.json()["items"]) == 1
 
     r = client.get("/statistics", headers={"X-API-KEY": "NOT_ADMIN"})
     assert r.status_code == 403
@@ -77,3 +119,212 @@ def test_full_api_flow(tmp_path: Path) -> None:
     stats = r.json()
     assert stats["total_transactions"] == 1
     assert stats["platform_profit_sat"] == 0
+
+
+def test_export_transactions(tmp_path: Path) -> None:
+    settings = Settings(database_path=tmp_path / "api.db", admin_api_key="ADMIN")
+    app = create_app(settings)
+    app.dependency_overrides[get_price_provider] = lambda: FakePriceProvider()
+
+    with TestClient(app) as client:
+        api_key = client.post("/users").json()["api_key"]
+        headers = {"X-API-KEY": api_key}
+        w1 = client.post("/wallets", headers=headers).json()["address"]
+        w2 = client.post("/wallets", headers=headers).json()["address"]
+        for amount in (1_000, 2_000, 3_000):
+            client.post(
+                "/transactions",
+                headers=headers,
+                json={"from_address": w1, "to_address": w2, "amount_sat": amount},
+            )
+
+        r = client.get("/transactions/export", headers=headers)
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in r.text.splitlines()]
+        assert [row["amount_sat"] for row in rows] == [1_000, 2_000, 3_000]
+        assert rows == client.get("/transactions", headers=headers).json()["items"]
+
+        r = client.get(
+            f"/wallets/{w2}/transactions/export",
+            headers=headers,
+            params={"format": "csv"},
+        )
+        assert r.status_code == 200
+        lines = r.text.splitlines()
+        assert lines[0].startswith("id,from_address,to_address,amount_sat")
+        assert len(lines) == 4
+
+        r = client.get("/wallets/w_missing/transactions/export", headers=headers)
+        assert r.status_code == 404
+
+
+def test_statistics_buckets(tmp_path: Path) -> None:
+    settings = Settings(database_path=tmp_path / "api.db", admin_api_key="ADMIN")
+    app = create_app(settings)
+    app.dependency_overrides[get_price_provider] = lambda: FakePriceProvider()
+
+    with TestClient(app) as client:
+        headers = {"X-API-KEY": client.post("/users").json()["api_key"]}
+        other = {"X-API-KEY": client.post("/users").json()["api_key"]}
+        w1 = client.post("/wallets", headers=headers).json()["address"]
+        w2 = client.post("/wallets", headers=other).json()["address"]
+        client.post(
+            "/transactions",
+            headers=headers,
+            json={"from_address": w1, "to_address": w2, "amount_sat": 100_000},
+        )
+
+        admin = {"X-API-KEY": "ADMIN"}
+        r = client.get("/statistics", headers=admin, params={"granularity": "day"})
+        assert r.status_code == 200
+        buckets = r.json()["buckets"]
+        assert len(buckets) == 1
+        assert buckets[0]["total_transactions"] == 1
+        assert buckets[0]["platform_profit_sat"] == r.json()["platform_profit_sat"]
+
+        r = client.get(
+            "/statistics",
+            headers=admin,
+            params={"granularity": "hour", "to": "2000-01-01T00:00:00Z"},
+        )
+        assert r.json()["buckets"] == []
+
+        r = client.get("/statistics", headers=admin, params={"from": "2000-01-01"})
+        assert r.status_code == 400
+
+
+def test_batch_transactions(tmp_path: Path) -> None:
+    settings = Settings(database_path=tmp_path / "api.db", admin_api_key="ADMIN")
+    app = create_app(settings)
+    app.dependency_overrides[get_price_provider] = lambda: FakePriceProvider()
+
+    with TestClient(app) as client:
+        headers = {"X-API-KEY": client.post("/users").json()["api_key"]}
+        w1 = client.post("/wallets", headers=headers).json()["address"]
+        w2 = client.post("/wallets", headers=headers).json()["address"]
+
+        transfers = [
+            {"from_address": w1, "to_address": w2, "amount_sat": 1_000},
+            {"from_address": w1, "to_address": "missing", "amount_sat": 1_000},
+        ]
+        r = client.post(
+            "/transactions/batch", headers=headers, json={"transfers": transfers}
+        )
+        assert r.status_code == 404
+
+        r = client.post(
+            "/transactions/batch",
+            headers=headers,
+            json={"transfers": transfers, "mode": "per_item"},
+        )
+        assert r.status_code == 200
+        results = r.json()["results"]
+        assert results[0]["transaction"]["amount_sat"] == 1_000
+        assert results[1]["transaction"] is None
+        assert results[1]["error"] == "Wallet not found"
+
+
+def test_batch_provisioning(tmp_path: Path) -> None:
+    settings = Settings(database_path=tmp_path / "api.db", admin_api_key="ADMIN")
+    app = create_app(settings)
+    app.dependency_overrides[get_price_provider] = lambda: FakePriceProvider()
+    admin = {"X-API-KEY": "ADMIN"}
+
+    with TestClient(app) as client:
+        assert client.post("/users/batch", json={"count": 2}).status_code == 403
+        r = client.post("/users/batch", headers=admin, json={"count": 2})
+        assert r.status_code == 200
+        users = r.json()["users"]
+        assert len(users) == 2
+
+        user_ids = [users[0]["user_id"], users[0]["user_id"], users[1]["user_id"]]
+        r = client.post("/wallets/batch", headers=admin, json={"user_ids": user_ids})
+        assert r.status_code == 200
+        wallets = r.json()["wallets"]
+        assert [w["user_id"] for w in wallets] == user_ids
+        assert wallets[0]["balance_usd"] == "50000.00"
+
+        headers = {"X-API-KEY": users[0]["api_key"]}
+        r = client.get(f"/wallets/{wallets[0]['address']}", headers=headers)
+        assert r.status_code == 200
+
+        r = client.post(
+            "/wallets/batch", headers=admin, json={"user_ids": user_ids[:2]}
+        )
+        assert r.status_code == 409
+        assert (
+            client.post("/users/batch", headers=admin, json={"count": 0}).status_code
+            == 400
+        )
+
+
+def test_transactions_with_group_commit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = Settings(database_path=tmp_path / "api.db", group_commit=True)
+    app = create_app(settings)
+    app.dependency_overrides[get_price_provider] = lambda: FakePriceProvider()
+
+    def no_write_connection() -> None:
+        raise AssertionError("group-committed transfers must not use the write pool")
+
+    with TestClient(app) as client:
+        headers = {"X-API-KEY": client.post("/users").json()["api_key"]}
+        w1 = client.post("/wallets", headers=headers).json()["address"]
+        w2 = client.post("/wallets", headers=headers).json()["address"]
+        factory: SqliteStorageFactory = app.state.storage_factory
+        monkeypatch.setattr(factory.write_pool, "acquire", no_write_connection)
+
+        payload = {"from_address": w1, "to_address": w2, "amount_sat": 1_000}
+        r = client.post("/transactions", headers=headers, json=payload)
+        assert r.status_code == 200
+        assert r.json()["amount_sat"] == 1_000
+
+        payload["amount_sat"] = 10**12
+        r = client.post("/transactions", headers=headers, json=payload)
+        assert r.status_code == 400
+
+
+def test_raw_json_responses_match_response_models(tmp_path: Path) -> None:
+    settings = Settings(database_path=tmp_path / "api.db", admin_api_key="ADMIN")
+    app = create_app(settings)
+    app.dependency_overrides[get_price_provider] = lambda: FakePriceProvider()
+
+    with TestClient(app) as client:
+        user = client.post("/users").json()
+        headers = {"X-API-KEY": user["api_key"]}
+        r = client.post(
+            "/wallets/batch",
+            headers={"X-API-KEY": "ADMIN"},
+            json={"user_ids": [user["user_id"], user["user_id"]]},
+        )
+        assert r.headers["content-type"] == "application/json"
+        assert r.content == (
+            WalletBatchResponse.model_validate_json(r.content)
+            .model_dump_json()
+            .encode()
+        )
+        w1, w2 = (w["address"] for w in r.json()["wallets"])
+
+        transfers = [
+            {"from_address": w1, "to_address": w2, "amount_sat": 1_000},
+            {"from_address": w1, "to_address": w1, "amount_sat": 1_000},
+        ]
+        r = client.post(
+            "/transactions/batch",
+            headers=headers,
+            json={"transfers": transfers, "mode": "per_item"},
+        )
+        assert r.content == (
+            TransactionBatchResponse.model_validate_json(r.content)
+            .model_dump_json()
+            .encode()
+        )
+
+        for path in ("/transactions", f"/wallets/{w1}/transactions"):
+            r = client.get(path, headers=headers, params={"limit": 1})
+            assert r.headers["content-type"] == "application/json"
+            page = TransactionPageResponse.model_validate_json(r.content)
+            assert r.content == page.model_dump_json().encode()
+            assert [tx.amount_sat for tx in page.items] == [1_000]
@@ -0,0 +1,182 @@
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from wallet.api.app import create_app
+from wallet.core.domain import User
+from wallet.core.repository.storage import Storage, StorageFactory
+from wallet.core.services.api_keys import ApiKeyCache
+from wallet.infra.memory.database import MemoryDatabase
+from wallet.infra.memory.storage import MemoryStorage
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.setup import setup
+from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.settings import Settings
+
+STUB_PRICE = Decimal("50000.00")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_their_ttl() -> None:
+    clock = FakeClock()
+    cache = ApiKeyCache(ttl_seconds=10, negative_ttl_seconds=1, clock=clock)
+    cache.put("k1", User(id="u1", api_key="k1"), cache.generation)
+    cache.put("bad", None, cache.generation)
+
+    clock.now = 2
+    entry = cache.get("k1")
+    assert entry is not None
+    assert entry.user == User(id="u1", api_key="k1")
+    assert cache.get("bad") is None
+
+    clock.now = 11
+    assert cache.get("k1") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = ApiKeyCache(max_size=2)
+    for i in range(2):
+        cache.put(f"k{i}", User(id=f"u{i}", api_key=f"k{i}"), cache.generation)
+    assert cache.get("k0") is not None
+
+    cache.put("k2", User(id="u2", api_key="k2"), cache.generation)
+
+    assert cache.get("k1") is None
+    assert cache.get("k0") is not None
+    assert cache.get("k2") is not None
+
+
+def test_put_is_dropped_after_a_concurrent_invalidation() -> None:
+    cache = ApiKeyCache()
+    generation = cache.generation
+    cache.invalidate_user("u1")
+
+    cache.put("k1", User(id="u1", api_key="k1"), generation)
+
+    assert cache.get("k1") is None
+
+
+def test_new_key_only_discards_fills_of_that_key() -> None:
+    cache = ApiKeyCache()
+    generation = cache.generation
+    cache.invalidate_key("k2")
+
+    cache.put("k1", User(id="u1", api_key="k1"), generation)
+    cache.put("k2", None, generation)
+
+    assert cache.get("k1") is not None
+    assert cache.get("k2") is None
+
+
+def test_forgotten_key_invalidations_still_discard_older_fills() -> None:
+    cache = ApiKeyCache(max_size=1)
+    generation = cache.generation
+    cache.invalidate_key("k1")
+    cache.invalidate_key("k2")
+
+    cache.put("k1", None, generation)
+    cache.put("k3", User(id="u3", api_key="k3"), cache.generation)
+
+    assert cache.get("k1") is None
+    assert cache.get("k3") is not None
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "memory"])
+def test_user_writes_invalidate_cached_keys(tmp_path: Path, backend: str) -> None:
+    cache = ApiKeyCache()
+    storage: Storage
+    if backend == "memory":
+        storage = MemoryStorage(MemoryDatabase(), cache)
+    else:
+        conn = connect(tmp_path / "keys.db")
+        setup(conn)
+        storage = SqliteStorage(conn, cache)
+
+    with storage.uow():
+        storage.users().create(User(id="u1", api_key="k1"))
+        cache.put("k1", None, cache.generation)
+    assert cache.get("k1") is None
+
+    with storage.uow():
+        storage.users().update(User(id="u1", api_key="k2"))
+        cache.put("k1", User(id="u1", api_key="k1"), cache.generation)
+        cache.put("k2", None, cache.generation)
+    assert cache.get("k1") is None
+    assert cache.get("k2") is None
+
+    with storage.uow():
+        storage.users().delete("u1")
+        cache.put("k2", User(id="u1", api_key="k2"), cache.generation)
+    assert cache.get("k2") is None
+
+
+def test_key_revoked_during_a_concurrent_lookup_stops_authenticating(
+    tmp_path: Path,
+) -> None:
+    settings = Settings(database_path=tmp_path / "auth.db", stub_usd_per_btc=STUB_PRICE)
+    app = create_app(settings)
+
+    with TestClient(app) as client:
+        user = client.post("/users").json()
+        old = {"X-API-KEY": user["api_key"]}
+
+        factory: StorageFactory = app.state.storage_factory
+        with factory.storage("write") as storage, storage.uow():
+            storage.users().update(User(id=user["user_id"], api_key="rotated"))
+            assert client.get("/transactions", headers=old).status_code == 200
+
+        assert client.get("/transactions", headers=old).status_code == 401
+        rotated = client.get("/transactions", headers={"X-API-KEY": "rotated"})
+        assert rotated.status_code == 200
+
+
+def test_authenticated_requests_hit_the_cache(tmp_path: Path) -> None:
+    settings = Settings(
+        database_path=tmp_path / "auth.db", debug=True, stub_usd_per_btc=STUB_PRICE
+    )
+    app = create_app(settings)
+
+    with TestClient(app) as client:
+        api_key = client.post("/users").json()["api_key"]
+        headers = {"X-API-KEY": api_key}
+        first = client.post("/wallets", headers=headers)
+        second = client.post("/wallets", headers=headers)
+        invalid = [client.post("/wallets", headers={"X-API-KEY": "nope"})]
+        invalid.append(client.post("/wallets", headers={"X-API-KEY": "nope"}))
+
+        cache: ApiKeyCache = app.state.api_keys
+        entry = cache.get("nope")
+
+    assert first.status_code == second.status_code == 200
+    statements = int(first.headers["X-SQL-Statements"])
+    assert int(second.headers["X-SQL-Statements"]) < statements
+    assert [r.status_code for r in invalid] == [401, 401]
+    assert invalid[1].headers["X-SQL-Statements"] == "0"
+    assert entry is not None
+    assert entry.user is None
+
+
+def test_cache_can_be_disabled(tmp_path: Path) -> None:
+    settings = Settings(
+        database_path=tmp_path / "auth.db",
+        api_key_cache_size=0,
+        stub_usd_per_btc=STUB_PRICE,
+    )
+    app = create_app(settings)
+
+    with TestClient(app) as client:
+        api_key = client.post("/users").json()["api_key"]
+        r = client.post("/wallets", headers={"X-API-KEY": api_key})
+        assert app.state.api_keys is None
+
+    assert r.status_code == 200
@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from wallet.core.services.formatting import (
+    UsdRate,
+    format_btc,
+    format_btc_many,
+    format_usd,
+    format_usd_many,
+    usd_cents,
+)
+from wallet.core.services.pricing import BtcUsdQuote, quantize_usd
+from wallet.core.services.wallets import sat_to_btc
+
+MAX_SUPPLY_SAT = 21_000_000 * 100_000_000
+
+sats = st.integers(min_value=-MAX_SUPPLY_SAT, max_value=MAX_SUPPLY_SAT)
+rates = st.decimals(
+    min_value=Decimal("-10000000"),
+    max_value=Decimal("10000000"),
+    places=4,
+    allow_nan=False,
+    allow_infinity=False,
+) | st.decimals(
+    min_value=Decimal("0"),
+    max_value=Decimal("1000000"),
+    allow_nan=False,
+    allow_infinity=False,
+).map(lambda d: d.normalize())
+
+
+def decimal_usd(sat: int, usd_per_btc: Decimal) -> str:
+    return format(quantize_usd(sat_to_btc(sat) * usd_per_btc), "f")
+
+
+@given(sats)
+def test_format_btc_matches_decimal(sat: int) -> None:
+    assert format_btc(sat) == format(sat_to_btc(sat), "f")
+
+
+@given(sats, rates)
+def test_format_usd_matches_decimal(sat: int, usd_per_btc: Decimal) -> None:
+    assert format_usd(sat, UsdRate.from_decimal(usd_per_btc)) == decimal_usd(
+        sat, usd_per_btc
+    )
+
+
+@given(st.lists(sats, max_size=20), rates)
+def test_batch_api_matches_single_values(sats: list[int], usd_per_btc: Decimal) -> None:
+    rate = UsdRate.from_decimal(usd_per_btc)
+    assert format_btc_many(sats) == [format_btc(s) for s in sats]
+    assert format_usd_many(sats, rate) == [format_usd(s, rate) for s in sats]
+
+
+@pytest.mark.parametrize(
+    ("sat", "usd_per_btc", "expected"),
+    [
+        (0, "50000.00", "0.00"),
+        (1, "50000.00", "0.00"),
+        (10, "50000", "0.01"),
+        (15_000, "0.1", "0.00"),
+        (50_000_000, "0.01", "0.01"),
+        (-10, "50000", "-0.01"),
+        (-1, "50000", "-0.00"),
+        (100_000_000, "1E+3", "1000.00"),
+    ],
+)
+def test_format_usd_rounds_half_up(sat: int, usd_per_btc: str, expected: str) -> None:
+    rate = UsdRate.from_decimal(Decimal(usd_per_btc))
+    assert format_usd(sat, rate) == expected
+    assert format_usd(sat, rate) == decimal_usd(sat, Decimal(usd_per_btc))
+
+
+def test_quote_converts_its_rate_once() -> None:
+    quote = BtcUsdQuote(usd_per_btc=Decimal("64231.57"))
+    assert quote.usd_rate is quote.usd_rate
+    assert quote.usd_rate == UsdRate.from_decimal(Decimal("64231.57"))
+    assert quote == BtcUsdQuote(usd_per_btc=Decimal("64231.57"))
+
+
+def test_negative_zero_rate_keeps_its_sign() -> None:
+    rate = UsdRate.from_decimal(Decimal("-0.00"))
+    assert format_usd(1, rate) == decimal_usd(1, Decimal("-0.00")) == "-0.00"
+    assert format_usd(-1, rate) == decimal_usd(-1, Decimal("-0.00")) == "0.00"
+
+
+def test_usd_cents_and_invalid_rates() -> None:
+    assert usd_cents(123_456_789, UsdRate.from_decimal(Decimal("50000.00"))) == 6172839
+    with pytest.raises(ValueError, match="Unsupported"):
+        UsdRate.from_decimal(Decimal("NaN"))
+    with pytest.raises(ValueError, match="Unsupported"):
+        UsdRate.from_decimal(Decimal("Infinity"))
@@ -0,0 +1,108 @@
+import queue
+import threading
+from collections.abc import Generator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from wallet.core.domain import Transaction, User, Wallet
+from wallet.core.errors import InsufficientFundsError, NotFoundError, ValidationError
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.group_commit import SqliteGroupCommitWriter
+from wallet.infra.sqlite.setup import setup
+from wallet.infra.sqlite.storage import SqliteStorage
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    path = tmp_path / "group.db"
+    conn = connect(path)
+    setup(conn)
+    storage = SqliteStorage(conn)
+    with storage.uow():
+        storage.users().create(User(id="u1", api_key="k1"))
+        storage.users().create(User(id="u2", api_key="k2"))
+        storage.wallets().create(Wallet(address="w1", user_id="u1", balance_sat=1000))
+        storage.wallets().create(Wallet(address="w2", user_id="u2", balance_sat=0))
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def writer(db_path: Path) -> Generator[SqliteGroupCommitWriter]:
+    writer = SqliteGroupCommitWriter(db_path=db_path, flush_window_seconds=0.05)
+    writer.start()
+    yield writer
+    writer.close()
+
+
+def test_concurrent_transfers_get_their_own_results(
+    writer: SqliteGroupCommitWriter, db_path: Path
+) -> None:
+    requests = [
+        ("u1", "w1", "w2", 100),
+        ("u1", "w1", "w2", 5_000),
+        ("u2", "w1", "w2", 100),
+        ("u1", "w1", "w2", 200),
+    ]
+    with ThreadPoolExecutor(max_workers=len(requests)) as pool:
+        futures = [pool.submit(writer.transfer, *r) for r in requests]
+
+    outcomes = []
+    for future in futures:
+        error = future.exception()
+        outcomes.append(type(error) if error else future.result().amount_sat)
+    assert outcomes == [100, InsufficientFundsError, NotFoundError, 200]
+
+    conn = connect(db_path)
+    storage = SqliteStorage(conn)
+    assert storage.wallets().read("w1").balance_sat == 700
+    assert storage.transactions().count() == 2
+    conn.close()
+
+
+def test_invalid_transfer_fails_fast(writer: SqliteGroupCommitWriter) -> None:
+    with pytest.raises(ValidationError):
+        writer.transfer("u1", "w1", "w1", 100)
+
+
+def test_closed_writer_rejects_transfers(writer: SqliteGroupCommitWriter) -> None:
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.transfer("u1", "w1", "w2", 100)
+
+
+class ClosingQueue(queue.Queue[object]):
+    def __init__(self, writer: SqliteGroupCommitWriter) -> None:
+        super().__init__()
+        self.writer = writer
+        self.closing: threading.Thread | None = None
+
+    def put(
+        self, item: object, block: bool = True, timeout: float | None = None
+    ) -> None:
+        if self.closing is None:
+            self.closing = threading.Thread(target=self.writer.close)
+            self.closing.start()
+            self.closing.join(timeout=0.2)
+        super().put(item, block, timeout)
+
+
+def test_close_racing_a_transfer_does_not_strand_it(db_path: Path) -> None:
+    writer = SqliteGroupCommitWriter(db_path=db_path)
+    closing = ClosingQueue(writer)
+    writer._queue = closing
+    writer.start()
+
+    result: Future[Transaction] = Future()
+    threading.Thread(
+        target=lambda: result.set_result(writer.transfer("u1", "w1", "w2", 100)),
+        daemon=True,
+    ).start()
+
+    assert result.result(timeout=5).amount_sat == 100
+
+    assert closing.closing is not None
+    closing.closing.join(timeout=5)
+    assert not closing.closing.is_alive()
@@ -0,0 +1,89 @@
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from wallet.cli import app
+from wallet.loadtest import (
+    LoadProfile,
+    in_process_client,
+    parse_mix,
+    percentile,
+    run_load,
+    seed_users,
+)
+from wallet.settings import Settings
+
+
+def test_parse_mix() -> None:
+    assert parse_mix("transfer=3, stats=1") == {"transfer": 3, "stats": 1}
+    with pytest.raises(ValueError, match="Invalid mix"):
+        parse_mix("transfer=3,deposit=1")
+    with pytest.raises(ValueError, match="zero"):
+        parse_mix("transfer=0")
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([], 99) == 0
+
+
+def test_in_process_load_run(tmp_path: Path) -> None:
+    settings = Settings(
+        database_path=tmp_path / "load.db",
+        admin_api_key="ADMIN",
+        storage_backend="memory",
+        stub_usd_per_btc=Decimal("50000.00"),
+    )
+    profile = LoadProfile(users=3, requests=60, concurrency=4)
+
+    async def scenario() -> None:
+        async with in_process_client(settings) as client:
+            users = await seed_users(client, profile)
+            report = await run_load(client, profile, "ADMIN", users)
+
+        assert report.total_requests == 60
+        assert report.total_errors == 0
+        assert {e.name for e in report.endpoints} == set(profile.mix)
+
+    asyncio.run(scenario())
+
+
+def test_cli_loadtest(tmp_path: Path) -> None:
+    result = CliRunner().invoke(
+        app,
+        [
+            "loadtest",
+            "--users",
+            "2",
+            "--requests",
+            "20",
+            "--database",
+            str(tmp_path / "cli.db"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "20 requests, 0 errors" in result.output
+
+
+@pytest.mark.parametrize(
+    ("option", "value", "message"),
+    [
+        ("--wallets-per-user", "4", "wallets_per_user must be <= 3"),
+        ("--backend", "redis", "Unknown storage_backend: redis"),
+    ],
+)
+def test_cli_loadtest_rejects_bad_parameters(
+    tmp_path: Path, option: str, value: str, message: str
+) -> None:
+    result = CliRunner().invoke(
+        app,
+        ["loadtest", "--database", str(tmp_path / "cli.db"), option, value],
+    )
+    assert result.exit_code == 2
+    assert message in result.output
+    assert result.exception is None or isinstance(result.exception, SystemExit)
@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import suppress
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from wallet.core.domain import PlatformStats, Transaction, User, Wallet
+from wallet.core.errors import NotFoundError
+from wallet.core.services.transactions import TransactionService
+from wallet.infra.memory.database import MemoryDatabase
+from wallet.infra.memory.storage import MemoryStorage
+from wallet.settings import Settings
+
+from tests.conftest import FakePriceProvider
+
+CREATED_AT = datetime(2024, 1, 1, 12, tzinfo=UTC)
+
+
+@pytest.fixture
+def storage() -> MemoryStorage:
+    storage = MemoryStorage(MemoryDatabase())
+    storage.users().create(User(id="u1", api_key="k1"))
+    storage.wallets().create(Wallet(address="w1", user_id="u1", balance_sat=1000))
+    storage.wallets().create(Wallet(address="w2", user_id="u1", balance_sat=0))
+    return storage
+
+
+def test_rollback_restores_indexes_and_statistics(storage: MemoryStorage) -> None:
+    def failing_transaction() -> None:
+        with storage.uow():
+            storage.users().create(User(id="u2", api_key="k2"))
+            storage.wallets().move_balance("u1", "w1", "w2", 400, 0)
+            tx = Transaction("t1", "w1", "w2", 400, 0, CREATED_AT)
+            storage.transactions().create(tx)
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        failing_transaction()
+
+    with pytest.raises(NotFoundError):
+        storage.users().read_by_api_key("k2")
+    assert storage.wallets().read("w1").balance_sat == 1000
+    assert storage.wallets().read("w2").balance_sat == 0
+    assert storage.transactions().read_by_addresses(["w1"]) == []
+    assert storage.statistics().read() == PlatformStats(0, 0, 0)
+    assert storage.statistics().read_buckets("day") == []
+
+
+def test_reads_do_not_see_another_threads_uncommitted_writes(
+    storage: MemoryStorage,
+) -> None:
+    written = threading.Event()
+    release = threading.Event()
+
+    def write_then_roll_back() -> None:
+        with suppress(RuntimeError), storage.uow():
+            storage.wallets().update_balances([("w1", 999)])
+            assert storage.wallets().read("w1").balance_sat == 999
+            written.set()
+            release.wait(timeout=5)
+            raise RuntimeError("rollback")
+
+    writer = threading.Thread(target=write_then_roll_back)
+    writer.start()
+    assert written.wait(timeout=5)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        read = pool.submit(storage.wallets().read, "w1")
+        done, _ = wait([read], timeout=0.1)
+        assert not done
+        release.set()
+        writer.join(timeout=5)
+        assert read.result(timeout=5).balance_sat == 1000
+    assert storage.wallets().read("w1").version == 0
+
+
+def test_nested_unit_of_work_is_rejected(storage: MemoryStorage) -> None:
+    with storage.uow(), pytest.raises(RuntimeError, match="already active"):
+        storage.uow().__enter__()
+
+
+def test_concurrent_transfers_preserve_balances(storage: MemoryStorage) -> None:
+    service = TransactionService(storage, FakePriceProvider())
+
+    def transfer() -> None:
+        for _ in range(50):
+            service.transfer("u1", "w1", "w2", 10)
+
+    threads = [threading.Thread(target=transfer) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+
+    assert storage.wallets().read("w1").balance_sat == 0
+    assert storage.wallets().read("w2").balance_sat == 1000
+    assert storage.statistics().read() == storage.statistics().compute()
+
+
+def test_group_commit_requires_sqlite(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="sqlite"):
+        Settings(database_path=tmp_path, storage_backend="memory", group_commit=True)
@@ -0,0 +1,51 @@
+from wallet.api.metrics import Histogram
+
+from tests.conftest import AppClient
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(("/x",), value)
+
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/x",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/x"} 4' in lines
+
+
+def test_metrics_endpoint_reports_request_breakdown(app_client: AppClient) -> None:
+    with app_client(admin_api_key="ADMIN") as client:
+        api_key = client.post("/users").json()["api_key"]
+        headers = {"X-API-KEY": api_key}
+        address = client.post("/wallets", headers=headers).json()["address"]
+        assert client.get(f"/wallets/{address}", headers=headers).status_code == 200
+        assert client.get("/wallets/missing", headers=headers).status_code == 404
+
+        assert client.get("/metrics", headers=headers).status_code == 403
+        r = client.get("/metrics", headers={"X-API-KEY": "ADMIN"})
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = r.text
+    route = 'route="/wallets/{address}"'
+    count = "wallet_http_request_duration_seconds_count"
+    assert f'{count}{{method="GET",{route},status="200"}} 1' in body
+    assert f'{count}{{method="GET",{route},status="404"}} 1' in body
+    for phase in ("db", "price", "serialization"):
+        assert (
+            f'wallet_http_request_phase_seconds_count{{{route},phase="{phase}"}}'
+            in body
+        )
+    assert 'phase="lock_wait"' in body
+    assert "wallet_http_requests_in_flight 1" in body
+    assert "wallet_storage_lock_waiters 0" in body
+
+
+def test_metrics_can_be_switched_off(app_client: AppClient) -> None:
+    with app_client(admin_api_key="ADMIN", metrics=False) as client:
+        assert client.post("/users").status_code == 200
+        r = client.get("/metrics", headers={"X-API-KEY": "ADMIN"})
+
+    assert r.status_code == 404
@@ -0,0 +1,203 @@
+import sqlite3
+from datetime import UTC, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from wallet.cli import app
+from wallet.core.domain import BUCKET_FORMATS, Transaction, User, Wallet
+from wallet.core.services.transactions import TransactionService
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.rows import from_epoch_us, to_epoch_us
+from wallet.infra.sqlite.setup import (
+    CREATED_AT,
+    LEGACY_CREATED_AT,
+    ROLLUP_TRIGGERS,
+    retype_created_at,
+    setup,
+)
+from wallet.infra.sqlite.storage import SqliteStorage
+
+LEGACY_TIMES = [
+    datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC),
+    datetime(2024, 1, 1, 12, 0, 0, 250_001, tzinfo=UTC),
+    datetime(2024, 2, 29, 23, 59, 59, 999_999, tzinfo=UTC),
+    datetime(2024, 3, 1, 1, 30, tzinfo=timezone(timedelta(hours=2))),
+    datetime(2025, 6, 1, tzinfo=UTC),
+]
+NEW_TIME = datetime(2026, 1, 1, 8, 0, 0, 123_456, tzinfo=UTC)
+
+
+def legacy_database(db_path: Path) -> None:
+    conn = connect(db_path)
+    setup(conn)
+    storage = SqliteStorage(conn)
+    storage.users().create(User(id="u1", api_key="k1"))
+    storage.wallets().create(Wallet(address="w1", user_id="u1", balance_sat=10**9))
+    storage.wallets().create(Wallet(address="w2", user_id="u1", balance_sat=10**9))
+    conn.commit()
+
+    (schema_version,) = conn.execute("PRAGMA schema_version;").fetchone()
+    conn.execute("PRAGMA writable_schema = ON;")
+    conn.execute(
+        "UPDATE sqlite_master SET sql = replace(sql, ?, ?) "
+        "WHERE name = 'transactions';",
+        (CREATED_AT, LEGACY_CREATED_AT),
+    )
+    conn.execute(f"PRAGMA schema_version = {schema_version + 1};")
+    conn.execute("PRAGMA writable_schema = OFF;")
+    conn.execute("PRAGMA user_version = 0;")
+    conn.commit()
+    conn.close()
+
+    conn = connect(db_path)
+    conn.executemany(
+        "INSERT INTO transactions(id, from_address, to_address, amount_sat, fee_sat, "
+        "created_at) VALUES(?, 'w1', 'w2', 1000, 10, ?);",
+        [(f"t{i}", t.isoformat()) for i, t in enumerate(LEGACY_TIMES)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def paged_history(storage: SqliteStorage) -> list[str]:
+    service = TransactionService(storage=storage)
+    ids: list[str] = []
+    cursor = None
+    for _ in range(len(LEGACY_TIMES) + 2):
+        page = service.page_wallet_transactions("u1", "w1", 2, cursor)
+        ids.extend(tx.id for tx in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    return ids
+
+
+def column_types(conn: sqlite3.Connection) -> set[str]:
+    rows = conn.execute("SELECT DISTINCT typeof(created_at) FROM transactions;")
+    return {r[0] for r in rows}
+
+
+def test_epoch_microseconds_round_trip() -> None:
+    for value in [*LEGACY_TIMES, NEW_TIME]:
+        assert from_epoch_us(to_epoch_us(value)) == value
+
+
+def test_fresh_database_stores_integers(tmp_path: Path) -> None:
+    conn = connect(tmp_path / "fresh.db")
+    setup(conn)
+    storage = SqliteStorage(conn)
+    storage.users().create(User(id="u1", api_key="k1"))
+    storage.wallets().create(Wallet(address="w1", user_id="u1", balance_sat=0))
+    storage.transactions().create(Transaction("t1", "w1", "w1", 1, 0, NEW_TIME))
+
+    assert column_types(conn) == {"integer"}
+    assert storage.transactions().read("t1").created_at == NEW_TIME
+    conn.close()
+
+
+def test_setup_converts_legacy_timestamps_while_copying(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy.db"
+    legacy_database(db_path)
+    conn = connect(db_path)
+    setup(conn)
+    storage = SqliteStorage(conn)
+    assert column_types(conn) == {"integer"}
+    stats_before = storage.statistics().read()
+    buckets_before = {g: storage.statistics().read_buckets(g) for g in BUCKET_FORMATS}
+
+    storage.transactions().create(Transaction("new", "w1", "w2", 5, 1, NEW_TIME))
+    conn.commit()
+
+    assert column_types(conn) == {"integer"}
+    for i, expected in enumerate(LEGACY_TIMES):
+        assert storage.transactions().read(f"t{i}").created_at == expected
+    history = storage.transactions().read_by_addresses(["w1"])
+    assert [tx.id for tx in history] == ["t0", "t1", "t3", "t2", "t4", "new"]
+    assert paged_history(storage) == ["t0", "t1", "t3", "t2", "t4", "new"]
+
+    statistics = storage.statistics()
+    assert statistics.read().total_transactions == stats_before.total_transactions + 1
+    assert statistics.read() == statistics.compute()
+    for granularity in BUCKET_FORMATS:
+        assert statistics.read_buckets(granularity) == statistics.compute_buckets(
+            granularity
+        )
+    assert len(statistics.read_buckets("day")) == len(buckets_before["day"]) + 1
+
+    assert retype_created_at(conn) == 0
+    conn.close()
+
+
+def test_setup_rebuilds_the_legacy_table(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy.db"
+    legacy_database(db_path)
+    conn = connect(db_path)
+    setup(conn)
+
+    (sql,) = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'transactions';"
+    ).fetchone()
+    assert CREATED_AT in sql
+    assert conn.execute("PRAGMA integrity_check;").fetchone()[0] == "ok"
+    assert conn.execute("PRAGMA foreign_keys;").fetchone()[0] == 1
+    dependents = {
+        r[0]
+        for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE tbl_name = 'transactions' "
+            "AND type IN ('index', 'trigger') AND sql IS NOT NULL;"
+        )
+    }
+    assert {
+        "idx_tx_from_created",
+        "idx_tx_to_created",
+        "idx_tx_created_at",
+        "trg_platform_stats_insert",
+        *ROLLUP_TRIGGERS,
+    } <= dependents
+    assert SqliteStorage(conn).transactions().count() == len(LEGACY_TIMES)
+    conn.close()
+
+
+def test_rebuild_with_dangling_references_is_rolled_back(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy.db"
+    legacy_database(db_path)
+    conn = connect(db_path)
+    conn.execute("PRAGMA foreign_keys = OFF;")
+    conn.execute("UPDATE transactions SET to_address = 'gone' WHERE id = 't0';")
+    conn.commit()
+    conn.execute("PRAGMA foreign_keys = ON;")
+
+    with pytest.raises(sqlite3.IntegrityError, match="foreign key"):
+        retype_created_at(conn)
+
+    (sql,) = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'transactions';"
+    ).fetchone()
+    assert LEGACY_CREATED_AT in sql
+    assert column_types(conn) == {"text"}
+    assert conn.execute("PRAGMA foreign_keys;").fetchone()[0] == 1
+    conn.close()
+
+
+def test_cli_migrate(tmp_path: Path) -> None:
+    db_path = tmp_path / "cli.db"
+    legacy_database(db_path)
+
+    result = CliRunner().invoke(app, ["migrate", "--database", str(db_path)])
+
+    assert result.exit_code == 0, result.output
+    assert f"{len(LEGACY_TIMES)} rows converted" in result.output
+    conn = connect(db_path)
+    assert column_types(conn) == {"integer"}
+    statistics = SqliteStorage(conn).statistics()
+    for granularity in BUCKET_FORMATS:
+        assert statistics.read_buckets(granularity) == statistics.compute_buckets(
+            granularity
+        )
+    conn.close()
+
+    rerun = CliRunner().invoke(app, ["migrate", "--database", str(db_path)])
+    assert rerun.exit_code == 0, rerun.output
+    assert "0 rows converted" in rerun.output
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from wallet.core.domain import User
+from wallet.infra.sqlite.pool import SqliteConnectionPool
+from wallet.infra.sqlite.setup import setup
+from wallet.infra.sqlite.storage import SqliteStorage
+
+
+@pytest.fixture
+def pool(tmp_path: Path) -> SqliteConnectionPool:
+    pool = SqliteConnectionPool(
+        db_path=tmp_path / "pool.db", size=2, timeout_seconds=0.1
+    )
+    with pool.connection() as conn:
+        setup(conn)
+    return pool
+
+
+def test_connections_are_reused(pool: SqliteConnectionPool) -> None:
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+
+
+def test_pool_is_bounded(pool: SqliteConnectionPool) -> None:
+    a = pool.acquire()
+    b = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    pool.release(a)
+    pool.release(b)
+
+
+def test_broken_connection_is_replaced(pool: SqliteConnectionPool) -> None:
+    conn = pool.acquire()
+    conn.close()
+    pool.release(conn)
+
+    with pool.connection() as replacement:
+        assert replacement is not conn
+        assert replacement.execute("SELECT 1;").fetchone()[0] == 1
+
+
+def test_open_transaction_is_rolled_back_on_release(
+    pool: SqliteConnectionPool,
+) -> None:
+    with pool.connection() as conn:
+        conn.execute("BEGIN IMMEDIATE;")
+        SqliteStorage(conn).users().create(User(id="u1", api_key="k1"))
+
+    with pool.connection() as conn:
+        assert not conn.in_transaction
+        assert SqliteStorage(conn).users().count() == 0
+
+
+def test_closed_pool_rejects_acquire(pool: SqliteConnectionPool) -> None:
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
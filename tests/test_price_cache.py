@@ -0,0 +1,186 @@
+import asyncio
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+
+from wallet.core.services.pricing import AsyncPriceProvider, BtcUsdQuote, PriceProvider
+from wallet.infra.pricing.cache import AsyncCachedPriceProvider, CachedPriceProvider
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingPriceProvider(PriceProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+        self.fail = False
+        self.fetched = threading.Event()
+
+    def btc_usd(self) -> BtcUsdQuote:
+        self.calls += 1
+        self.fetched.set()
+        if self.fail:
+            raise RuntimeError("coinbase down")
+        return BtcUsdQuote(usd_per_btc=Decimal(50000 + self.calls))
+
+
+class AsyncCountingPriceProvider(AsyncPriceProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+        self.fail = False
+
+    async def btc_usd(self) -> BtcUsdQuote:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("coinbase down")
+        return BtcUsdQuote(usd_per_btc=Decimal(50000 + self.calls))
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def inner() -> CountingPriceProvider:
+    return CountingPriceProvider()
+
+
+@pytest.fixture
+def cached(clock: FakeClock, inner: CountingPriceProvider) -> CachedPriceProvider:
+    return CachedPriceProvider(
+        inner=inner,
+        ttl_seconds=10,
+        stale_while_revalidate_seconds=5,
+        max_staleness_seconds=60,
+        clock=clock,
+    )
+
+
+def test_fresh_quote_is_served_from_cache(
+    cached: CachedPriceProvider, inner: CountingPriceProvider, clock: FakeClock
+) -> None:
+    first = cached.btc_usd()
+    clock.now = 9
+    assert cached.btc_usd() == first
+    assert inner.calls == 1
+
+
+def test_stale_quote_is_served_while_revalidating(
+    cached: CachedPriceProvider, inner: CountingPriceProvider, clock: FakeClock
+) -> None:
+    first = cached.btc_usd()
+    inner.fetched.clear()
+
+    clock.now = 12
+    assert cached.btc_usd() == first
+    assert inner.fetched.wait(timeout=5)
+
+
+def test_expired_quote_is_refreshed_synchronously(
+    cached: CachedPriceProvider, inner: CountingPriceProvider, clock: FakeClock
+) -> None:
+    first = cached.btc_usd()
+    clock.now = 20
+    assert cached.btc_usd() != first
+    assert inner.calls == 2
+
+
+def test_failed_refresh_falls_back_until_max_staleness(
+    cached: CachedPriceProvider, inner: CountingPriceProvider, clock: FakeClock
+) -> None:
+    first = cached.btc_usd()
+    inner.fail = True
+
+    clock.now = 30
+    assert cached.btc_usd() == first
+
+    clock.now = 61
+    with pytest.raises(RuntimeError):
+        cached.btc_usd()
+
+
+def test_concurrent_misses_share_one_fetch(clock: FakeClock) -> None:
+    release = threading.Event()
+
+    class SlowPriceProvider(CountingPriceProvider):
+        def btc_usd(self) -> BtcUsdQuote:
+            release.wait(timeout=5)
+            return super().btc_usd()
+
+    inner = SlowPriceProvider()
+    cached = CachedPriceProvider(inner=inner, clock=clock)
+    quotes: list[BtcUsdQuote] = []
+    threads = [
+        threading.Thread(target=lambda: quotes.append(cached.btc_usd()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(quotes) == 8
+    assert len(set(quotes)) == 1
+    assert inner.calls == 1
+
+
+def test_invalid_windows_are_rejected(inner: CountingPriceProvider) -> None:
+    with pytest.raises(ValueError, match="max_staleness"):
+        CachedPriceProvider(
+            inner=inner,
+            ttl_seconds=10,
+            stale_while_revalidate_seconds=10,
+            max_staleness_seconds=15,
+        )
+
+
+def test_async_concurrent_misses_share_one_fetch(clock: FakeClock) -> None:
+    inner = AsyncCountingPriceProvider()
+    cached = AsyncCachedPriceProvider(inner=inner, clock=clock)
+
+    async def fetch_many() -> list[BtcUsdQuote]:
+        return await asyncio.gather(*(cached.btc_usd() for _ in range(10)))
+
+    quotes = asyncio.run(fetch_many())
+    assert len(set(quotes)) == 1
+    assert inner.calls == 1
+
+
+def test_async_stale_and_failed_refreshes(clock: FakeClock) -> None:
+    inner = AsyncCountingPriceProvider()
+    cached = AsyncCachedPriceProvider(
+        inner=inner,
+        ttl_seconds=10,
+        stale_while_revalidate_seconds=5,
+        max_staleness_seconds=60,
+        clock=clock,
+    )
+
+    async def scenario() -> None:
+        first = await cached.btc_usd()
+
+        clock.now = 12
+        assert await cached.btc_usd() == first
+        await asyncio.sleep(0.05)
+        assert inner.calls == 2
+
+        inner.fail = True
+        clock.now = 40
+        assert await cached.btc_usd() != first
+
+        clock.now = 100
+        with pytest.raises(RuntimeError):
+            await cached.btc_usd()
+
+    asyncio.run(scenario())
@@ -0,0 +1,94 @@
+import sqlite3
+import threading
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from wallet.core.domain import User, Wallet
+from wallet.core.services.transactions import TransactionService
+from wallet.infra.sqlite.factory import SqliteStorageFactory
+from wallet.settings import Settings
+
+from tests.conftest import FakePriceProvider
+
+WALLETS = 4
+INITIAL_BALANCE = 10**9
+
+
+@pytest.fixture
+def factory(tmp_path: Path) -> Generator[SqliteStorageFactory]:
+    factory = SqliteStorageFactory.from_settings(
+        Settings(database_path=tmp_path / "rw.db", pool_size=2, read_pool_size=4)
+    )
+    with factory.storage("write") as storage, storage.uow():
+        for i in range(WALLETS):
+            storage.users().create(User(id=f"u{i}", api_key=f"k{i}"))
+            storage.wallets().create(
+                Wallet(address=f"w{i}", user_id=f"u{i}", balance_sat=INITIAL_BALANCE)
+            )
+    yield factory
+    factory.close()
+
+
+def test_read_storage_rejects_writes(factory: SqliteStorageFactory) -> None:
+    with factory.storage("read") as storage, pytest.raises(sqlite3.OperationalError):
+        storage.conn.execute("DELETE FROM users;")
+
+
+def test_reads_are_not_blocked_by_an_open_write(factory: SqliteStorageFactory) -> None:
+    with factory.storage("write") as writer, writer.uow():
+        writer.wallets().update(Wallet(address="w0", user_id="u0", balance_sat=0))
+
+        with factory.storage("read") as reader:
+            assert reader.wallets().read("w0").balance_sat == INITIAL_BALANCE
+
+    with factory.storage("read") as reader:
+        assert reader.wallets().read("w0").balance_sat == 0
+
+
+def test_mixed_read_write_load_sees_consistent_snapshots(
+    factory: SqliteStorageFactory,
+) -> None:
+    transfers = 200
+    stop = threading.Event()
+    errors: list[BaseException] = []
+    totals: list[int] = []
+
+    def write() -> None:
+        try:
+            for i in range(transfers):
+                src, dst = i % WALLETS, (i + 1) % WALLETS
+                with factory.storage("write") as storage:
+                    TransactionService(storage, FakePriceProvider()).transfer(
+                        f"u{src}", f"w{src}", f"w{dst}", 1_000
+                    )
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            stop.set()
+
+    def read() -> None:
+        try:
+            while not stop.is_set():
+                with factory.storage("read") as storage:
+                    (total,) = storage.conn.execute(
+                        "SELECT (SELECT SUM(balance_sat) FROM wallets) + "
+                        "(SELECT total_fee_sat FROM platform_stats);"
+                    ).fetchone()
+                    totals.append(total)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write)]
+    threads += [threading.Thread(target=read) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=60)
+
+    assert errors == []
+    assert totals
+    assert set(totals) == {WALLETS * INITIAL_BALANCE}
+    with factory.storage("read") as storage:
+        assert storage.transactions().count() == transfers
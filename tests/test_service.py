@@ -1,3 +1,4 @@
+from decimal import Decimal
 from unittest.mock import patch
 
 import pytest
@@ -9,7 +10,12 @@ from wallet.core.errors import (
     NotFoundError,
     ValidationError,
 )
-from wallet.core.services.transactions import TransactionService, external_fee_sat
+from wallet.core.services.pricing import BtcUsdQuote
+from wallet.core.services.transactions import (
+    TransactionService,
+    TransferRequest,
+    external_fee_sat,
+)
 from wallet.core.services.users import UserService
 from wallet.core.services.wallets import WalletService
 
@@ -38,6 +44,29 @@ def test_create_wallet(
         wallet_service.create_wallet(user_id)
 
 
+def test_register_many_users(user_service: UserService) -> None:
+    users = user_service.register_many(50)
+
+    assert len({u.api_key for u in users}) == 50
+    assert user_service.storage.users().count() == 50
+    with pytest.raises(ValidationError):
+        user_service.register_many(0)
+
+
+def test_create_wallets_in_batch(
+    user_service: UserService, wallet_service: WalletService
+) -> None:
+    u1, u2 = user_service.register_many(2)
+    wallet_service.create_wallet(u1.id)
+
+    wallets = wallet_service.create_wallets([u1.id, u1.id, u2.id])
+    assert [w.user_id for w in wallets] == [u1.id, u1.id, u2.id]
+
+    with pytest.raises(ConflictError):
+        wallet_service.create_wallets([u2.id, u1.id])
+    assert wallet_service.storage.wallets().count_by_owner(u2.id) == 1
+
+
 def test_get_wallet_owned(
     user_service: UserService, wallet_service: WalletService
 ) -> None:
@@ -153,3 +182,188 @@ def test_tx_view(
     assert view["amount_sat"] == 10_000_000
     assert float(view["amount_usd"]) > 0
     assert float(view["fee_usd"]) > 0
+
+
+def test_tx_views_use_single_quote(
+    user_service: UserService,
+    wallet_service: WalletService,
+    tx_service: TransactionService,
+) -> None:
+    user1 = user_service.register().id
+    user2 = user_service.register().id
+    w1 = wallet_service.create_wallet(user1)
+    w2 = wallet_service.create_wallet(user2)
+
+    tx_service.transfer(user1, w1.address, w2.address, 10_000_000)
+    tx_service.transfer(user1, w1.address, w2.address, 20_000_000)
+    txs = tx_service.list_user_transactions(user1)
+
+    with patch.object(
+        tx_service.price_provider,
+        "btc_usd",
+        side_effect=AssertionError("quote must not be refetched"),
+    ):
+        views = tx_service.tx_views(txs, BtcUsdQuote(usd_per_btc=Decimal("40000")))
+
+    assert [v["id"] for v in views] == [t.id for t in txs]
+    assert [v["amount_usd"] for v in views] == ["4000.00", "8000.00"]
+
+
+def test_list_wallet_transactions(
+    user_service: UserService,
+    wallet_service: WalletService,
+    tx_service: TransactionService,
+) -> None:
+    user1 = user_service.register().id
+    user2 = user_service.register().id
+    w1 = wallet_service.create_wallet(user1)
+    w2 = wallet_service.create_wallet(user1)
+    w3 = wallet_service.create_wallet(user2)
+
+    first = tx_service.transfer(user1, w1.address, w2.address, 1_000)
+    second = tx_service.transfer(user1, w2.address, w3.address, 1_000)
+
+    assert tx_service.list_wallet_transactions(user1, w1.address) == [first]
+    assert tx_service.list_wallet_transactions(user1, w2.address) == [first, second]
+    assert tx_service.list_user_transactions(user1) == [first, second]
+    assert tx_service.list_user_transactions(user2) == [second]
+
+    with pytest.raises(NotFoundError):
+        tx_service.list_wallet_transactions(user2, w1.address)
+
+
+def test_page_user_transactions(
+    user_service: UserService,
+    wallet_service: WalletService,
+    tx_service: TransactionService,
+) -> None:
+    user1 = user_service.register().id
+    user2 = user_service.register().id
+    w1 = wallet_service.create_wallet(user1)
+    w2 = wallet_service.create_wallet(user1)
+    w3 = wallet_service.create_wallet(user2)
+    for _ in range(4):
+        tx_service.transfer(user1, w1.address, w2.address, 1_000)
+        tx_service.transfer(user1, w2.address, w3.address, 1_000)
+
+    seen = []
+    cursor = None
+    while True:
+        page = tx_service.page_user_transactions(user1, 3, cursor)
+        assert len(page.items) <= 3
+        seen.extend(page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == tx_service.list_user_transactions(user1)
+    assert len(seen) == 8
+
+    page = tx_service.page_wallet_transactions(user2, w3.address, 10)
+    assert [t.to_address for t in page.items] == [w3.address] * 4
+    assert page.next_cursor is None
+
+
+def test_page_rejects_bad_cursor_and_limit(
+    user_service: UserService, tx_service: TransactionService
+) -> None:
+    user = user_service.register().id
+
+    with pytest.raises(ValidationError):
+        tx_service.page_user_transactions(user, 10, "not a cursor")
+    with pytest.raises(ValidationError):
+        tx_service.page_user_transactions(user, 0)
+
+
+def test_platform_stats(
+    user_service: UserService,
+    wallet_service: WalletService,
+    tx_service: TransactionService,
+) -> None:
+    user1 = user_service.register().id
+    user2 = user_service.register().id
+    w1 = wallet_service.create_wallet(user1)
+    w2 = wallet_service.create_wallet(user2)
+
+    tx_service.transfer(user1, w1.address, w2.address, 10_000_000)
+    tx_service.transfer(user2, w2.address, w1.address, 1_000)
+
+    stats = tx_service.platform_stats()
+    assert stats.total_transactions == 2
+    assert stats.total_fee_sat == external_fee_sat(10_000_000) + external_fee_sat(1_000)
+    assert stats.total_volume_sat == 10_001_000
+    assert tx_service.platform_profit_sat() == stats.total_fee_sat
+
+
+def test_transfer_many_atomic(
+    user_service: UserService,
+    wallet_service: WalletService,
+    tx_service: TransactionService,
+) -> None:
+    user1 = user_service.register().id
+    user2 = user_service.register().id
+    w1 = wallet_service.create_wallet(user1)
+    w2 = wallet_service.create_wallet(user1)
+    w3 = wallet_service.create_wallet(user2)
+
+    results = tx_service.transfer_many(
+        user1,
+        [
+            TransferRequest(w1.address, w2.address, 10_000_000),
+            TransferRequest(w2.address, w3.address, 20_000_000),
+        ],
+    )
+
+    txs = [r.transaction for r in results]
+    assert all(tx is not None for tx in txs)
+    assert txs == tx_service.list_user_transactions(user1)
+    wallets = tx_service.storage.wallets()
+    assert wallets.read(w1.address).balance_sat == SATOSHIS_PER_BTC - 10_000_000
+    assert wallets.read(w2.address).balance_sat == SATOSHIS_PER_BTC - 10_000_000
+    assert wallets.read(w3.address).balance_sat == (
+        SATOSHIS_PER_BTC + 20_000_000 - external_fee_sat(20_000_000)
+    )
+
+    with pytest.raises(InsufficientFundsError, match=r"transfers\[1\]"):
+        tx_service.transfer_many(
+            user1,
+            [
+                TransferRequest(w1.address, w3.address, 1_000),
+                TransferRequest(w1.address, w3.address, SATOSHIS_PER_BTC),
+            ],
+        )
+    assert wallets.read(w1.address).balance_sat == SATOSHIS_PER_BTC - 10_000_000
+    assert tx_service.platform_stats().total_transactions == 2
+
+
+def test_transfer_many_per_item(
+    user_service: UserService,
+    wallet_service: WalletService,
+    tx_service: TransactionService,
+) -> None:
+    user1 = user_service.register().id
+    user2 = user_service.register().id
+    w1 = wallet_service.create_wallet(user1)
+    w2 = wallet_service.create_wallet(user2)
+
+    results = tx_service.transfer_many(
+        user1,
+        [
+            TransferRequest(w1.address, w2.address, 60_000_000),
+            TransferRequest(w1.address, w2.address, 60_000_000),
+            TransferRequest(w2.address, w1.address, 1_000),
+            TransferRequest(w1.address, "missing", 1_000),
+            TransferRequest(w1.address, w2.address, 40_000_000),
+        ],
+        atomic=False,
+    )
+
+    assert [type(r.error) for r in results] == [
+        type(None),
+        InsufficientFundsError,
+        NotFoundError,
+        NotFoundError,
+        type(None),
+    ]
+    assert tx_service.storage.wallets().read(w1.address).balance_sat == 0
+    assert tx_service.platform_stats().total_transactions == 2
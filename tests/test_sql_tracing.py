@@ -0,0 +1,108 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.setup import setup
+from wallet.settings import Settings
+from wallet.telemetry import RequestTimings, current_timings, timed
+
+from tests.conftest import AppClient
+
+
+def test_tracing_counts_statements_and_rows(tmp_path: Path) -> None:
+    conn = connect(tmp_path / "trace.db", trace=True)
+    setup(conn)
+    conn.executemany("INSERT INTO users (id, api_key) VALUES (?, ?);", [("a", "ka")])
+    conn.execute("INSERT INTO users (id, api_key) VALUES ('b', 'kb');")
+
+    timings = RequestTimings()
+    token = current_timings.set(timings)
+    try:
+        rows = conn.execute("SELECT id FROM users ORDER BY id;").fetchall()
+        conn.execute("SELECT id FROM users WHERE id = 'a';").fetchone()
+        conn.execute("SELECT id FROM users WHERE id = 'zzz';").fetchone()
+    finally:
+        current_timings.reset(token)
+        conn.close()
+
+    assert [row["id"] for row in rows] == ["a", "b"]
+    assert timings.statements == 3
+    assert timings.rows == 3
+    assert timings.seconds["db"] > 0
+
+
+def test_slow_query_log_includes_query_plan(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    conn = connect(tmp_path / "slow.db", slow_query_ms=0, trace=True)
+    setup(conn)
+    with caplog.at_level(logging.WARNING, logger="wallet.sql.slow"):
+        conn.execute("SELECT * FROM users WHERE api_key = ?;", ("k",)).fetchall()
+    conn.close()
+
+    (message,) = [
+        r.getMessage() for r in caplog.records if "FROM users" in r.getMessage()
+    ]
+    assert message.startswith("slow query (")
+    assert "USING" in message
+    assert "api_key" in message
+
+
+def test_untraced_connection_does_not_count(tmp_path: Path) -> None:
+    conn = connect(tmp_path / "plain.db")
+    timings = RequestTimings()
+    token = current_timings.set(timings)
+    try:
+        conn.execute("SELECT 1;").fetchall()
+    finally:
+        current_timings.reset(token)
+        conn.close()
+
+    assert timings.statements == 0
+    assert timings.rows == 0
+    assert timings.seconds["db"] == 0.0
+
+
+def test_timed_connection_records_db_time_only(tmp_path: Path) -> None:
+    conn = connect(tmp_path / "timed.db", timed=True)
+    timings = RequestTimings()
+    token = current_timings.set(timings)
+    try:
+        conn.execute("SELECT 1;").fetchall()
+    finally:
+        current_timings.reset(token)
+        conn.close()
+
+    assert timings.seconds["db"] > 0
+    assert timings.statements == 0
+
+
+def test_timed_outside_a_request_is_a_shared_no_op() -> None:
+    assert timed("db") is timed("price")
+
+
+def test_debug_mode_adds_sql_headers(app_client: AppClient) -> None:
+    with app_client(debug=True) as client:
+        headers = {"X-API-KEY": client.post("/users").json()["api_key"]}
+        address = client.post("/wallets", headers=headers).json()["address"]
+        r = client.get(f"/wallets/{address}", headers=headers)
+
+    assert r.status_code == 200
+    assert int(r.headers["X-SQL-Statements"]) >= 2
+    assert int(r.headers["X-SQL-Rows"]) >= 1
+    assert float(r.headers["X-DB-Time-Ms"]) > 0
+
+
+def test_debug_headers_are_off_by_default(app_client: AppClient) -> None:
+    with app_client() as client:
+        r = client.post("/users")
+
+    assert r.status_code == 200
+    assert "X-SQL-Statements" not in r.headers
+
+
+def test_negative_slow_query_threshold_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="slow_query_ms"):
+        Settings(database_path=tmp_path / "x.db", slow_query_ms=-1)
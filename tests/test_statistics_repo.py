@@ -0,0 +1,160 @@
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from wallet.cli import app
+from wallet.core.domain import PlatformStats, Transaction, User, Wallet
+from wallet.core.repository.storage import Storage
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.repository.statistics import SqliteStatisticsRepository
+from wallet.infra.sqlite.setup import setup
+from wallet.infra.sqlite.storage import SqliteStorage
+
+FIXED_DATETIME = datetime(2026, 2, 6, 12, 0, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def populated_storage(storage: Storage) -> Storage:
+    storage.users().create(User(id="u1", api_key="k1"))
+    storage.wallets().create(Wallet(address="w1", user_id="u1", balance_sat=1000))
+    storage.wallets().create(Wallet(address="w2", user_id="u1", balance_sat=500))
+    return storage
+
+
+def test_statistics_start_empty(storage: Storage) -> None:
+    assert storage.statistics().read() == PlatformStats(0, 0, 0)
+
+
+def test_statistics_follow_the_ledger(populated_storage: Storage) -> None:
+    txs = populated_storage.transactions()
+    txs.create(Transaction("t1", "w1", "w2", 100, 2, FIXED_DATETIME))
+    txs.create(Transaction("t2", "w2", "w1", 50, 1, FIXED_DATETIME))
+    assert populated_storage.statistics().read() == PlatformStats(2, 3, 150)
+
+    txs.update(Transaction("t2", "w2", "w1", 70, 5, FIXED_DATETIME))
+    assert populated_storage.statistics().read() == PlatformStats(2, 7, 170)
+
+    txs.delete("t1")
+    assert populated_storage.statistics().read() == PlatformStats(1, 5, 70)
+    assert populated_storage.statistics().compute() == PlatformStats(1, 5, 70)
+
+
+def test_setup_is_idempotent(tmp_path: Path) -> None:
+    conn = connect(tmp_path / "stats.db")
+    setup(conn)
+    storage = SqliteStorage(conn)
+    storage.users().create(User(id="u1", api_key="k1"))
+    storage.wallets().create(Wallet(address="w1", user_id="u1", balance_sat=1000))
+    storage.wallets().create(Wallet(address="w2", user_id="u1", balance_sat=500))
+    storage.transactions().create(Transaction("t1", "w1", "w2", 100, 2, FIXED_DATETIME))
+    conn.commit()
+
+    setup(conn)
+    assert storage.statistics().read() == PlatformStats(1, 2, 100)
+    conn.close()
+
+
+@pytest.mark.parametrize(
+    ("tamper", "message"),
+    [
+        (
+            "UPDATE platform_stats SET total_fee_sat = 999;",
+            "platform statistics are out of sync",
+        ),
+        ("UPDATE stats_rollups SET fee_sat = 999;", "rollups are out of sync"),
+    ],
+)
+def test_cli_verify_and_rebuild(tmp_path: Path, tamper: str, message: str) -> None:
+    db_path = tmp_path / "cli.db"
+    conn = connect(db_path)
+    setup(conn)
+    storage = SqliteStorage(conn)
+    storage.users().create(User(id="u1", api_key="k1"))
+    storage.wallets().create(Wallet(address="w1", user_id="u1", balance_sat=1000))
+    storage.wallets().create(Wallet(address="w2", user_id="u1", balance_sat=500))
+    storage.transactions().create(Transaction("t1", "w1", "w2", 100, 2, FIXED_DATETIME))
+    conn.execute(tamper)
+    conn.commit()
+    conn.close()
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["stats", "verify", "--database", str(db_path)])
+    assert result.exit_code == 1
+    assert message in result.output
+
+    result = runner.invoke(app, ["stats", "rebuild", "--database", str(db_path)])
+    assert result.exit_code == 0
+
+    result = runner.invoke(app, ["stats", "verify", "--database", str(db_path)])
+    assert result.exit_code == 0
+
+
+def test_cli_verify_reads_a_single_snapshot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "cli.db"
+    conn = connect(db_path)
+    setup(conn)
+    storage = SqliteStorage(conn)
+    storage.users().create(User(id="u1", api_key="k1"))
+    storage.wallets().create(Wallet(address="w1", user_id="u1", balance_sat=1000))
+    storage.wallets().create(Wallet(address="w2", user_id="u1", balance_sat=500))
+    conn.commit()
+
+    compute = SqliteStatisticsRepository.compute
+
+    def compute_after_a_write(self: SqliteStatisticsRepository) -> PlatformStats:
+        storage.transactions().create(
+            Transaction("t1", "w1", "w2", 100, 2, FIXED_DATETIME)
+        )
+        conn.commit()
+        return compute(self)
+
+    monkeypatch.setattr(SqliteStatisticsRepository, "compute", compute_after_a_write)
+    result = CliRunner().invoke(app, ["stats", "verify", "--database", str(db_path)])
+    conn.close()
+
+    assert result.exit_code == 0, result.output
+
+
+def test_rollups_bucket_by_time(populated_storage: Storage) -> None:
+    txs = populated_storage.transactions()
+    txs.create(Transaction("t1", "w1", "w2", 100, 2, FIXED_DATETIME))
+    txs.create(
+        Transaction("t2", "w1", "w2", 50, 1, FIXED_DATETIME + timedelta(minutes=30))
+    )
+    txs.create(
+        Transaction("t3", "w2", "w1", 10, 0, FIXED_DATETIME + timedelta(hours=2))
+    )
+    txs.create(
+        Transaction("t4", "w2", "w1", 20, 3, FIXED_DATETIME + timedelta(days=40))
+    )
+
+    statistics = populated_storage.statistics()
+    hours = statistics.read_buckets("hour")
+    assert [(b.bucket_start, b.total_transactions) for b in hours] == [
+        (FIXED_DATETIME, 2),
+        (FIXED_DATETIME + timedelta(hours=2), 1),
+        (FIXED_DATETIME + timedelta(days=40), 1),
+    ]
+    assert hours[0].total_fee_sat == 3
+    assert hours[0].total_volume_sat == 150
+
+    months = statistics.read_buckets("month")
+    assert [b.total_transactions for b in months] == [3, 1]
+    assert months[0].bucket_start == datetime(2026, 2, 1, tzinfo=UTC)
+
+    days = statistics.read_buckets(
+        "day", FIXED_DATETIME + timedelta(hours=1), FIXED_DATETIME + timedelta(days=2)
+    )
+    assert [b.total_transactions for b in days] == [3]
+
+    txs.delete("t3")
+    txs.update(Transaction("t4", "w2", "w1", 20, 3, FIXED_DATETIME))
+    assert [b.total_transactions for b in statistics.read_buckets("month")] == [3]
+    for granularity in ("hour", "day", "month"):
+        assert statistics.read_buckets(granularity) == statistics.compute_buckets(
+            granularity
+        )
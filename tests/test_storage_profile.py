@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pytest
+
+from wallet.infra.sqlite.connection import connect
+from wallet.settings import THROUGHPUT_PROFILE, StorageProfile
+
+
+def test_default_profile_uses_wal(tmp_path: Path) -> None:
+    conn = connect(tmp_path / "default.db")
+
+    assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 2
+    assert conn.execute("PRAGMA foreign_keys;").fetchone()[0] == 1
+    conn.close()
+
+
+def test_throughput_profile_is_applied(tmp_path: Path) -> None:
+    conn = connect(tmp_path / "fast.db", THROUGHPUT_PROFILE)
+
+    assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 1
+    assert conn.execute("PRAGMA cache_size;").fetchone()[0] == -64_000
+    assert conn.execute("PRAGMA temp_store;").fetchone()[0] == 2
+    assert conn.execute("PRAGMA busy_timeout;").fetchone()[0] == 30_000
+    assert conn.execute("PRAGMA wal_autocheckpoint;").fetchone()[0] == 4_000
+    conn.close()
+
+
+def test_unknown_pragma_values_are_rejected() -> None:
+    with pytest.raises(ValueError, match="journal_mode"):
+        StorageProfile(journal_mode="WAL; DROP TABLE users")
+    with pytest.raises(ValueError, match="synchronous"):
+        StorageProfile(synchronous="SOMETIMES")
@@ -1,17 +1,17 @@
 from dataclasses import replace
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 import pytest
 
 from wallet.core.domain import Transaction, User, Wallet
 from wallet.core.errors import ConflictError, NotFoundError
-from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.core.repository.storage import Storage
 
 FIXED_DATETIME = datetime(2026, 2, 6, 12, 0, 0, tzinfo=UTC)
 
 
 @pytest.fixture
-def populated_storage(storage: SqliteStorage) -> SqliteStorage:
+def populated_storage(storage: Storage) -> Storage:
     storage.users().create(User(id="u1", api_key="k1"))
     storage.users().create(User(id="u2", api_key="k2"))
     storage.wallets().create(Wallet(address="w1", user_id="u1", balance_sat=1000))
@@ -19,7 +19,7 @@ def populated_storage(storage: SqliteStorage) -> SqliteStorage:
     return storage
 
 
-def test_create_and_read_transaction(populated_storage: SqliteStorage) -> None:
+def test_create_and_read_transaction(populated_storage: Storage) -> None:
     tx = Transaction(
         id="t1",
         from_address="w1",
@@ -36,7 +36,7 @@ def test_create_and_read_transaction(populated_storage: SqliteStorage) -> None:
     assert fetched.created_at == FIXED_DATETIME
 
 
-def test_transaction_read_all(populated_storage: SqliteStorage) -> None:
+def test_transaction_read_all(populated_storage: Storage) -> None:
     tx1 = Transaction(
         id="t1",
         from_address="w1",
@@ -64,7 +64,7 @@ def test_transaction_read_all(populated_storage: SqliteStorage) -> None:
     assert ids == {"t1", "t2"}
 
 
-def test_transaction_update(populated_storage: SqliteStorage) -> None:
+def test_transaction_update(populated_storage: Storage) -> None:
     tx = Transaction(
         id="t1",
         from_address="w1",
@@ -86,7 +86,7 @@ def test_transaction_update(populated_storage: SqliteStorage) -> None:
     assert fetched.to_address == "w2"
 
 
-def test_transaction_delete(populated_storage: SqliteStorage) -> None:
+def test_transaction_delete(populated_storage: Storage) -> None:
     tx = Transaction(
         id="t1",
         from_address="w1",
@@ -103,12 +103,12 @@ def test_transaction_delete(populated_storage: SqliteStorage) -> None:
         populated_storage.transactions().read("t1")
 
 
-def test_transaction_delete_not_found(populated_storage: SqliteStorage) -> None:
+def test_transaction_delete_not_found(populated_storage: Storage) -> None:
     with pytest.raises(NotFoundError):
         populated_storage.transactions().delete("nonexistent")
 
 
-def test_transaction_conflict(populated_storage: SqliteStorage) -> None:
+def test_transaction_conflict(populated_storage: Storage) -> None:
     tx = Transaction(
         id="t1",
         from_address="w1",
@@ -122,7 +122,7 @@ def test_transaction_conflict(populated_storage: SqliteStorage) -> None:
         populated_storage.transactions().create(tx)
 
 
-def test_transaction_count(populated_storage: SqliteStorage) -> None:
+def test_transaction_count(populated_storage: Storage) -> None:
     assert populated_storage.transactions().count() == 0
 
     tx1 = Transaction(
@@ -149,3 +149,19 @@ def test_transaction_count(populated_storage: SqliteStorage) -> None:
 
     populated_storage.transactions().delete("t1")
     assert populated_storage.transactions().count() == 1
+
+
+def test_read_by_addresses(populated_storage: Storage) -> None:
+    populated_storage.wallets().create(
+        Wallet(address="w3", user_id="u2", balance_sat=0)
+    )
+    repo = populated_storage.transactions()
+    later = FIXED_DATETIME + timedelta(minutes=5)
+    repo.create(Transaction("t2", "w1", "w2", 100, 1, later))
+    repo.create(Transaction("t1", "w2", "w1", 50, 1, FIXED_DATETIME))
+    repo.create(Transaction("t3", "w2", "w3", 10, 0, FIXED_DATETIME))
+
+    assert [t.id for t in repo.read_by_addresses(["w1"])] == ["t1", "t2"]
+    assert [t.id for t in repo.read_by_addresses(["w1", "w2"])] == ["t1", "t3", "t2"]
+    assert [t.id for t in repo.read_by_addresses(["w3"])] == ["t3"]
+    assert list(repo.read_by_addresses([])) == []
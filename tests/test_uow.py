@@ -1,10 +1,10 @@
 import pytest
 
 from wallet.core.domain import User
-from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.core.repository.storage import Storage
 
 
-def test_uow_commit(storage: SqliteStorage) -> None:
+def test_uow_commit(storage: Storage) -> None:
     with storage.uow():
         storage.users().create(User("u1", "k1"))
 
@@ -12,7 +12,7 @@ def test_uow_commit(storage: SqliteStorage) -> None:
     assert user.id == "u1"
 
 
-def test_uow_rollback_on_error(storage: SqliteStorage) -> None:
+def test_uow_rollback_on_error(storage: Storage) -> None:
     def failing_transaction() -> None:
         with storage.uow():
             storage.users().create(User("u1", "k1"))
@@ -2,10 +2,10 @@ import pytest
 
 from wallet.core.domain import User
 from wallet.core.errors import ConflictError, NotFoundError
-from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.core.repository.storage import Storage
 
 
-def test_create_and_read_user(storage: SqliteStorage) -> None:
+def test_create_and_read_user(storage: Storage) -> None:
     repo = storage.users()
 
     user = User(id="u1", api_key="key-123")
@@ -16,7 +16,7 @@ def test_create_and_read_user(storage: SqliteStorage) -> None:
     assert loaded == user
 
 
-def test_read_all_users(storage: SqliteStorage) -> None:
+def test_read_all_users(storage: Storage) -> None:
     repo = storage.users()
 
     repo.create(User(id="u1", api_key="k1"))
@@ -28,7 +28,7 @@ def test_read_all_users(storage: SqliteStorage) -> None:
     assert {u.id for u in users} == {"u1", "u2"}
 
 
-def test_read_by_api_key(storage: SqliteStorage) -> None:
+def test_read_by_api_key(storage: Storage) -> None:
     repo = storage.users()
 
     repo.create(User(id="u123", api_key="key-123"))
@@ -41,7 +41,7 @@ def test_read_by_api_key(storage: SqliteStorage) -> None:
         repo.read_by_api_key("non-existent-key")
 
 
-def test_update_user(storage: SqliteStorage) -> None:
+def test_update_user(storage: Storage) -> None:
     repo = storage.users()
 
     repo.create(User(id="u1", api_key="k1"))
@@ -51,7 +51,7 @@ def test_update_user(storage: SqliteStorage) -> None:
     assert updated.api_key == "k2"
 
 
-def test_delete_user(storage: SqliteStorage) -> None:
+def test_delete_user(storage: Storage) -> None:
     repo = storage.users()
 
     repo.create(User(id="u1", api_key="k1"))
@@ -61,7 +61,7 @@ def test_delete_user(storage: SqliteStorage) -> None:
         repo.read("u1")
 
 
-def test_user_count(storage: SqliteStorage) -> None:
+def test_user_count(storage: Storage) -> None:
     repo = storage.users()
 
     assert repo.count() == 0
@@ -69,10 +69,22 @@ def test_user_count(storage: SqliteStorage) -> None:
     assert repo.count() == 1
 
 
-def test_duplicate_user_id_raises(storage: SqliteStorage) -> None:
+def test_duplicate_user_id_raises(storage: Storage) -> None:
     repo = storage.users()
 
     repo.create(User(id="u1", api_key="k1"))
 
     with pytest.raises(ConflictError):
         repo.create(User(id="u1", api_key="k2"))
+
+
+def test_create_many_users_is_all_or_nothing(storage: Storage) -> None:
+    repo = storage.users()
+    with storage.uow():
+        repo.create_many([User(id="u1", api_key="k1"), User(id="u2", api_key="k2")])
+    assert repo.count() == 2
+
+    with pytest.raises(ConflictError), storage.uow():
+        repo.create_many([User(id="u3", api_key="k3"), User(id="u4", api_key="k1")])
+
+    assert repo.count() == 2
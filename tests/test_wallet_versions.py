@@ -0,0 +1,307 @@
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from decimal import Decimal
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from wallet.api.app import create_app
+from wallet.api.dependencies import get_price_provider
+from wallet.api.etags import etag_matches
+from wallet.core.domain import User, Wallet
+from wallet.core.repository.storage import Storage, StorageFactory
+from wallet.core.services.pricing import BtcUsdQuote, PriceProvider
+from wallet.core.services.transactions import TransactionService, TransferRequest
+from wallet.core.services.wallet_versions import WalletVersionCache
+from wallet.infra.memory.database import MemoryDatabase
+from wallet.infra.memory.storage import MemoryStorage
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.setup import setup
+from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.settings import Settings
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingPriceProvider(PriceProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def btc_usd(self) -> BtcUsdQuote:
+        self.calls += 1
+        return BtcUsdQuote(usd_per_btc=Decimal("50000.00"))
+
+
+def test_entries_expire_after_their_ttl() -> None:
+    clock = FakeClock()
+    cache = WalletVersionCache(ttl_seconds=5, clock=clock)
+    cache.put("w1", "u1", 3, cache.generation)
+
+    clock.now = 4
+    entry = cache.get("w1")
+    assert entry is not None
+    assert (entry.user_id, entry.version) == ("u1", 3)
+
+    clock.now = 5
+    assert cache.get("w1") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = WalletVersionCache(max_size=2)
+    cache.put("w0", "u0", 0, cache.generation)
+    cache.put("w1", "u1", 0, cache.generation)
+    assert cache.get("w0") is not None
+
+    cache.put("w2", "u2", 0, cache.generation)
+
+    assert cache.get("w1") is None
+    assert cache.get("w0") is not None
+    assert cache.get("w2") is not None
+
+
+def test_put_is_dropped_after_a_concurrent_invalidation() -> None:
+    cache = WalletVersionCache()
+    generation = cache.generation
+    cache.invalidate(["w9"])
+
+    cache.put("w1", "u1", 1, generation)
+
+    assert cache.get("w1") is None
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "matches"),
+    [
+        ('W/"3"', True),
+        ('"3"', True),
+        ('W/"1", W/"3"', True),
+        ("*", True),
+        ('W/"4"', False),
+        ('W/"30"', False),
+    ],
+)
+def test_etag_matching(if_none_match: str, matches: bool) -> None:
+    assert etag_matches(if_none_match, 'W/"3"') is matches
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "memory"])
+def test_wallet_writes_bump_versions_and_invalidate(
+    tmp_path: Path, backend: str
+) -> None:
+    cache = WalletVersionCache()
+    storage: Storage
+    if backend == "memory":
+        storage = MemoryStorage(MemoryDatabase(), wallet_versions=cache)
+    else:
+        conn = connect(tmp_path / "versions.db")
+        setup(conn)
+        storage = SqliteStorage(conn, wallet_versions=cache)
+    wallets = storage.wallets()
+    with storage.uow():
+        storage.users().create(User(id="u1", api_key="k1"))
+        storage.users().create(User(id="u2", api_key="k2"))
+        wallets.create(Wallet(address="w1", user_id="u1", balance_sat=10_000))
+        wallets.create(Wallet(address="w2", user_id="u2", balance_sat=0))
+
+    def cached(*addresses: str) -> None:
+        for address in addresses:
+            wallet = wallets.read(address)
+            cache.put(address, wallet.user_id, wallet.version, cache.generation)
+
+    assert [wallets.read(a).version for a in ("w1", "w2")] == [0, 0]
+
+    cached("w1", "w2")
+    TransactionService(storage=storage).transfer("u1", "w1", "w2", 1_000)
+    assert cache.get("w1") is None
+    assert cache.get("w2") is None
+    assert [wallets.read(a).version for a in ("w1", "w2")] == [1, 1]
+
+    cached("w1", "w2")
+    TransactionService(storage=storage).transfer_many(
+        "u1", [TransferRequest("w1", "w2", 1_000)]
+    )
+    assert cache.get("w1") is None
+    assert cache.get("w2") is None
+    assert [wallets.read(a).version for a in ("w1", "w2")] == [2, 2]
+
+    cached("w2")
+    with storage.uow():
+        wallets.update(Wallet(address="w2", user_id="u2", balance_sat=0))
+        cached("w2")
+        assert cache.get("w2") is not None
+    assert cache.get("w2") is None
+    assert wallets.read("w2").version == 3
+
+
+def test_rolled_back_memory_writes_are_not_left_cached() -> None:
+    cache = WalletVersionCache()
+    storage = MemoryStorage(MemoryDatabase(), wallet_versions=cache)
+    wallets = storage.wallets()
+    storage.users().create(User(id="u1", api_key="k1"))
+    wallets.create(Wallet(address="w1", user_id="u1", balance_sat=100))
+    wallets.create(Wallet(address="w2", user_id="u1", balance_sat=0))
+
+    def cache_uncommitted_then_fail() -> None:
+        with storage.uow():
+            wallets.move_balance("u1", "w1", "w2", 10, 0)
+            uncommitted = wallets.read("w1")
+            cache.put("w1", "u1", uncommitted.version, cache.generation)
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        cache_uncommitted_then_fail()
+
+    assert cache.get("w1") is None
+    assert wallets.read("w1").version == 0
+
+
+def test_lookup_during_an_open_transfer_does_not_cache_a_stale_etag(
+    tmp_path: Path,
+) -> None:
+    settings = Settings(
+        database_path=tmp_path / "api.db", stub_usd_per_btc=Decimal("50000.00")
+    )
+    app = create_app(settings)
+
+    with TestClient(app) as client:
+        user = client.post("/users").json()
+        headers = {"X-API-KEY": user["api_key"]}
+        w1 = client.post("/wallets", headers=headers).json()["address"]
+        w2 = client.post("/wallets", headers=headers).json()["address"]
+        path = f"/wallets/{w1}"
+        stale = {
+            **headers,
+            "If-None-Match": client.get(path, headers=headers).headers["ETag"],
+        }
+
+        factory: StorageFactory = app.state.storage_factory
+        with factory.storage("write") as storage, storage.uow():
+            storage.wallets().move_balance(user["user_id"], w1, w2, 1_000, 0)
+            assert client.get(path, headers=stale).status_code == 304
+
+        r = client.get(path, headers=stale)
+        assert r.status_code == 200
+        assert r.headers["ETag"] == 'W/"1"'
+
+
+def test_memory_lookup_during_a_rolled_back_write_sees_committed_state(
+    tmp_path: Path,
+) -> None:
+    settings = Settings(
+        database_path=tmp_path / "unused.db",
+        storage_backend="memory",
+        stub_usd_per_btc=Decimal("50000.00"),
+    )
+    app = create_app(settings)
+
+    with TestClient(app) as client:
+        user = client.post("/users").json()
+        headers = {"X-API-KEY": user["api_key"]}
+        w1 = client.post("/wallets", headers=headers).json()["address"]
+        w2 = client.post("/wallets", headers=headers).json()["address"]
+        path = f"/wallets/{w1}"
+        before = client.get(path, headers=headers)
+        factory: StorageFactory = app.state.storage_factory
+        lookups: list[Future[httpx.Response]] = []
+
+        def write_then_roll_back(pool: ThreadPoolExecutor) -> None:
+            with factory.storage("write") as storage, storage.uow():
+                storage.wallets().move_balance(user["user_id"], w1, w2, 1_000, 0)
+                lookups.append(pool.submit(client.get, path, headers=headers))
+                done, _ = wait(lookups, timeout=0.1)
+                assert not done
+                raise RuntimeError("rollback")
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            with pytest.raises(RuntimeError, match="rollback"):
+                write_then_roll_back(pool)
+            during = lookups[0].result(timeout=5)
+
+        assert during.headers["ETag"] == before.headers["ETag"] == 'W/"0"'
+        assert during.json() == before.json()
+
+        payload = {"from_address": w1, "to_address": w2, "amount_sat": 2_000}
+        assert client.post("/transactions", headers=headers, json=payload).is_success
+        r = client.get(path, headers={**headers, "If-None-Match": 'W/"0"'})
+        assert r.status_code == 200
+        assert r.headers["ETag"] == 'W/"1"'
+
+
+def test_setup_adds_version_to_legacy_wallets(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(db_path)
+    legacy.executescript(
+        """
+        CREATE TABLE users (id TEXT PRIMARY KEY, api_key TEXT NOT NULL UNIQUE);
+        CREATE TABLE wallets (
+            address TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            balance_sat INTEGER NOT NULL,
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+        INSERT INTO users VALUES ('u1', 'k1');
+        INSERT INTO wallets VALUES ('w1', 'u1', 500);
+        """
+    )
+    legacy.close()
+
+    conn = connect(db_path)
+    setup(conn)
+    setup(conn)
+
+    assert SqliteStorage(conn).wallets().read("w1") == Wallet("w1", "u1", 500, 0)
+    conn.close()
+
+
+@pytest.mark.parametrize("group_commit", [False, True])
+def test_conditional_get_skips_reads_and_pricing(
+    tmp_path: Path, group_commit: bool
+) -> None:
+    settings = Settings(
+        database_path=tmp_path / "api.db", debug=True, group_commit=group_commit
+    )
+    app = create_app(settings)
+    prices = CountingPriceProvider()
+    app.dependency_overrides[get_price_provider] = lambda: prices
+
+    with TestClient(app) as client:
+        headers = {"X-API-KEY": client.post("/users").json()["api_key"]}
+        w1 = client.post("/wallets", headers=headers).json()["address"]
+        w2 = client.post("/wallets", headers=headers).json()["address"]
+        paths = (f"/wallets/{w1}", f"/wallets/{w1}/transactions")
+
+        etags = [client.get(path, headers=headers).headers["ETag"] for path in paths]
+        assert etags == ['W/"0"', 'W/"0"']
+
+        calls = prices.calls
+        for path, etag in zip(paths, etags, strict=True):
+            r = client.get(path, headers={**headers, "If-None-Match": etag})
+            assert r.status_code == 304
+            assert r.headers["ETag"] == etag
+            assert r.content == b""
+        r = client.get(paths[0], headers={**headers, "If-None-Match": etags[0]})
+        assert r.headers["X-SQL-Statements"] == "0"
+        assert prices.calls == calls
+
+        payload = {"from_address": w1, "to_address": w2, "amount_sat": 1_000}
+        assert client.post("/transactions", headers=headers, json=payload).is_success
+
+        for path, etag in zip(paths, etags, strict=True):
+            r = client.get(path, headers={**headers, "If-None-Match": etag})
+            assert r.status_code == 200
+            assert r.headers["ETag"] == 'W/"1"'
+        assert prices.calls > calls
+
+        other = {"X-API-KEY": client.post("/users").json()["api_key"]}
+        for path in paths:
+            r = client.get(path, headers={**other, "If-None-Match": 'W/"1"'})
+            assert r.status_code == 404
@@ -1,11 +1,11 @@
 import pytest
 
 from wallet.core.domain import User, Wallet
-from wallet.core.errors import ConflictError, NotFoundError
-from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.core.errors import ConflictError, InsufficientFundsError, NotFoundError
+from wallet.core.repository.storage import Storage
 
 
-def test_create_and_read_wallet(storage: SqliteStorage) -> None:
+def test_create_and_read_wallet(storage: Storage) -> None:
     users = storage.users()
     wallets = storage.wallets()
 
@@ -18,7 +18,7 @@ def test_create_and_read_wallet(storage: SqliteStorage) -> None:
     assert loaded == wallet
 
 
-def test_read_all_and_count_wallet(storage: SqliteStorage) -> None:
+def test_read_all_and_count_wallet(storage: Storage) -> None:
     users = storage.users()
     wallets = storage.wallets()
 
@@ -41,7 +41,7 @@ def test_read_all_and_count_wallet(storage: SqliteStorage) -> None:
     assert balances["w3"] == 300
 
 
-def test_update_wallet_balance(storage: SqliteStorage) -> None:
+def test_update_wallet_balance(storage: Storage) -> None:
     users = storage.users()
     wallets = storage.wallets()
 
@@ -54,7 +54,7 @@ def test_update_wallet_balance(storage: SqliteStorage) -> None:
     assert updated.balance_sat == 500
 
 
-def test_delete_wallet(storage: SqliteStorage) -> None:
+def test_delete_wallet(storage: Storage) -> None:
     users = storage.users()
     wallets = storage.wallets()
 
@@ -67,7 +67,7 @@ def test_delete_wallet(storage: SqliteStorage) -> None:
         wallets.read("addr1")
 
 
-def test_wallet_conflict(storage: SqliteStorage) -> None:
+def test_wallet_conflict(storage: Storage) -> None:
     users = storage.users()
     wallets = storage.wallets()
 
@@ -77,3 +77,81 @@ def test_wallet_conflict(storage: SqliteStorage) -> None:
 
     with pytest.raises(ConflictError):
         wallets.create(wallet)
+
+
+def test_read_by_owner(storage: Storage) -> None:
+    users = storage.users()
+    wallets = storage.wallets()
+
+    users.create(User(id="u1", api_key="k1"))
+    users.create(User(id="u2", api_key="k2"))
+    wallets.create(Wallet(address="w1", user_id="u1", balance_sat=100))
+    wallets.create(Wallet(address="w2", user_id="u2", balance_sat=200))
+    wallets.create(Wallet(address="w3", user_id="u1", balance_sat=300))
+
+    assert {w.address for w in wallets.read_by_owner("u1")} == {"w1", "w3"}
+    assert list(wallets.read_by_owner("nobody")) == []
+
+
+def test_move_balance(storage: Storage) -> None:
+    users = storage.users()
+    wallets = storage.wallets()
+
+    users.create(User(id="u1", api_key="k1"))
+    users.create(User(id="u2", api_key="k2"))
+    wallets.create(Wallet(address="w1", user_id="u1", balance_sat=1000))
+    wallets.create(Wallet(address="w2", user_id="u1", balance_sat=0))
+    wallets.create(Wallet(address="w3", user_id="u2", balance_sat=0))
+
+    assert wallets.move_balance("u1", "w1", "w2", 300, 5) == 0
+    assert wallets.move_balance("u1", "w1", "w3", 300, 5) == 5
+
+    assert wallets.read("w1").balance_sat == 400
+    assert wallets.read("w2").balance_sat == 300
+    assert wallets.read("w3").balance_sat == 295
+
+
+def test_move_balance_errors(storage: Storage) -> None:
+    users = storage.users()
+    wallets = storage.wallets()
+
+    with storage.uow():
+        users.create(User(id="u1", api_key="k1"))
+        users.create(User(id="u2", api_key="k2"))
+        wallets.create(Wallet(address="w1", user_id="u1", balance_sat=1000))
+        wallets.create(Wallet(address="w2", user_id="u2", balance_sat=0))
+
+    cases = [
+        (("u2", "w1", "w2", 10), NotFoundError, "Source wallet not found"),
+        (("u1", "missing", "w2", 10), NotFoundError, "Wallet not found"),
+        (("u1", "w1", "missing", 10), NotFoundError, "Wallet not found"),
+        (("u1", "w1", "missing", 10_000), NotFoundError, "Wallet not found"),
+        (("u1", "w1", "w2", 10_000), InsufficientFundsError, "Insufficient funds"),
+    ]
+    for (user_id, src, dst, amount), error, message in cases:
+        with pytest.raises(error, match=message), storage.uow():
+            wallets.move_balance(user_id, src, dst, amount, 0)
+
+    assert wallets.read("w1").balance_sat == 1000
+    assert wallets.read("w2").balance_sat == 0
+
+
+def test_create_many_and_count_by_owner(storage: Storage) -> None:
+    storage.users().create(User(id="u1", api_key="k1"))
+    storage.users().create(User(id="u2", api_key="k2"))
+    wallets = storage.wallets()
+
+    wallets.create_many(
+        [
+            Wallet(address="w1", user_id="u1", balance_sat=1),
+            Wallet(address="w2", user_id="u1", balance_sat=2),
+            Wallet(address="w3", user_id="u2", balance_sat=3),
+        ]
+    )
+
+    assert wallets.count_by_owner("u1") == 2
+    assert wallets.count_by_owner("missing") == 0
+    assert wallets.count_by_owners(["u1", "u2", "missing"]) == {"u1": 2, "u2": 1}
+
+    with pytest.raises(ConflictError):
+        wallets.create_many([Wallet(address="w4", user_id="missing", balance_sat=0)])
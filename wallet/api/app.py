@@ -1,22 +1,111 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
 from fastapi import FastAPI
 
 from wallet.api.errors_handler import install_error_handlers
+from wallet.api.metrics import (
+    DebugHeadersMiddleware,
+    MetricsMiddleware,
+    MetricsRegistry,
+    TimedJSONResponse,
+)
+from wallet.api.routers.metrics import router as metrics_router
 from wallet.api.routers.statistics import router as statistics_router
 from wallet.api.routers.transactions import router as transactions_router
 from wallet.api.routers.users import router as users_router
 from wallet.api.routers.wallets import router as wallets_router
+from wallet.core.repository.storage import StorageFactory
+from wallet.core.services.api_keys import ApiKeyCache
+from wallet.core.services.wallet_versions import WalletVersionCache
+from wallet.infra.memory.storage import MemoryStorageFactory
+from wallet.infra.pricing.cache import AsyncCachedPriceProvider
+from wallet.infra.pricing.coinbase import AsyncCoinbasePriceProvider
+from wallet.infra.pricing.static import StaticPriceProvider
+from wallet.infra.sqlite.factory import SqliteStorageFactory
+from wallet.infra.sqlite.group_commit import SqliteGroupCommitWriter
 from wallet.settings import Settings
 
 
 def create_app(settings: Settings) -> FastAPI:
-    app = FastAPI(title="Bitcoin Wallet API")
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        api_keys = None
+        if settings.api_key_cache_size > 0:
+            api_keys = ApiKeyCache(
+                max_size=settings.api_key_cache_size,
+                ttl_seconds=settings.api_key_cache_ttl_seconds,
+                negative_ttl_seconds=settings.api_key_negative_ttl_seconds,
+            )
+        app.state.api_keys = api_keys
+
+        wallet_versions = None
+        if settings.wallet_version_cache_size > 0:
+            wallet_versions = WalletVersionCache(
+                max_size=settings.wallet_version_cache_size,
+                ttl_seconds=settings.wallet_version_cache_ttl_seconds,
+            )
+        app.state.wallet_versions = wallet_versions
+
+        storage_factory: StorageFactory = (
+            MemoryStorageFactory(api_keys=api_keys, wallet_versions=wallet_versions)
+            if settings.storage_backend == "memory"
+            else SqliteStorageFactory.from_settings(settings, api_keys, wallet_versions)
+        )
+        app.state.storage_factory = storage_factory
+
+        writer = None
+        if settings.group_commit:
+            writer = SqliteGroupCommitWriter(
+                db_path=settings.database_path,
+                profile=settings.storage_profile,
+                flush_window_seconds=settings.group_commit_window_ms / 1000,
+                max_batch=settings.group_commit_max_batch,
+                wallet_versions=wallet_versions,
+            )
+            writer.start()
+        app.state.transfer_writer = writer
+
+        http_client = None
+        if settings.stub_usd_per_btc is not None:
+            app.state.price_provider = StaticPriceProvider(settings.stub_usd_per_btc)
+        else:
+            http_client = httpx.AsyncClient()
+            app.state.price_provider = AsyncCachedPriceProvider(
+                inner=AsyncCoinbasePriceProvider(client=http_client),
+                ttl_seconds=settings.price_ttl_seconds,
+                stale_while_revalidate_seconds=settings.price_stale_while_revalidate_seconds,
+                max_staleness_seconds=settings.price_max_staleness_seconds,
+            )
+        try:
+            yield
+        finally:
+            if http_client is not None:
+                await http_client.aclose()
+            if writer is not None:
+                writer.close()
+            storage_factory.close()
+
+    app = FastAPI(
+        title="Bitcoin Wallet API",
+        lifespan=lifespan,
+        default_response_class=TimedJSONResponse,
+    )
     app.state.settings = settings
+    app.state.metrics = MetricsRegistry()
+    if settings.debug:
+        app.add_middleware(DebugHeadersMiddleware)
+    if settings.metrics or settings.debug:
+        app.add_middleware(MetricsMiddleware, registry=app.state.metrics)
     install_error_handlers(app)
 
     app.include_router(users_router)
     app.include_router(wallets_router)
     app.include_router(transactions_router)
     app.include_router(statistics_router)
+    if settings.metrics:
+        app.include_router(metrics_router)
     return app
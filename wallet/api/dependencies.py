@@ -5,13 +5,18 @@ from dataclasses import dataclass
 from typing import cast
 
 from fastapi import Depends, Header, HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
 
+from wallet.api.etags import etag_matches, wallet_etag
+from wallet.api.metrics import MetricsRegistry
+from wallet.api.pricing import AnyPriceProvider
+from wallet.core.domain import User, Wallet
 from wallet.core.errors import NotFoundError
-from wallet.core.services.pricing import PriceProvider
-from wallet.infra.pricing.coinbase import CoinbasePriceProvider
-from wallet.infra.sqlite.connection import connect
-from wallet.infra.sqlite.setup import setup
-from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.core.repository.storage import Storage, StorageFactory
+from wallet.core.services.api_keys import ApiKeyCache
+from wallet.core.services.transactions import TransactionService, Transfer
+from wallet.core.services.wallet_versions import WalletVersionCache
+from wallet.infra.sqlite.group_commit import SqliteGroupCommitWriter
 from wallet.settings import Settings
 
 
@@ -19,17 +24,53 @@ def get_settings(request: Request) -> Settings:
     return cast(Settings, request.app.state.settings)
 
 
-def get_storage(settings: Settings = Depends(get_settings)) -> Generator[SqliteStorage]:  # noqa: B008
-    conn = connect(settings.database_path)
-    try:
-        setup(conn)
-        yield SqliteStorage(conn)
-    finally:
-        conn.close()
+def get_storage_factory(request: Request) -> StorageFactory:
+    return cast(StorageFactory, request.app.state.storage_factory)
 
 
-def get_price_provider() -> PriceProvider:
-    return CoinbasePriceProvider()
+def get_storage(
+    factory: StorageFactory = Depends(get_storage_factory),  # noqa: B008
+) -> Generator[Storage]:
+    with factory.storage("write") as storage:
+        yield storage
+
+
+def get_read_storage(
+    factory: StorageFactory = Depends(get_storage_factory),  # noqa: B008
+) -> Generator[Storage]:
+    with factory.storage("read") as storage:
+        yield storage
+
+
+def get_transfer_writer(request: Request) -> SqliteGroupCommitWriter | None:
+    return cast(SqliteGroupCommitWriter | None, request.app.state.transfer_writer)
+
+
+def get_transfer(
+    writer: SqliteGroupCommitWriter | None = Depends(get_transfer_writer),  # noqa: B008
+    factory: StorageFactory = Depends(get_storage_factory),  # noqa: B008
+) -> Generator[Transfer]:
+    if writer is not None:
+        yield writer.transfer
+        return
+    with factory.storage("write") as storage:
+        yield TransactionService(storage=storage).transfer
+
+
+def get_metrics(request: Request) -> MetricsRegistry:
+    return cast(MetricsRegistry, request.app.state.metrics)
+
+
+def get_api_key_cache(request: Request) -> ApiKeyCache | None:
+    return cast(ApiKeyCache | None, request.app.state.api_keys)
+
+
+def get_wallet_version_cache(request: Request) -> WalletVersionCache | None:
+    return cast(WalletVersionCache | None, request.app.state.wallet_versions)
+
+
+def get_price_provider(request: Request) -> AnyPriceProvider:
+    return cast(AnyPriceProvider, request.app.state.price_provider)
 
 
 @dataclass(frozen=True)
@@ -38,25 +79,80 @@ class AuthenticatedUser:
     api_key: str
 
 
-def require_user(
+def _load_user(
+    factory: StorageFactory, api_keys: ApiKeyCache | None, api_key: str
+) -> User | None:
+    generation = api_keys.generation if api_keys is not None else 0
+    with factory.storage("read") as storage:
+        try:
+            user: User | None = storage.users().read_by_api_key(api_key)
+        except NotFoundError:
+            user = None
+    if api_keys is not None:
+        api_keys.put(api_key, user, generation)
+    return user
+
+
+async def require_user(
     x_api_key: str | None = Header(default=None, alias="X-API-KEY"),
-    storage: SqliteStorage = Depends(get_storage),  # noqa: B008
+    factory: StorageFactory = Depends(get_storage_factory),  # noqa: B008
+    api_keys: ApiKeyCache | None = Depends(get_api_key_cache),  # noqa: B008
 ) -> AuthenticatedUser:
     if not x_api_key:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing X-API-KEY"
         )
 
-    try:
-        user = storage.users().read_by_api_key(x_api_key)
-    except NotFoundError as e:
+    entry = api_keys.get(x_api_key) if api_keys is not None else None
+    if entry is not None:
+        user = entry.user
+    else:
+        user = await run_in_threadpool(_load_user, factory, api_keys, x_api_key)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key"
-        ) from e
+        )
 
     return AuthenticatedUser(id=user.id, api_key=user.api_key)
 
 
+def _load_wallet(
+    factory: StorageFactory, versions: WalletVersionCache | None, address: str
+) -> Wallet:
+    generation = versions.generation if versions is not None else 0
+    with factory.storage("read") as storage:
+        wallet = storage.wallets().read(address)
+    if versions is not None:
+        versions.put(address, wallet.user_id, wallet.version, generation)
+    return wallet
+
+
+async def check_wallet_etag(
+    address: str,
+    if_none_match: str | None = Header(default=None),
+    user: AuthenticatedUser = Depends(require_user),  # noqa: B008
+    factory: StorageFactory = Depends(get_storage_factory),  # noqa: B008
+    versions: WalletVersionCache | None = Depends(get_wallet_version_cache),  # noqa: B008
+) -> None:
+    if if_none_match is None:
+        return
+
+    entry = versions.get(address) if versions is not None else None
+    if entry is not None:
+        owner, version = entry.user_id, entry.version
+    else:
+        wallet = await run_in_threadpool(_load_wallet, factory, versions, address)
+        owner, version = wallet.user_id, wallet.version
+    if owner != user.id:
+        raise NotFoundError("Wallet not found")
+
+    etag = wallet_etag(version)
+    if etag_matches(if_none_match, etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+
 def require_admin(
     request: Request,
     x_api_key: str | None = Header(default=None, alias="X-API-KEY"),
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+
+def wallet_etag(version: int) -> str:
+    return f'W/"{version}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    opaque = etag.removeprefix("W/")
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag == "*" or tag.removeprefix("W/") == opaque for tag in tags)
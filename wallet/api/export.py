@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import Literal
+
+from wallet.api.models import TransactionResponse
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+CSV_COLUMNS = list(TransactionResponse.model_fields)
+
+
+def _batches(
+    views: Iterable[dict[str, str | int]],
+) -> Iterator[list[dict[str, str | int]]]:
+    it = iter(views)
+    while batch := list(islice(it, EXPORT_BATCH_SIZE)):
+        yield batch
+
+
+def ndjson_rows(views: Iterable[dict[str, str | int]]) -> Iterator[str]:
+    for batch in _batches(views):
+        yield "".join(json.dumps(view, separators=(",", ":")) + "\n" for view in batch)
+
+
+def csv_rows(views: Iterable[dict[str, str | int]]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=CSV_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    yield buf.getvalue()
+
+    for batch in _batches(views):
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(batch)
+        yield buf.getvalue()
+
+
+def encode_export(
+    views: Iterable[dict[str, str | int]], fmt: ExportFormat
+) -> Iterator[str]:
+    if fmt == "csv":
+        return csv_rows(views)
+    return ndjson_rows(views)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from wallet.telemetry import (
+    PHASES,
+    LevelGauge,
+    RequestTimings,
+    current_timings,
+    lock_waiters,
+    timed,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+STATEMENT_BUCKETS = (1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+@dataclass
+class _Series:
+    counts: list[int]
+    total: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class Histogram:
+    name: str
+    help: str
+    label_names: tuple[str, ...]
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+
+    _series: dict[tuple[str, ...], _Series] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = _Series([0] * (len(self.buckets) + 1))
+            series.counts[index] += 1
+            series.total += value
+            series.count += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [
+                (labels, list(s.counts), s.total, s.count)
+                for labels, s in sorted(self._series.items())
+            ]
+        for labels, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(
+                (*self.buckets, float("inf")), counts, strict=True
+            ):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels_le = _labels(self.label_names, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels_le} {cumulative}")
+            suffix = _labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+@dataclass(frozen=True)
+class Gauge:
+    name: str
+    help: str
+    read: Callable[[], float]
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {self.read()}",
+        ]
+
+
+@dataclass
+class MetricsRegistry:
+    in_flight: LevelGauge = field(default_factory=LevelGauge)
+    requests: Histogram = field(
+        default_factory=lambda: Histogram(
+            "wallet_http_request_duration_seconds",
+            "HTTP request latency by route and status.",
+            ("method", "route", "status"),
+        )
+    )
+    phases: Histogram = field(
+        default_factory=lambda: Histogram(
+            "wallet_http_request_phase_seconds",
+            "Time spent per request in db, price, serialization and lock_wait "
+            "(lock_wait is part of db).",
+            ("route", "phase"),
+        )
+    )
+    statements: Histogram = field(
+        default_factory=lambda: Histogram(
+            "wallet_http_request_sql_statements",
+            "SQL statements executed per request (only when SQL tracing is on).",
+            ("route",),
+            STATEMENT_BUCKETS,
+        )
+    )
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        timings: RequestTimings,
+    ) -> None:
+        self.requests.observe((method, route, str(status)), seconds)
+        for phase in PHASES:
+            spent = timings.seconds[phase]
+            if spent > 0:
+                self.phases.observe((route, phase), spent)
+        if timings.statements > 0:
+            self.statements.observe((route,), timings.statements)
+
+    def render(self) -> str:
+        gauges = [
+            Gauge(
+                "wallet_http_requests_in_flight",
+                "Requests currently being served.",
+                lambda: self.in_flight.value,
+            ),
+            Gauge(
+                "wallet_storage_lock_waiters",
+                "Threads currently waiting for the storage write lock.",
+                lambda: lock_waiters.value,
+            ),
+        ]
+        lines = [
+            *self.requests.render(),
+            *self.phases.render(),
+            *self.statements.render(),
+        ]
+        for gauge in gauges:
+            lines.extend(gauge.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        self.registry.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.registry.in_flight.dec()
+            current_timings.reset(token)
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            self.registry.observe_request(
+                scope["method"], route, status, elapsed, timings
+            )
+
+
+class DebugHeadersMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        timings = current_timings.get()
+        if scope["type"] != "http" or timings is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-SQL-Statements"] = str(timings.statements)
+                headers["X-SQL-Rows"] = str(timings.rows)
+                headers["X-DB-Time-Ms"] = f"{timings.seconds['db'] * 1000:.3f}"
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class TimedJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        with timed("serialization"):
+            return super().render(content)
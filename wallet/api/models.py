@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic import BaseModel
 
 
@@ -8,6 +10,14 @@ class UserCreateResponse(BaseModel):
     api_key: str
 
 
+class UserBatchRequest(BaseModel):
+    count: int
+
+
+class UserBatchResponse(BaseModel):
+    users: list[UserCreateResponse]
+
+
 class WalletCreateResponse(BaseModel):
     address: str
     balance_sat: int
@@ -19,6 +29,18 @@ class WalletGetResponse(WalletCreateResponse):
     pass
 
 
+class WalletBatchRequest(BaseModel):
+    user_ids: list[str]
+
+
+class WalletBatchItemResponse(WalletCreateResponse):
+    user_id: str
+
+
+class WalletBatchResponse(BaseModel):
+    wallets: list[WalletBatchItemResponse]
+
+
 class TransactionCreateRequest(BaseModel):
     from_address: str
     to_address: str
@@ -38,8 +60,38 @@ class TransactionResponse(BaseModel):
     created_at: str
 
 
+class TransactionBatchRequest(BaseModel):
+    transfers: list[TransactionCreateRequest]
+    mode: Literal["atomic", "per_item"] = "atomic"
+
+
+class TransactionBatchItemResponse(BaseModel):
+    index: int
+    transaction: TransactionResponse | None = None
+    error: str | None = None
+
+
+class TransactionBatchResponse(BaseModel):
+    results: list[TransactionBatchItemResponse]
+
+
+class TransactionPageResponse(BaseModel):
+    items: list[TransactionResponse]
+    next_cursor: str | None
+
+
+class StatisticsBucketResponse(BaseModel):
+    bucket_start: str
+    total_transactions: int
+    volume_sat: int
+    platform_profit_sat: int
+    platform_profit_btc: str
+    platform_profit_usd: str
+
+
 class StatisticsResponse(BaseModel):
     total_transactions: int
     platform_profit_sat: int
     platform_profit_btc: str
     platform_profit_usd: str
+    buckets: list[StatisticsBucketResponse] | None = None
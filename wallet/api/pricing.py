@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import cast
+
+from starlette.concurrency import run_in_threadpool
+
+from wallet.core.services.pricing import AsyncPriceProvider, BtcUsdQuote, PriceProvider
+from wallet.telemetry import timed
+
+AnyPriceProvider = PriceProvider | AsyncPriceProvider
+
+
+async def fetch_quote(provider: AnyPriceProvider) -> BtcUsdQuote:
+    with timed("price"):
+        if inspect.iscoroutinefunction(provider.btc_usd):
+            return await cast(AsyncPriceProvider, provider).btc_usd()
+        return await run_in_threadpool(cast(PriceProvider, provider).btc_usd)
+
+
+@asynccontextmanager
+async def prefetch_quote(
+    provider: AnyPriceProvider,
+) -> AsyncIterator[asyncio.Task[BtcUsdQuote]]:
+    task = asyncio.ensure_future(fetch_quote(provider))
+    try:
+        yield task
+    finally:
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from wallet.api.dependencies import get_metrics, require_admin
+from wallet.api.metrics import CONTENT_TYPE, MetricsRegistry
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_admin)],  # noqa: B008
+    include_in_schema=False,
+)
+def metrics(
+    registry: MetricsRegistry = Depends(get_metrics),  # noqa: B008
+) -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
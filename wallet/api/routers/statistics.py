@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from datetime import datetime
 
-from wallet.api.dependencies import get_price_provider, get_storage, require_admin
-from wallet.api.models import StatisticsResponse
-from wallet.core.services.pricing import PriceProvider, quantize_usd
+from fastapi import APIRouter, Depends, Query
+from starlette.concurrency import run_in_threadpool
+
+from wallet.api.dependencies import (
+    get_price_provider,
+    get_read_storage,
+    require_admin,
+)
+from wallet.api.models import StatisticsBucketResponse, StatisticsResponse
+from wallet.api.pricing import AnyPriceProvider, prefetch_quote
+from wallet.core.domain import Granularity, PlatformStats, StatsBucket
+from wallet.core.errors import ValidationError
+from wallet.core.repository.storage import Storage
+from wallet.core.services.formatting import UsdRate, format_btc, format_usd
 from wallet.core.services.transactions import TransactionService
-from wallet.core.services.wallets import sat_to_btc
-from wallet.infra.sqlite.storage import SqliteStorage
 
 router = APIRouter()
 
@@ -17,22 +26,48 @@ router = APIRouter()
     response_model=StatisticsResponse,
     dependencies=[Depends(require_admin)],  # noqa: B008
 )
-def statistics(
-    storage: SqliteStorage = Depends(get_storage),  # noqa: B008
-    price_provider: PriceProvider = Depends(get_price_provider),  # noqa: B008
+async def statistics(
+    start: datetime | None = Query(default=None, alias="from"),  # noqa: B008
+    end: datetime | None = Query(default=None, alias="to"),  # noqa: B008
+    granularity: Granularity | None = None,
+    storage: Storage = Depends(get_read_storage),  # noqa: B008
+    price_provider: AnyPriceProvider = Depends(get_price_provider),  # noqa: B008
 ) -> StatisticsResponse:
-    service = TransactionService(storage=storage, price_provider=price_provider)
+    if granularity is None and (start is not None or end is not None):
+        raise ValidationError("granularity is required with from/to")
+
+    service = TransactionService(storage=storage)
+
+    def read() -> tuple[PlatformStats, list[StatsBucket] | None]:
+        stats = service.platform_stats()
+        if granularity is None:
+            return stats, None
+        return stats, service.platform_buckets(granularity, start, end)
 
-    total = storage.transactions().count()
-    profit_sat = service.platform_profit_sat()
+    async with prefetch_quote(price_provider) as pending:
+        stats, buckets = await run_in_threadpool(read)
+        quote = await pending
 
-    quote = price_provider.btc_usd()
-    profit_btc = sat_to_btc(profit_sat)
-    profit_usd = quantize_usd(profit_btc * quote.usd_per_btc)
+    profit_sat = stats.total_fee_sat
+    rate = quote.usd_rate
 
     return StatisticsResponse(
-        total_transactions=total,
+        total_transactions=stats.total_transactions,
         platform_profit_sat=profit_sat,
-        platform_profit_btc=format(profit_btc, "f"),
-        platform_profit_usd=format(profit_usd, "f"),
+        platform_profit_btc=format_btc(profit_sat),
+        platform_profit_usd=format_usd(profit_sat, rate),
+        buckets=None
+        if buckets is None
+        else [_bucket_response(b, rate) for b in buckets],
+    )
+
+
+def _bucket_response(bucket: StatsBucket, rate: UsdRate) -> StatisticsBucketResponse:
+    return StatisticsBucketResponse(
+        bucket_start=bucket.bucket_start.isoformat(),
+        total_transactions=bucket.total_transactions,
+        volume_sat=bucket.total_volume_sat,
+        platform_profit_sat=bucket.total_fee_sat,
+        platform_profit_btc=format_btc(bucket.total_fee_sat),
+        platform_profit_usd=format_usd(bucket.total_fee_sat, rate),
     )
@@ -1,61 +1,185 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from wallet.api.dependencies import (
     AuthenticatedUser,
+    check_wallet_etag,
     get_price_provider,
+    get_read_storage,
     get_storage,
+    get_transfer,
     require_user,
 )
-from wallet.api.models import TransactionCreateRequest, TransactionResponse
-from wallet.core.services.pricing import PriceProvider
-from wallet.core.services.transactions import TransactionService
-from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.api.etags import wallet_etag
+from wallet.api.export import EXPORT_MEDIA_TYPES, ExportFormat, encode_export
+from wallet.api.models import (
+    TransactionBatchRequest,
+    TransactionBatchResponse,
+    TransactionCreateRequest,
+    TransactionPageResponse,
+    TransactionResponse,
+)
+from wallet.api.pricing import AnyPriceProvider, prefetch_quote
+from wallet.api.serialization import json_response
+from wallet.core.repository.storage import Storage
+from wallet.core.services.pricing import BtcUsdQuote
+from wallet.core.services.transactions import (
+    MAX_PAGE_SIZE,
+    TransactionPage,
+    TransactionService,
+    Transfer,
+    TransferRequest,
+)
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+
 
 @router.post("/transactions", response_model=TransactionResponse)
-def create_transaction(
+async def create_transaction(
     payload: TransactionCreateRequest,
     user: AuthenticatedUser = Depends(require_user),  # noqa: B008
-    storage: SqliteStorage = Depends(get_storage),  # noqa: B008
-    price_provider: PriceProvider = Depends(get_price_provider),  # noqa: B008
+    transfer: Transfer = Depends(get_transfer),  # noqa: B008
+    price_provider: AnyPriceProvider = Depends(get_price_provider),  # noqa: B008
 ) -> TransactionResponse:
-    service = TransactionService(storage=storage, price_provider=price_provider)
-    tx = service.transfer(
-        user_id=user.id,
-        from_address=payload.from_address,
-        to_address=payload.to_address,
-        amount_sat=payload.amount_sat,
+    async with prefetch_quote(price_provider) as quote:
+        tx = await run_in_threadpool(
+            transfer,
+            user.id,
+            payload.from_address,
+            payload.to_address,
+            payload.amount_sat,
+        )
+        view = TransactionService.transaction_view(tx, await quote)
+    return TransactionResponse.model_validate(view)
+
+
+@router.post("/transactions/batch", response_model=TransactionBatchResponse)
+async def create_transactions_batch(
+    payload: TransactionBatchRequest,
+    user: AuthenticatedUser = Depends(require_user),  # noqa: B008
+    storage: Storage = Depends(get_storage),  # noqa: B008
+    price_provider: AnyPriceProvider = Depends(get_price_provider),  # noqa: B008
+) -> Response:
+    service = TransactionService(storage=storage)
+    transfers = [
+        TransferRequest(
+            from_address=t.from_address,
+            to_address=t.to_address,
+            amount_sat=t.amount_sat,
+        )
+        for t in payload.transfers
+    ]
+    async with prefetch_quote(price_provider) as pending:
+        results = await run_in_threadpool(
+            service.transfer_many,
+            user_id=user.id,
+            transfers=transfers,
+            atomic=payload.mode == "atomic",
+        )
+        quote = await pending
+
+    return json_response(
+        {
+            "results": [
+                {"index": index, "transaction": None, "error": str(result.error)}
+                if result.transaction is None
+                else {
+                    "index": index,
+                    "transaction": service.tx_view(result.transaction, quote),
+                    "error": None,
+                }
+                for index, result in enumerate(results)
+            ]
+        }
     )
-    return TransactionResponse.model_validate(service.tx_view(tx))
 
 
-@router.get("/transactions", response_model=list[TransactionResponse])
-def list_transactions(
+@router.get("/transactions", response_model=TransactionPageResponse)
+async def list_transactions(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user: AuthenticatedUser = Depends(require_user),  # noqa: B008
+    storage: Storage = Depends(get_read_storage),  # noqa: B008
+    price_provider: AnyPriceProvider = Depends(get_price_provider),  # noqa: B008
+) -> Response:
+    service = TransactionService(storage=storage)
+    async with prefetch_quote(price_provider) as quote:
+        page = await run_in_threadpool(
+            service.page_user_transactions, user.id, limit, cursor
+        )
+        return _page_response(service, page, await quote)
+
+
+@router.get(
+    "/wallets/{address}/transactions",
+    response_model=TransactionPageResponse,
+    dependencies=[Depends(check_wallet_etag)],  # noqa: B008
+)
+async def list_wallet_transactions(
+    address: str,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user: AuthenticatedUser = Depends(require_user),  # noqa: B008
+    storage: Storage = Depends(get_read_storage),  # noqa: B008
+    price_provider: AnyPriceProvider = Depends(get_price_provider),  # noqa: B008
+) -> Response:
+    service = TransactionService(storage=storage)
+    async with prefetch_quote(price_provider) as quote:
+        page = await run_in_threadpool(
+            service.page_wallet_transactions, user.id, address, limit, cursor
+        )
+        return _page_response(service, page, await quote)
+
+
+@router.get("/transactions/export", response_class=StreamingResponse)
+async def export_transactions(
+    fmt: ExportFormat = Query(default="ndjson", alias="format"),  # noqa: B008
     user: AuthenticatedUser = Depends(require_user),  # noqa: B008
-    storage: SqliteStorage = Depends(get_storage),  # noqa: B008
-    price_provider: PriceProvider = Depends(get_price_provider),  # noqa: B008
-) -> list[TransactionResponse]:
-    service = TransactionService(storage=storage, price_provider=price_provider)
-    out: list[TransactionResponse] = []
-    for tx in service.list_user_transactions(user.id):
-        out.append(TransactionResponse.model_validate(service.tx_view(tx)))
-    return out
-
-
-@router.get("/wallets/{address}/transactions", response_model=list[TransactionResponse])
-def list_wallet_transactions(
+    storage: Storage = Depends(get_read_storage),  # noqa: B008
+    price_provider: AnyPriceProvider = Depends(get_price_provider),  # noqa: B008
+) -> StreamingResponse:
+    service = TransactionService(storage=storage)
+    async with prefetch_quote(price_provider) as quote:
+        txs = await run_in_threadpool(service.export_user_transactions, user.id)
+        views = service.iter_tx_views(txs, await quote)
+    return StreamingResponse(
+        encode_export(views, fmt), media_type=EXPORT_MEDIA_TYPES[fmt]
+    )
+
+
+@router.get("/wallets/{address}/transactions/export", response_class=StreamingResponse)
+async def export_wallet_transactions(
     address: str,
+    fmt: ExportFormat = Query(default="ndjson", alias="format"),  # noqa: B008
     user: AuthenticatedUser = Depends(require_user),  # noqa: B008
-    storage: SqliteStorage = Depends(get_storage),  # noqa: B008
-    price_provider: PriceProvider = Depends(get_price_provider),  # noqa: B008
-) -> list[TransactionResponse]:
-    service = TransactionService(storage=storage, price_provider=price_provider)
-    out: list[TransactionResponse] = []
-    for tx in service.list_wallet_transactions(user.id, address):
-        out.append(TransactionResponse.model_validate(service.tx_view(tx)))
-
-    return out
+    storage: Storage = Depends(get_read_storage),  # noqa: B008
+    price_provider: AnyPriceProvider = Depends(get_price_provider),  # noqa: B008
+) -> StreamingResponse:
+    service = TransactionService(storage=storage)
+    async with prefetch_quote(price_provider) as quote:
+        txs = await run_in_threadpool(
+            service.export_wallet_transactions, user.id, address
+        )
+        views = service.iter_tx_views(txs, await quote)
+    return StreamingResponse(
+        encode_export(views, fmt), media_type=EXPORT_MEDIA_TYPES[fmt]
+    )
+
+
+def _page_response(
+    service: TransactionService, page: TransactionPage, quote: BtcUsdQuote
+) -> Response:
+    response = json_response(
+        {
+            "items": service.tx_views(page.items, quote),
+            "next_cursor": page.next_cursor,
+        }
+    )
+    if page.version is not None:
+        response.headers["ETag"] = wallet_etag(page.version)
+    return response
@@ -1,16 +1,34 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
+from starlette.concurrency import run_in_threadpool
 
-from wallet.api.dependencies import get_storage
-from wallet.api.models import UserCreateResponse
+from wallet.api.dependencies import get_storage, require_admin
+from wallet.api.models import UserBatchRequest, UserBatchResponse, UserCreateResponse
+from wallet.core.repository.storage import Storage
 from wallet.core.services.users import UserService
-from wallet.infra.sqlite.storage import SqliteStorage
 
 router = APIRouter()
 
 
 @router.post("/users", response_model=UserCreateResponse)
-def create_user(storage: SqliteStorage = Depends(get_storage)) -> UserCreateResponse:  # noqa: B008
-    user = UserService(storage).register()
+async def create_user(
+    storage: Storage = Depends(get_storage),  # noqa: B008
+) -> UserCreateResponse:
+    user = await run_in_threadpool(UserService(storage).register)
     return UserCreateResponse(user_id=user.id, api_key=user.api_key)
+
+
+@router.post(
+    "/users/batch",
+    response_model=UserBatchResponse,
+    dependencies=[Depends(require_admin)],  # noqa: B008
+)
+async def create_users_batch(
+    payload: UserBatchRequest,
+    storage: Storage = Depends(get_storage),  # noqa: B008
+) -> UserBatchResponse:
+    users = await run_in_threadpool(UserService(storage).register_many, payload.count)
+    return UserBatchResponse(
+        users=[UserCreateResponse(user_id=u.id, api_key=u.api_key) for u in users]
+    )
@@ -1,39 +1,84 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
 
 from wallet.api.dependencies import (
     AuthenticatedUser,
+    check_wallet_etag,
     get_price_provider,
+    get_read_storage,
     get_storage,
+    require_admin,
     require_user,
 )
-from wallet.api.models import WalletCreateResponse, WalletGetResponse
-from wallet.core.services.pricing import PriceProvider
+from wallet.api.etags import wallet_etag
+from wallet.api.models import (
+    WalletBatchRequest,
+    WalletBatchResponse,
+    WalletCreateResponse,
+    WalletGetResponse,
+)
+from wallet.api.pricing import AnyPriceProvider, prefetch_quote
+from wallet.api.serialization import json_response
+from wallet.core.repository.storage import Storage
 from wallet.core.services.wallets import WalletService
-from wallet.infra.sqlite.storage import SqliteStorage
 
 router = APIRouter()
 
 
 @router.post("/wallets", response_model=WalletCreateResponse)
-def create_wallet(
+async def create_wallet(
     user: AuthenticatedUser = Depends(require_user),  # noqa: B008
-    storage: SqliteStorage = Depends(get_storage),  # noqa: B008
-    price_provider: PriceProvider = Depends(get_price_provider),  # noqa: B008
+    storage: Storage = Depends(get_storage),  # noqa: B008
+    price_provider: AnyPriceProvider = Depends(get_price_provider),  # noqa: B008
 ) -> WalletCreateResponse:
-    service = WalletService(storage=storage, price_provider=price_provider)
-    wallet = service.create_wallet(user.id)
-    return WalletCreateResponse.model_validate(service.wallet_view(wallet))
+    service = WalletService(storage=storage)
+    async with prefetch_quote(price_provider) as quote:
+        wallet = await run_in_threadpool(service.create_wallet, user.id)
+        view = service.wallet_view(wallet, await quote)
+    return WalletCreateResponse.model_validate(view)
+
 
+@router.post(
+    "/wallets/batch",
+    response_model=WalletBatchResponse,
+    dependencies=[Depends(require_admin)],  # noqa: B008
+)
+async def create_wallets_batch(
+    payload: WalletBatchRequest,
+    storage: Storage = Depends(get_storage),  # noqa: B008
+    price_provider: AnyPriceProvider = Depends(get_price_provider),  # noqa: B008
+) -> Response:
+    service = WalletService(storage=storage)
+    async with prefetch_quote(price_provider) as pending:
+        wallets = await run_in_threadpool(service.create_wallets, payload.user_ids)
+        quote = await pending
+    return json_response(
+        {
+            "wallets": [
+                {**service.wallet_view(w, quote), "user_id": w.user_id} for w in wallets
+            ]
+        }
+    )
 
-@router.get("/wallets/{address}", response_model=WalletGetResponse)
-def get_wallet(
+
+@router.get(
+    "/wallets/{address}",
+    response_model=WalletGetResponse,
+    dependencies=[Depends(check_wallet_etag)],  # noqa: B008
+)
+async def get_wallet(
     address: str,
+    response: Response,
     user: AuthenticatedUser = Depends(require_user),  # noqa: B008
-    storage: SqliteStorage = Depends(get_storage),  # noqa: B008
-    price_provider: PriceProvider = Depends(get_price_provider),  # noqa: B008
+    storage: Storage = Depends(get_read_storage),  # noqa: B008
+    price_provider: AnyPriceProvider = Depends(get_price_provider),  # noqa: B008
 ) -> WalletGetResponse:
-    service = WalletService(storage=storage, price_provider=price_provider)
-    wallet = service.get_wallet_owned(user.id, address)
-    return WalletGetResponse.model_validate(service.wallet_view(wallet))
+    service = WalletService(storage=storage)
+    async with prefetch_quote(price_provider) as quote:
+        wallet = await run_in_threadpool(service.get_wallet_owned, user.id, address)
+        view = service.wallet_view(wallet, await quote)
+    response.headers["ETag"] = wallet_etag(wallet.version)
+    return WalletGetResponse.model_validate(view)
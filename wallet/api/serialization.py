@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic_core import to_json
+from starlette.responses import Response
+
+from wallet.telemetry import timed
+
+
+class RawJSONResponse(Response):
+    media_type = "application/json"
+
+
+def json_response(content: Any) -> RawJSONResponse:
+    with timed("serialization"):
+        body = to_json(content)
+    return RawJSONResponse(body)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+import httpx
+import typer
+import uvicorn
+
+from wallet.api.app import create_app
+from wallet.core.domain import BUCKET_FORMATS
+from wallet.infra.sqlite.connection import SqliteReadTransaction, connect
+from wallet.infra.sqlite.setup import retype_created_at, setup
+from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.loadtest import (
+    DEFAULT_MIX,
+    LoadProfile,
+    LoadReport,
+    format_report,
+    in_process_client,
+    parse_mix,
+    run_load,
+    seed_users,
+)
+from wallet.settings import Settings
+
+app = typer.Typer(help="Bitcoin wallet administration commands.")
+stats_app = typer.Typer(help="Maintain the platform statistics aggregates.")
+app.add_typer(stats_app, name="stats")
+
+DATABASE_OPTION = typer.Option(Path("wallet.sqlite3"), "--database", "-d")
+ADMIN_KEY_OPTION = typer.Option("ADMIN-API-KEY", "--admin-key")
+BACKEND_OPTION = typer.Option("sqlite", "--backend")
+LOADTEST_DATABASE_OPTION = typer.Option(None, "--database", "-d")
+
+
+@stats_app.command("verify")
+def stats_verify(database: Path = DATABASE_OPTION) -> None:
+    conn = connect(database)
+    try:
+        setup(conn)
+        statistics = SqliteStorage(conn).statistics()
+        with SqliteReadTransaction(conn):
+            stored = statistics.read()
+            computed = statistics.compute()
+            stale_rollups = [
+                granularity
+                for granularity in BUCKET_FORMATS
+                if statistics.read_buckets(granularity)
+                != statistics.compute_buckets(granularity)
+            ]
+    finally:
+        conn.close()
+
+    typer.echo(f"stored:   {stored}")
+    typer.echo(f"computed: {computed}")
+    if stored != computed:
+        typer.echo("platform statistics are out of sync with the ledger", err=True)
+    for granularity in stale_rollups:
+        typer.echo(f"{granularity} rollups are out of sync with the ledger", err=True)
+    if stored != computed or stale_rollups:
+        raise typer.Exit(code=1)
+
+
+@stats_app.command("rebuild")
+def stats_rebuild(database: Path = DATABASE_OPTION) -> None:
+    conn = connect(database)
+    try:
+        setup(conn)
+        storage = SqliteStorage(conn)
+        with storage.uow():
+            stats = storage.statistics().rebuild()
+    finally:
+        conn.close()
+
+    typer.echo(f"rebuilt:  {stats}")
+
+
+@app.command("migrate")
+def migrate(database: Path = DATABASE_OPTION) -> None:
+    conn = connect(database)
+    try:
+        converted = retype_created_at(conn)
+        setup(conn)
+    finally:
+        conn.close()
+
+    typer.echo(f"created_at migrated: {converted} rows converted")
+
+
+@app.command("serve")
+def serve(
+    database: Path = DATABASE_OPTION,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    admin_key: str = ADMIN_KEY_OPTION,
+    backend: str = BACKEND_OPTION,
+    stub_price: float | None = typer.Option(
+        None, help="Serve a fixed BTC/USD price instead of calling Coinbase."
+    ),
+    metrics: bool = typer.Option(
+        True, help="Time each request's phases and serve them at /metrics."
+    ),
+    debug: bool = typer.Option(
+        False, help="Add per-request SQL counts and DB time as response headers."
+    ),
+    slow_query_ms: float | None = typer.Option(
+        None, help="Log statements slower than this with their query plan."
+    ),
+) -> None:
+    settings = Settings(
+        database_path=database,
+        admin_api_key=admin_key,
+        storage_backend=backend,
+        stub_usd_per_btc=None if stub_price is None else Decimal(str(stub_price)),
+        metrics=metrics,
+        debug=debug,
+        slow_query_ms=slow_query_ms,
+    )
+    uvicorn.run(create_app(settings), host=host, port=port)
+
+
+@app.command("loadtest")
+def loadtest(
+    users: int = 50,
+    wallets_per_user: int = 2,
+    requests: int = 2_000,
+    concurrency: int = 16,
+    mix: str = typer.Option(DEFAULT_MIX, help="Comma-separated endpoint=weight."),
+    seed: int = 0,
+    url: str | None = typer.Option(
+        None, help="Drive a running server instead of an in-process app."
+    ),
+    database: Path | None = LOADTEST_DATABASE_OPTION,
+    admin_key: str = ADMIN_KEY_OPTION,
+    backend: str = BACKEND_OPTION,
+) -> None:
+    try:
+        profile = LoadProfile(
+            users=users,
+            wallets_per_user=wallets_per_user,
+            requests=requests,
+            concurrency=concurrency,
+            mix=parse_mix(mix),
+            seed=seed,
+        )
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+
+    if url is not None:
+        report = asyncio.run(_remote_loadtest(url, profile, admin_key))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                settings = Settings(
+                    database_path=database or Path(tmp) / "loadtest.sqlite3",
+                    admin_api_key=admin_key,
+                    storage_backend=backend,
+                    stub_usd_per_btc=Decimal("50000.00"),
+                )
+            except ValueError as e:
+                raise typer.BadParameter(str(e)) from e
+            report = asyncio.run(_in_process_loadtest(settings, profile))
+
+    for line in format_report(report):
+        typer.echo(line)
+
+
+async def _in_process_loadtest(settings: Settings, profile: LoadProfile) -> LoadReport:
+    async with in_process_client(settings) as client:
+        users = await seed_users(client, profile)
+        return await run_load(client, profile, settings.admin_api_key, users)
+
+
+async def _remote_loadtest(
+    url: str, profile: LoadProfile, admin_key: str
+) -> LoadReport:
+    limits = httpx.Limits(max_connections=profile.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        users = await seed_users(client, profile)
+        return await run_load(client, profile, admin_key, users)
+
+
+if __name__ == "__main__":
+    app()
@@ -2,28 +2,38 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import Literal
 
 SATOSHIS_PER_BTC = 100_000_000
 
+Granularity = Literal["hour", "day", "month"]
+BUCKET_FORMATS: dict[Granularity, str] = {
+    "hour": "%Y-%m-%dT%H:00:00Z",
+    "day": "%Y-%m-%dT00:00:00Z",
+    "month": "%Y-%m-01T00:00:00Z",
+}
+BUCKET_BOUND_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
 
 def utcnow() -> datetime:
     return datetime.now(UTC)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class User:
     id: str
     api_key: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Wallet:
     address: str
     user_id: str
     balance_sat: int
+    version: int = 0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Transaction:
     id: str
     from_address: str
@@ -31,3 +41,18 @@ class Transaction:
     amount_sat: int
     fee_sat: int
     created_at: datetime
+
+
+@dataclass(frozen=True)
+class PlatformStats:
+    total_transactions: int
+    total_fee_sat: int
+    total_volume_sat: int
+
+
+@dataclass(frozen=True)
+class StatsBucket:
+    bucket_start: datetime
+    total_transactions: int
+    total_fee_sat: int
+    total_volume_sat: int
@@ -1,8 +1,19 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Protocol, TypeVar
 
+from wallet.core.domain import (
+    Granularity,
+    PlatformStats,
+    StatsBucket,
+    Transaction,
+    User,
+    Wallet,
+)
+
 T = TypeVar("T")
 
 
@@ -24,3 +35,90 @@ class Repository(Protocol[T]):
 
     def count(self) -> int:
         pass
+
+
+class UserRepository(Repository[User], Protocol):
+    def create_many(self, items: Iterable[User]) -> None:
+        pass
+
+    def read_by_api_key(self, api_key: str) -> User:
+        pass
+
+
+class WalletRepository(Repository[Wallet], Protocol):
+    def create_many(self, items: Iterable[Wallet]) -> None:
+        pass
+
+    def read_by_owner(self, user_id: str) -> Iterable[Wallet]:
+        pass
+
+    def count_by_owner(self, user_id: str) -> int:
+        pass
+
+    def count_by_owners(self, user_ids: Collection[str]) -> dict[str, int]:
+        pass
+
+    def read_many(self, addresses: Collection[str]) -> Iterable[Wallet]:
+        pass
+
+    def update_balances(self, balances: Iterable[tuple[str, int]]) -> None:
+        pass
+
+    def move_balance(
+        self,
+        user_id: str,
+        from_address: str,
+        to_address: str,
+        amount_sat: int,
+        external_fee_sat: int,
+    ) -> int:
+        pass
+
+
+@dataclass(frozen=True)
+class TransactionCursor:
+    created_at: datetime
+    id: str
+
+
+class TransactionRepository(Repository[Transaction], Protocol):
+    def create_many(self, items: Iterable[Transaction]) -> None:
+        pass
+
+    def read_by_addresses(self, addresses: Collection[str]) -> Iterable[Transaction]:
+        pass
+
+    def iter_by_addresses(
+        self, addresses: Collection[str], batch_size: int = 500
+    ) -> Iterator[Transaction]:
+        pass
+
+    def read_page_by_addresses(
+        self,
+        addresses: Collection[str],
+        limit: int,
+        after: TransactionCursor | None = None,
+    ) -> list[Transaction]:
+        pass
+
+
+class StatisticsRepository(Protocol):
+    def read(self) -> PlatformStats:
+        pass
+
+    def compute(self) -> PlatformStats:
+        pass
+
+    def rebuild(self) -> PlatformStats:
+        pass
+
+    def read_buckets(
+        self,
+        granularity: Granularity,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[StatsBucket]:
+        pass
+
+    def compute_buckets(self, granularity: Granularity) -> list[StatsBucket]:
+        pass
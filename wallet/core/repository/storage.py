@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from contextlib import AbstractContextManager
 from types import TracebackType
-from typing import Protocol
+from typing import Literal, Protocol
 
-from wallet.core.domain import Transaction, User, Wallet
-from wallet.core.repository.repository import Repository
+from wallet.core.repository.repository import (
+    StatisticsRepository,
+    TransactionRepository,
+    UserRepository,
+    WalletRepository,
+)
 
 
 class UnitOfWork(Protocol):
@@ -21,14 +26,30 @@ class UnitOfWork(Protocol):
 
 
 class Storage(Protocol):
-    def users(self) -> Repository[User]:
+    def users(self) -> UserRepository:
         pass
 
-    def wallets(self) -> Repository[Wallet]:
+    def wallets(self) -> WalletRepository:
         pass
 
-    def transactions(self) -> Repository[Transaction]:
+    def transactions(self) -> TransactionRepository:
+        pass
+
+    def statistics(self) -> StatisticsRepository:
         pass
 
     def uow(self) -> UnitOfWork:
         pass
+
+
+StorageIntent = Literal["read", "write"]
+
+
+class StorageFactory(Protocol):
+    def storage(
+        self, intent: StorageIntent = "write"
+    ) -> AbstractContextManager[Storage]:
+        pass
+
+    def close(self) -> None:
+        pass
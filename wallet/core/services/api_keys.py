@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from wallet.core.domain import User
+
+
+@dataclass(frozen=True)
+class ApiKeyEntry:
+    user: User | None
+    expires_at: float
+
+
+@dataclass
+class ApiKeyCache:
+    max_size: int = 10_000
+    ttl_seconds: float = 60.0
+    negative_ttl_seconds: float = 5.0
+    clock: Callable[[], float] = time.monotonic
+
+    _entries: OrderedDict[str, ApiKeyEntry] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _keys_by_user: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+    _invalidated_keys: OrderedDict[str, int] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _generation: int = field(default=0, init=False, repr=False)
+    _floor: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if self.ttl_seconds < 0 or self.negative_ttl_seconds < 0:
+            raise ValueError("Cache TTLs must be >= 0")
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, api_key: str) -> ApiKeyEntry | None:
+        with self._lock:
+            entry = self._entries.get(api_key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self.clock():
+                self._drop(api_key)
+                return None
+            self._entries.move_to_end(api_key)
+            return entry
+
+    def put(self, api_key: str, user: User | None, generation: int) -> None:
+        ttl = self.ttl_seconds if user is not None else self.negative_ttl_seconds
+        with self._lock:
+            if generation < self._floor:
+                return
+            if self._invalidated_keys.get(api_key, -1) > generation:
+                return
+            self._drop(api_key)
+            if user is not None:
+                stale_key = self._keys_by_user.get(user.id)
+                if stale_key is not None:
+                    self._drop(stale_key)
+                self._keys_by_user[user.id] = api_key
+            self._entries[api_key] = ApiKeyEntry(user, self.clock() + ttl)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_key(self, api_key: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._invalidated_keys[api_key] = self._generation
+            self._invalidated_keys.move_to_end(api_key)
+            while len(self._invalidated_keys) > self.max_size:
+                _, generation = self._invalidated_keys.popitem(last=False)
+                self._floor = max(self._floor, generation)
+            self._drop(api_key)
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._floor = self._generation
+            api_key = self._keys_by_user.get(user_id)
+            if api_key is not None:
+                self._drop(api_key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._floor = self._generation
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self._invalidated_keys.clear()
+
+    def _drop(self, api_key: str) -> None:
+        entry = self._entries.pop(api_key, None)
+        if entry is not None and entry.user is not None:
+            self._keys_by_user.pop(entry.user.id, None)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+
+from wallet.core.domain import SATOSHIS_PER_BTC
+
+BTC_DECIMALS = 8
+USD_DECIMALS = 2
+CENTS_PER_USD = 100
+RATE_SCALE = 10 ** (BTC_DECIMALS - USD_DECIMALS)
+
+
+@dataclass(frozen=True, slots=True)
+class UsdRate:
+    numerator: int
+    denominator: int
+    negative: bool
+
+    @classmethod
+    def from_decimal(cls, usd_per_btc: Decimal) -> UsdRate:
+        try:
+            numerator, denominator = usd_per_btc.as_integer_ratio()
+        except (ValueError, OverflowError) as e:
+            raise ValueError(f"Unsupported BTC/USD rate: {usd_per_btc}") from e
+        return cls(
+            numerator=abs(numerator),
+            denominator=denominator * RATE_SCALE,
+            negative=usd_per_btc.is_signed(),
+        )
+
+
+def format_btc(sat: int) -> str:
+    if sat < 0:
+        whole, frac = divmod(-sat, SATOSHIS_PER_BTC)
+        return f"-{whole}.{frac:08d}"
+    whole, frac = divmod(sat, SATOSHIS_PER_BTC)
+    return f"{whole}.{frac:08d}"
+
+
+def _cents(sat: int, rate: UsdRate) -> int:
+    twice = 2 * rate.denominator
+    return (2 * abs(sat) * rate.numerator + rate.denominator) // twice
+
+
+def usd_cents(sat: int, rate: UsdRate) -> int:
+    cents = _cents(sat, rate)
+    return -cents if (sat < 0) != rate.negative else cents
+
+
+def format_usd(sat: int, rate: UsdRate) -> str:
+    dollars, cents = divmod(_cents(sat, rate), CENTS_PER_USD)
+    sign = "-" if (sat < 0) != rate.negative else ""
+    return f"{sign}{dollars}.{cents:02d}"
+
+
+def format_btc_many(sats: Iterable[int]) -> list[str]:
+    return [format_btc(sat) for sat in sats]
+
+
+def format_usd_many(sats: Iterable[int], rate: UsdRate) -> list[str]:
+    numerator = 2 * rate.numerator
+    denominator = rate.denominator
+    twice = 2 * denominator
+    out: list[str] = []
+    for sat in sats:
+        if sat < 0:
+            dollars, cents = divmod(
+                (-sat * numerator + denominator) // twice, CENTS_PER_USD
+            )
+            sign = "" if rate.negative else "-"
+        else:
+            dollars, cents = divmod(
+                (sat * numerator + denominator) // twice, CENTS_PER_USD
+            )
+            sign = "-" if rate.negative else ""
+        out.append(f"{sign}{dollars}.{cents:02d}")
+    return out
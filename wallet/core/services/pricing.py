@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import ROUND_HALF_UP, Decimal
+from functools import cached_property
 from typing import Protocol
 
+from wallet.core.services.formatting import UsdRate
+
 USD_QUANT = Decimal("0.01")
 
 
@@ -15,6 +18,24 @@ def quantize_usd(x: Decimal) -> Decimal:
 class BtcUsdQuote:
     usd_per_btc: Decimal
 
+    @cached_property
+    def usd_rate(self) -> UsdRate:
+        return UsdRate.from_decimal(self.usd_per_btc)
+
 
 class PriceProvider(Protocol):
     def btc_usd(self) -> BtcUsdQuote: ...
+
+
+class AsyncPriceProvider(Protocol):
+    async def btc_usd(self) -> BtcUsdQuote: ...
+
+
+def resolve_quote(
+    price_provider: PriceProvider | None, quote: BtcUsdQuote | None
+) -> BtcUsdQuote:
+    if quote is not None:
+        return quote
+    if price_provider is None:
+        raise RuntimeError("A quote or a price provider is required")
+    return price_provider.btc_usd()
@@ -1,16 +1,41 @@
 from __future__ import annotations
 
+import base64
+import binascii
 import uuid
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass
+from datetime import UTC, datetime
 
-from wallet.core.domain import Transaction, Wallet, utcnow
-from wallet.core.errors import InsufficientFundsError, NotFoundError, ValidationError
+from wallet.core.domain import (
+    Granularity,
+    PlatformStats,
+    StatsBucket,
+    Transaction,
+    Wallet,
+    utcnow,
+)
+from wallet.core.errors import (
+    DomainError,
+    InsufficientFundsError,
+    NotFoundError,
+    ValidationError,
+)
+from wallet.core.repository.repository import TransactionCursor
 from wallet.core.repository.storage import Storage
-from wallet.core.services.pricing import PriceProvider, quantize_usd
-from wallet.core.services.wallets import sat_to_btc
+from wallet.core.services.formatting import UsdRate, format_btc, format_usd
+from wallet.core.services.pricing import (
+    BtcUsdQuote,
+    PriceProvider,
+    resolve_quote,
+)
 
 EXTERNAL_FEE_NUM = 15
 EXTERNAL_FEE_DEN = 1000
+MAX_PAGE_SIZE = 500
+MAX_BATCH_TRANSFERS = 10_000
+
+Transfer = Callable[[str, str, str, int], Transaction]
 
 
 def ceil_div(a: int, b: int) -> int:
@@ -21,101 +46,280 @@ def external_fee_sat(amount_sat: int) -> int:
     return ceil_div(amount_sat * EXTERNAL_FEE_NUM, EXTERNAL_FEE_DEN)
 
 
+def encode_cursor(tx: Transaction) -> str:
+    raw = f"{tx.created_at.isoformat()}|{tx.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> TransactionCursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, tx_id = raw.split("|", 1)
+        return TransactionCursor(
+            created_at=datetime.fromisoformat(created_at), id=tx_id
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValidationError("Invalid cursor") from e
+
+
+def _as_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC)
+
+
+def validate_transfer(from_address: str, to_address: str, amount_sat: int) -> None:
+    if from_address == to_address:
+        raise ValidationError("from_address and to_address must be different")
+    if amount_sat <= 0:
+        raise ValidationError("amount_sat must be > 0")
+
+
+def record_transfer(
+    storage: Storage,
+    tx_id: str,
+    user_id: str,
+    from_address: str,
+    to_address: str,
+    amount_sat: int,
+) -> Transaction:
+    fee = storage.wallets().move_balance(
+        user_id=user_id,
+        from_address=from_address,
+        to_address=to_address,
+        amount_sat=amount_sat,
+        external_fee_sat=external_fee_sat(amount_sat),
+    )
+    tx = Transaction(
+        id=tx_id,
+        from_address=from_address,
+        to_address=to_address,
+        amount_sat=amount_sat,
+        fee_sat=fee,
+        created_at=utcnow(),
+    )
+    storage.transactions().create(tx)
+    return tx
+
+
+@dataclass(frozen=True)
+class TransferRequest:
+    from_address: str
+    to_address: str
+    amount_sat: int
+
+
+@dataclass(frozen=True)
+class TransferResult:
+    transaction: Transaction | None = None
+    error: DomainError | None = None
+
+
+def _apply_transfer(
+    user_id: str,
+    request: TransferRequest,
+    wallets: dict[str, Wallet],
+    balances: dict[str, int],
+) -> Transaction:
+    validate_transfer(request.from_address, request.to_address, request.amount_sat)
+
+    from_wallet = wallets.get(request.from_address)
+    if from_wallet is None:
+        raise NotFoundError("Wallet not found")
+    if from_wallet.user_id != user_id:
+        raise NotFoundError("Source wallet not found")
+
+    to_wallet = wallets.get(request.to_address)
+    if to_wallet is None:
+        raise NotFoundError("Wallet not found")
+
+    amount_sat = request.amount_sat
+    fee = 0 if to_wallet.user_id == user_id else external_fee_sat(amount_sat)
+    if balances[from_wallet.address] < amount_sat:
+        raise InsufficientFundsError("Insufficient funds")
+
+    balances[from_wallet.address] -= amount_sat
+    balances[to_wallet.address] += amount_sat - fee
+    return Transaction(
+        id=str(uuid.uuid4()),
+        from_address=request.from_address,
+        to_address=request.to_address,
+        amount_sat=amount_sat,
+        fee_sat=fee,
+        created_at=utcnow(),
+    )
+
+
+@dataclass(frozen=True)
+class TransactionPage:
+    items: list[Transaction]
+    next_cursor: str | None
+    version: int | None = None
+
+
 @dataclass
 class TransactionService:
     storage: Storage
-    price_provider: PriceProvider
+    price_provider: PriceProvider | None = None
 
     def transfer(
         self, user_id: str, from_address: str, to_address: str, amount_sat: int
     ) -> Transaction:
-        if from_address == to_address:
-            raise ValidationError("from_address and to_address must be different")
-        if amount_sat <= 0:
-            raise ValidationError("amount_sat must be > 0")
+        validate_transfer(from_address, to_address, amount_sat)
 
+        tx_id = str(uuid.uuid4())
         with self.storage.uow():
-            from_wallet = self.storage.wallets().read(from_address)
-            if from_wallet.user_id != user_id:
-                raise NotFoundError("Source wallet not found")
-
-            to_wallet = self.storage.wallets().read(to_address)
-
-            fee = 0 if to_wallet.user_id == user_id else external_fee_sat(amount_sat)
-            total_transaction = amount_sat - fee
-            if from_wallet.balance_sat < amount_sat:
-                raise InsufficientFundsError("Insufficient funds")
-
-            self.storage.wallets().update(
-                Wallet(
-                    address=from_wallet.address,
-                    user_id=from_wallet.user_id,
-                    balance_sat=from_wallet.balance_sat - amount_sat,
-                )
-            )
-            self.storage.wallets().update(
-                Wallet(
-                    address=to_wallet.address,
-                    user_id=to_wallet.user_id,
-                    balance_sat=to_wallet.balance_sat + total_transaction,
-                )
+            return record_transfer(
+                self.storage, tx_id, user_id, from_address, to_address, amount_sat
             )
 
-            tx = Transaction(
-                id=str(uuid.uuid4()),
-                from_address=from_address,
-                to_address=to_address,
-                amount_sat=amount_sat,
-                fee_sat=fee,
-                created_at=utcnow(),
+    def transfer_many(
+        self, user_id: str, transfers: Sequence[TransferRequest], atomic: bool = True
+    ) -> list[TransferResult]:
+        if len(transfers) > MAX_BATCH_TRANSFERS:
+            raise ValidationError(
+                f"At most {MAX_BATCH_TRANSFERS} transfers are allowed per batch"
             )
-            self.storage.transactions().create(tx)
-            return tx
+
+        results: list[TransferResult] = []
+        with self.storage.uow():
+            addresses = {a for t in transfers for a in (t.from_address, t.to_address)}
+            wallets = {
+                w.address: w for w in self.storage.wallets().read_many(addresses)
+            }
+            balances = {address: w.balance_sat for address, w in wallets.items()}
+
+            txs: list[Transaction] = []
+            for index, request in enumerate(transfers):
+                try:
+                    tx = _apply_transfer(user_id, request, wallets, balances)
+                except DomainError as e:
+                    if atomic:
+                        raise type(e)(f"transfers[{index}]: {e}") from e
+                    results.append(TransferResult(error=e))
+                    continue
+                txs.append(tx)
+                results.append(TransferResult(transaction=tx))
+
+            changed = {a for tx in txs for a in (tx.from_address, tx.to_address)}
+            self.storage.wallets().update_balances((a, balances[a]) for a in changed)
+            self.storage.transactions().create_many(txs)
+        return results
 
     def list_user_transactions(self, user_id: str) -> list[Transaction]:
-        owned = {
-            w.address for w in self.storage.wallets().read_all() if w.user_id == user_id
-        }
-        txs = [
-            t
-            for t in self.storage.transactions().read_all()
-            if t.from_address in owned or t.to_address in owned
-        ]
-        return sorted(txs, key=lambda t: t.created_at)
+        owned = [w.address for w in self.storage.wallets().read_by_owner(user_id)]
+        return list(self.storage.transactions().read_by_addresses(owned))
 
     def list_wallet_transactions(self, user_id: str, address: str) -> list[Transaction]:
         wallet = self.storage.wallets().read(address)
         if wallet.user_id != user_id:
             raise NotFoundError("Wallet not found")
 
-        txs = [
-            t
-            for t in self.storage.transactions().read_all()
-            if t.from_address == address or t.to_address == address
-        ]
-        return sorted(txs, key=lambda t: t.created_at)
+        return list(self.storage.transactions().read_by_addresses([address]))
+
+    def export_user_transactions(self, user_id: str) -> Iterator[Transaction]:
+        owned = [w.address for w in self.storage.wallets().read_by_owner(user_id)]
+        return self.storage.transactions().iter_by_addresses(owned)
 
-    def tx_view(self, tx: Transaction) -> dict[str, str | int]:
-        quote = self.price_provider.btc_usd()
-        amount_btc = sat_to_btc(tx.amount_sat)
-        fee_btc = sat_to_btc(tx.fee_sat)
+    def export_wallet_transactions(
+        self, user_id: str, address: str
+    ) -> Iterator[Transaction]:
+        wallet = self.storage.wallets().read(address)
+        if wallet.user_id != user_id:
+            raise NotFoundError("Wallet not found")
 
-        amount_usd = quantize_usd(amount_btc * quote.usd_per_btc)
+        return self.storage.transactions().iter_by_addresses([address])
 
-        fee_usd = quantize_usd(fee_btc * quote.usd_per_btc)
+    def page_user_transactions(
+        self, user_id: str, limit: int, cursor: str | None = None
+    ) -> TransactionPage:
+        owned = [w.address for w in self.storage.wallets().read_by_owner(user_id)]
+        return self._page(owned, limit, cursor)
 
+    def page_wallet_transactions(
+        self, user_id: str, address: str, limit: int, cursor: str | None = None
+    ) -> TransactionPage:
+        wallet = self.storage.wallets().read(address)
+        if wallet.user_id != user_id:
+            raise NotFoundError("Wallet not found")
+
+        return self._page([address], limit, cursor, wallet.version)
+
+    def _page(
+        self,
+        addresses: list[str],
+        limit: int,
+        cursor: str | None,
+        version: int | None = None,
+    ) -> TransactionPage:
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValidationError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        after = None if cursor is None else decode_cursor(cursor)
+        txs = self.storage.transactions().read_page_by_addresses(
+            addresses, limit + 1, after
+        )
+        if len(txs) <= limit:
+            return TransactionPage(items=txs, next_cursor=None, version=version)
+
+        items = txs[:limit]
+        return TransactionPage(
+            items=items, next_cursor=encode_cursor(items[-1]), version=version
+        )
+
+    def tx_view(
+        self, tx: Transaction, quote: BtcUsdQuote | None = None
+    ) -> dict[str, str | int]:
+        quote = resolve_quote(self.price_provider, quote)
+        return self._tx_view(tx, quote.usd_rate)
+
+    def tx_views(
+        self, txs: Iterable[Transaction], quote: BtcUsdQuote | None = None
+    ) -> list[dict[str, str | int]]:
+        quote = resolve_quote(self.price_provider, quote)
+        rate = quote.usd_rate
+        return [self._tx_view(tx, rate) for tx in txs]
+
+    def iter_tx_views(
+        self, txs: Iterable[Transaction], quote: BtcUsdQuote
+    ) -> Iterator[dict[str, str | int]]:
+        rate = quote.usd_rate
+        for tx in txs:
+            yield self._tx_view(tx, rate)
+
+    @staticmethod
+    def transaction_view(tx: Transaction, quote: BtcUsdQuote) -> dict[str, str | int]:
+        return TransactionService._tx_view(tx, quote.usd_rate)
+
+    @staticmethod
+    def _tx_view(tx: Transaction, rate: UsdRate) -> dict[str, str | int]:
         return {
             "id": tx.id,
             "from_address": tx.from_address,
             "to_address": tx.to_address,
             "amount_sat": tx.amount_sat,
-            "amount_btc": format(amount_btc, "f"),
-            "amount_usd": format(amount_usd, "f"),
+            "amount_btc": format_btc(tx.amount_sat),
+            "amount_usd": format_usd(tx.amount_sat, rate),
             "fee_sat": tx.fee_sat,
-            "fee_btc": format(fee_btc, "f"),
-            "fee_usd": format(fee_usd, "f"),
+            "fee_btc": format_btc(tx.fee_sat),
+            "fee_usd": format_usd(tx.fee_sat, rate),
             "created_at": tx.created_at.isoformat(),
         }
 
+    def platform_stats(self) -> PlatformStats:
+        return self.storage.statistics().read()
+
+    def platform_buckets(
+        self,
+        granularity: Granularity,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[StatsBucket]:
+        start = None if start is None else _as_utc(start)
+        end = None if end is None else _as_utc(end)
+        if start is not None and end is not None and start >= end:
+            raise ValidationError("from must be before to")
+        return self.storage.statistics().read_buckets(granularity, start, end)
+
     def platform_profit_sat(self) -> int:
-        return sum(t.fee_sat for t in self.storage.transactions().read_all())
+        return self.platform_stats().total_fee_sat
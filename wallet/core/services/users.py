@@ -5,21 +5,36 @@ import uuid
 from dataclasses import dataclass
 
 from wallet.core.domain import User
-from wallet.core.errors import ConflictError
+from wallet.core.errors import ConflictError, ValidationError
 from wallet.core.repository.storage import Storage
 
+MAX_BATCH_USERS = 10_000
+
 
 @dataclass
 class UserService:
     storage: Storage
 
     def register(self) -> User:
-        api_key = secrets.token_urlsafe(32)
-        user = User(id=str(uuid.uuid4()), api_key=api_key)
+        user = self._new_user()
+        try:
+            with self.storage.uow():
+                self.storage.users().create(user)
+        except ConflictError as e:
+            raise ConflictError("API key collision; retry") from e
+        return user
 
-        if any(u.api_key == api_key for u in self.storage.users().read_all()):
-            raise ConflictError("API key collision; retry")
+    def register_many(self, count: int) -> list[User]:
+        if not 1 <= count <= MAX_BATCH_USERS:
+            raise ValidationError(f"count must be between 1 and {MAX_BATCH_USERS}")
 
-        with self.storage.uow():
-            self.storage.users().create(user)
-        return user
+        users = [self._new_user() for _ in range(count)]
+        try:
+            with self.storage.uow():
+                self.storage.users().create_many(users)
+        except ConflictError as e:
+            raise ConflictError("API key collision; retry") from e
+        return users
+
+    def _new_user(self) -> User:
+        return User(id=str(uuid.uuid4()), api_key=secrets.token_urlsafe(32))
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class WalletVersionEntry:
+    user_id: str
+    version: int
+    expires_at: float
+
+
+@dataclass
+class WalletVersionCache:
+    max_size: int = 10_000
+    ttl_seconds: float = 5.0
+    clock: Callable[[], float] = time.monotonic
+
+    _entries: OrderedDict[str, WalletVersionEntry] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _generation: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if self.ttl_seconds < 0:
+            raise ValueError("Cache TTL must be >= 0")
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, address: str) -> WalletVersionEntry | None:
+        with self._lock:
+            entry = self._entries.get(address)
+            if entry is None:
+                return None
+            if entry.expires_at <= self.clock():
+                del self._entries[address]
+                return None
+            self._entries.move_to_end(address)
+            return entry
+
+    def put(self, address: str, user_id: str, version: int, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries.pop(address, None)
+            self._entries[address] = WalletVersionEntry(
+                user_id, version, self.clock() + self.ttl_seconds
+            )
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, addresses: Iterable[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            for address in addresses:
+                self._entries.pop(address, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
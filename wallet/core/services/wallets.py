@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import uuid
+from collections import Counter
+from collections.abc import Sequence
 from dataclasses import dataclass
 from decimal import Decimal
 
 from wallet.core.domain import SATOSHIS_PER_BTC, Wallet
-from wallet.core.errors import ConflictError, NotFoundError
+from wallet.core.errors import ConflictError, NotFoundError, ValidationError
 from wallet.core.repository.storage import Storage
-from wallet.core.services.pricing import PriceProvider, quantize_usd
+from wallet.core.services.formatting import format_btc, format_usd
+from wallet.core.services.pricing import (
+    BtcUsdQuote,
+    PriceProvider,
+    resolve_quote,
+)
 
 MAX_WALLETS_PER_USER = 3
+MAX_BATCH_WALLETS = 10_000
 INITIAL_WALLET_BALANCE_SAT = SATOSHIS_PER_BTC
 
 
@@ -20,13 +28,12 @@ def sat_to_btc(sat: int) -> Decimal:
 @dataclass
 class WalletService:
     storage: Storage
-    price_provider: PriceProvider
+    price_provider: PriceProvider | None = None
 
     def create_wallet(self, user_id: str) -> Wallet:
         with self.storage.uow():
             wallets_repo = self.storage.wallets()
-            user_wallets = [w for w in wallets_repo.read_all() if w.user_id == user_id]
-            if len(user_wallets) >= MAX_WALLETS_PER_USER:
+            if wallets_repo.count_by_owner(user_id) >= MAX_WALLETS_PER_USER:
                 raise ConflictError(f"User already has {MAX_WALLETS_PER_USER} wallets")
 
             wallet = Wallet(
@@ -37,21 +44,49 @@ class WalletService:
             wallets_repo.create(wallet)
             return wallet
 
+    def create_wallets(self, user_ids: Sequence[str]) -> list[Wallet]:
+        if not 1 <= len(user_ids) <= MAX_BATCH_WALLETS:
+            raise ValidationError(
+                f"Between 1 and {MAX_BATCH_WALLETS} wallets are allowed per batch"
+            )
+
+        requested = Counter(user_ids)
+        with self.storage.uow():
+            wallets_repo = self.storage.wallets()
+            existing = wallets_repo.count_by_owners(requested.keys())
+            for user_id, count in requested.items():
+                if existing.get(user_id, 0) + count > MAX_WALLETS_PER_USER:
+                    raise ConflictError(
+                        f"User {user_id} would exceed {MAX_WALLETS_PER_USER} wallets"
+                    )
+
+            wallets = [
+                Wallet(
+                    address=self._new_address(),
+                    user_id=user_id,
+                    balance_sat=INITIAL_WALLET_BALANCE_SAT,
+                )
+                for user_id in user_ids
+            ]
+            wallets_repo.create_many(wallets)
+            return wallets
+
     def get_wallet_owned(self, user_id: str, address: str) -> Wallet:
         wallet = self.storage.wallets().read(address)
         if wallet.user_id != user_id:
             raise NotFoundError("Wallet not found")
         return wallet
 
-    def wallet_view(self, wallet: Wallet) -> dict[str, str | int]:
-        quote = self.price_provider.btc_usd()
-        btc = sat_to_btc(wallet.balance_sat)
-        usd = quantize_usd(btc * quote.usd_per_btc)
+    def wallet_view(
+        self, wallet: Wallet, quote: BtcUsdQuote | None = None
+    ) -> dict[str, str | int]:
+        quote = resolve_quote(self.price_provider, quote)
+        rate = quote.usd_rate
         return {
             "address": wallet.address,
             "balance_sat": wallet.balance_sat,
-            "balance_btc": format(btc, "f"),
-            "balance_usd": format(usd, "f"),
+            "balance_btc": format_btc(wallet.balance_sat),
+            "balance_usd": format_usd(wallet.balance_sat, rate),
         }
 
     def _new_address(self) -> str:
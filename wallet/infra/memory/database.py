@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from wallet.core.domain import (
+    BUCKET_FORMATS,
+    Granularity,
+    PlatformStats,
+    Transaction,
+    User,
+    Wallet,
+)
+from wallet.telemetry import waiting_for_lock
+
+EMPTY_STATS = PlatformStats(total_transactions=0, total_fee_sat=0, total_volume_sat=0)
+
+
+def as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def transaction_key(tx: Transaction) -> tuple[datetime, str]:
+    return as_utc(tx.created_at), tx.id
+
+
+def bucket_key(granularity: Granularity, created_at: datetime) -> str:
+    return as_utc(created_at).strftime(BUCKET_FORMATS[granularity])
+
+
+def add_stats(stats: PlatformStats, tx: Transaction, sign: int) -> PlatformStats:
+    return PlatformStats(
+        total_transactions=stats.total_transactions + sign,
+        total_fee_sat=stats.total_fee_sat + sign * tx.fee_sat,
+        total_volume_sat=stats.total_volume_sat + sign * tx.amount_sat,
+    )
+
+
+def aggregate(
+    txs: Iterable[Transaction],
+) -> tuple[PlatformStats, dict[tuple[Granularity, str], PlatformStats]]:
+    stats = EMPTY_STATS
+    rollups: dict[tuple[Granularity, str], PlatformStats] = {}
+    for tx in txs:
+        stats = add_stats(stats, tx, 1)
+        for granularity in BUCKET_FORMATS:
+            key = (granularity, bucket_key(granularity, tx.created_at))
+            rollups[key] = add_stats(rollups.get(key, EMPTY_STATS), tx, 1)
+    return stats, rollups
+
+
+@dataclass
+class MemoryDatabase:
+    users: dict[str, User] = field(default_factory=dict)
+    user_ids_by_api_key: dict[str, str] = field(default_factory=dict)
+    wallets: dict[str, Wallet] = field(default_factory=dict)
+    addresses_by_owner: dict[str, dict[str, None]] = field(default_factory=dict)
+    transactions: dict[str, Transaction] = field(default_factory=dict)
+    transactions_by_address: dict[str, list[Transaction]] = field(default_factory=dict)
+    stats: PlatformStats = EMPTY_STATS
+    rollups: dict[tuple[Granularity, str], PlatformStats] = field(default_factory=dict)
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    _undo: list[Callable[[], object]] | None = field(
+        default=None, init=False, repr=False
+    )
+    _after_transaction: list[Callable[[], None]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    def begin(self) -> None:
+        with waiting_for_lock():
+            self.lock.acquire()
+        if self._undo is not None:
+            self.lock.release()
+            raise RuntimeError("A transaction is already active")
+        self._undo = []
+
+    def commit(self) -> None:
+        self._undo = None
+        self._end_transaction()
+
+    def rollback(self) -> None:
+        undo, self._undo = self._undo or [], None
+        try:
+            for step in reversed(undo):
+                step()
+        finally:
+            self._end_transaction()
+
+    def after_transaction(self, callback: Callable[[], None]) -> None:
+        with self.lock:
+            if self._undo is not None:
+                self._after_transaction.append(callback)
+                return
+        callback()
+
+    def _end_transaction(self) -> None:
+        callbacks, self._after_transaction = self._after_transaction, []
+        self.lock.release()
+        for callback in callbacks:
+            callback()
+
+    def write_user(self, user_id: str, user: User | None) -> None:
+        with self.lock:
+            previous = self._replace_user(user_id, user)
+            self._log(lambda: self._replace_user(user_id, previous))
+
+    def write_wallet(self, address: str, wallet: Wallet | None) -> None:
+        with self.lock:
+            previous = self._replace_wallet(address, wallet)
+            self._log(lambda: self._replace_wallet(address, previous))
+
+    def write_transaction(self, tx_id: str, tx: Transaction | None) -> None:
+        with self.lock:
+            previous = self._replace_transaction(tx_id, tx)
+            self._log(lambda: self._replace_transaction(tx_id, previous))
+
+    def rebuild_statistics(self) -> PlatformStats:
+        with self.lock:
+            previous = self._replace_statistics(*aggregate(self.transactions.values()))
+            self._log(lambda: self._replace_statistics(*previous))
+            return self.stats
+
+    def _log(self, step: Callable[[], object]) -> None:
+        if self._undo is not None:
+            self._undo.append(step)
+
+    def _replace_user(self, user_id: str, user: User | None) -> User | None:
+        previous = self.users.get(user_id)
+        if previous is not None:
+            del self.user_ids_by_api_key[previous.api_key]
+        if user is None:
+            self.users.pop(user_id, None)
+        else:
+            self.users[user_id] = user
+            self.user_ids_by_api_key[user.api_key] = user_id
+        return previous
+
+    def _replace_wallet(self, address: str, wallet: Wallet | None) -> Wallet | None:
+        previous = self.wallets.get(address)
+        if previous is not None:
+            owned = self.addresses_by_owner[previous.user_id]
+            del owned[address]
+            if not owned:
+                del self.addresses_by_owner[previous.user_id]
+        if wallet is None:
+            self.wallets.pop(address, None)
+        else:
+            self.wallets[address] = wallet
+            self.addresses_by_owner.setdefault(wallet.user_id, {})[address] = None
+        return previous
+
+    def _replace_transaction(
+        self, tx_id: str, tx: Transaction | None
+    ) -> Transaction | None:
+        previous = self.transactions.get(tx_id)
+        if previous is not None:
+            for address in {previous.from_address, previous.to_address}:
+                txs = self.transactions_by_address[address]
+                del txs[
+                    bisect_left(txs, transaction_key(previous), key=transaction_key)
+                ]
+                if not txs:
+                    del self.transactions_by_address[address]
+            self._account(previous, -1)
+        if tx is None:
+            self.transactions.pop(tx_id, None)
+        else:
+            self.transactions[tx_id] = tx
+            for address in {tx.from_address, tx.to_address}:
+                txs = self.transactions_by_address.setdefault(address, [])
+                insort(txs, tx, key=transaction_key)
+            self._account(tx, 1)
+        return previous
+
+    def _replace_statistics(
+        self,
+        stats: PlatformStats,
+        rollups: dict[tuple[Granularity, str], PlatformStats],
+    ) -> tuple[PlatformStats, dict[tuple[Granularity, str], PlatformStats]]:
+        previous = self.stats, self.rollups
+        self.stats, self.rollups = stats, rollups
+        return previous
+
+    def _account(self, tx: Transaction, sign: int) -> None:
+        self.stats = add_stats(self.stats, tx, sign)
+        for granularity in BUCKET_FORMATS:
+            key = (granularity, bucket_key(granularity, tx.created_at))
+            self.rollups[key] = add_stats(self.rollups.get(key, EMPTY_STATS), tx, sign)
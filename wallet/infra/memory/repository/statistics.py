@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from wallet.core.domain import (
+    BUCKET_BOUND_FORMAT,
+    BUCKET_FORMATS,
+    Granularity,
+    PlatformStats,
+    StatsBucket,
+)
+from wallet.core.repository.repository import StatisticsRepository
+from wallet.infra.memory.database import MemoryDatabase, aggregate
+
+
+@dataclass
+class MemoryStatisticsRepository(StatisticsRepository):
+    db: MemoryDatabase
+
+    def read(self) -> PlatformStats:
+        with self.db.lock:
+            return self.db.stats
+
+    def compute(self) -> PlatformStats:
+        with self.db.lock:
+            stats, _ = aggregate(self.db.transactions.values())
+            return stats
+
+    def rebuild(self) -> PlatformStats:
+        return self.db.rebuild_statistics()
+
+    def read_buckets(
+        self,
+        granularity: Granularity,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[StatsBucket]:
+        low = (
+            None
+            if start is None
+            else start.astimezone(UTC).strftime(BUCKET_FORMATS[granularity])
+        )
+        high = (
+            None if end is None else end.astimezone(UTC).strftime(BUCKET_BOUND_FORMAT)
+        )
+        with self.db.lock:
+            rollups = [
+                (bucket, stats)
+                for (g, bucket), stats in self.db.rollups.items()
+                if g == granularity
+                and stats.total_transactions > 0
+                and (low is None or bucket >= low)
+                and (high is None or bucket < high)
+            ]
+        return [
+            _bucket(bucket, stats)
+            for bucket, stats in sorted(rollups, key=lambda r: r[0])
+        ]
+
+    def compute_buckets(self, granularity: Granularity) -> list[StatsBucket]:
+        with self.db.lock:
+            _, rollups = aggregate(self.db.transactions.values())
+        return sorted(
+            (
+                _bucket(bucket, stats)
+                for (g, bucket), stats in rollups.items()
+                if g == granularity
+            ),
+            key=lambda b: b.bucket_start,
+        )
+
+
+def _bucket(bucket_start: str, stats: PlatformStats) -> StatsBucket:
+    return StatsBucket(
+        bucket_start=datetime.strptime(bucket_start, BUCKET_BOUND_FORMAT).replace(
+            tzinfo=UTC
+        ),
+        total_transactions=stats.total_transactions,
+        total_fee_sat=stats.total_fee_sat,
+        total_volume_sat=stats.total_volume_sat,
+    )
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_right
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import dataclass
+
+from wallet.core.domain import Transaction
+from wallet.core.errors import ConflictError, NotFoundError
+from wallet.core.repository.repository import (
+    TransactionCursor,
+    TransactionRepository,
+)
+from wallet.infra.memory.database import MemoryDatabase, as_utc, transaction_key
+
+
+@dataclass
+class MemoryTransactionRepository(TransactionRepository):
+    db: MemoryDatabase
+
+    def create(self, item: Transaction) -> None:
+        self.create_many([item])
+
+    def create_many(self, items: Iterable[Transaction]) -> None:
+        with self.db.lock:
+            batch = list(items)
+            ids = {item.id for item in batch}
+            if len(ids) != len(batch) or any(
+                tx_id in self.db.transactions for tx_id in ids
+            ):
+                raise ConflictError("Transaction conflict")
+            for item in batch:
+                self._check_wallets(item)
+            for item in batch:
+                self.db.write_transaction(item.id, item)
+
+    def read(self, item_id: str) -> Transaction:
+        with self.db.lock:
+            tx = self.db.transactions.get(item_id)
+        if tx is None:
+            raise NotFoundError("Transaction not found")
+        return tx
+
+    def update(self, item: Transaction) -> None:
+        with self.db.lock:
+            if item.id not in self.db.transactions:
+                raise NotFoundError("Transaction not found")
+            self._check_wallets(item)
+            self.db.write_transaction(item.id, item)
+
+    def delete(self, item_id: str) -> None:
+        with self.db.lock:
+            if item_id not in self.db.transactions:
+                raise NotFoundError("Transaction not found")
+            self.db.write_transaction(item_id, None)
+
+    def read_all(self) -> Iterable[Transaction]:
+        with self.db.lock:
+            return list(self.db.transactions.values())
+
+    def read_by_addresses(self, addresses: Collection[str]) -> Iterable[Transaction]:
+        return list(self.iter_by_addresses(addresses))
+
+    def iter_by_addresses(
+        self,
+        addresses: Collection[str],
+        batch_size: int = 500,  # noqa: ARG002
+    ) -> Iterator[Transaction]:
+        with self.db.lock:
+            lists = [
+                list(self.db.transactions_by_address.get(address, ()))
+                for address in set(addresses)
+            ]
+        yield from _merge(lists)
+
+    def read_page_by_addresses(
+        self,
+        addresses: Collection[str],
+        limit: int,
+        after: TransactionCursor | None = None,
+    ) -> list[Transaction]:
+        if limit <= 0:
+            return []
+
+        with self.db.lock:
+            lists: list[list[Transaction]] = []
+            for address in set(addresses):
+                txs = self.db.transactions_by_address.get(address, [])
+                start = 0
+                if after is not None:
+                    start = bisect_right(
+                        txs, (as_utc(after.created_at), after.id), key=transaction_key
+                    )
+                lists.append(txs[start : start + limit])
+
+        page: list[Transaction] = []
+        for tx in _merge(lists):
+            page.append(tx)
+            if len(page) == limit:
+                break
+        return page
+
+    def count(self) -> int:
+        with self.db.lock:
+            return len(self.db.transactions)
+
+    def _check_wallets(self, item: Transaction) -> None:
+        if (
+            item.from_address not in self.db.wallets
+            or item.to_address not in self.db.wallets
+        ):
+            raise ConflictError("Transaction conflict")
+
+
+def _merge(lists: list[list[Transaction]]) -> Iterator[Transaction]:
+    last_id: str | None = None
+    for tx in heapq.merge(*lists, key=transaction_key):
+        if tx.id != last_id:
+            yield tx
+        last_id = tx.id
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from wallet.core.domain import User
+from wallet.core.errors import ConflictError, NotFoundError
+from wallet.core.repository.repository import UserRepository
+from wallet.core.services.api_keys import ApiKeyCache
+from wallet.infra.memory.database import MemoryDatabase
+
+
+@dataclass
+class MemoryUserRepository(UserRepository):
+    db: MemoryDatabase
+    api_keys: ApiKeyCache | None = None
+
+    def create(self, item: User) -> None:
+        with self.db.lock:
+            if item.id in self.db.users or item.api_key in self.db.user_ids_by_api_key:
+                raise ConflictError("User Conflict")
+            self.db.write_user(item.id, item)
+        self._invalidate(api_keys=[item.api_key])
+
+    def create_many(self, items: Iterable[User]) -> None:
+        users = list(items)
+        ids = {u.id for u in users}
+        api_keys = {u.api_key for u in users}
+        with self.db.lock:
+            if (
+                len(ids) != len(users)
+                or len(api_keys) != len(users)
+                or any(u.id in self.db.users for u in users)
+                or any(k in self.db.user_ids_by_api_key for k in api_keys)
+            ):
+                raise ConflictError("User Conflict")
+            for user in users:
+                self.db.write_user(user.id, user)
+        self._invalidate(api_keys=api_keys)
+
+    def read(self, item_id: str) -> User:
+        with self.db.lock:
+            user = self.db.users.get(item_id)
+        if user is None:
+            raise NotFoundError("User not found")
+        return user
+
+    def read_by_api_key(self, api_key: str) -> User:
+        with self.db.lock:
+            user_id = self.db.user_ids_by_api_key.get(api_key)
+            if user_id is None:
+                raise NotFoundError("User not found")
+            return self.db.users[user_id]
+
+    def update(self, item: User) -> None:
+        with self.db.lock:
+            if item.id not in self.db.users:
+                raise NotFoundError("User not found")
+            owner = self.db.user_ids_by_api_key.get(item.api_key, item.id)
+            if owner != item.id:
+                raise ConflictError("User Conflict")
+            self.db.write_user(item.id, item)
+        self._invalidate(user_ids=[item.id], api_keys=[item.api_key])
+
+    def delete(self, item_id: str) -> None:
+        with self.db.lock:
+            if item_id not in self.db.users:
+                raise NotFoundError("User not found")
+            addresses = list(self.db.addresses_by_owner.get(item_id, ()))
+            if any(a in self.db.transactions_by_address for a in addresses):
+                raise ConflictError("User Conflict")
+            for address in addresses:
+                self.db.write_wallet(address, None)
+            self.db.write_user(item_id, None)
+        self._invalidate(user_ids=[item_id])
+
+    def read_all(self) -> Iterable[User]:
+        with self.db.lock:
+            return list(self.db.users.values())
+
+    def count(self) -> int:
+        with self.db.lock:
+            return len(self.db.users)
+
+    def _invalidate(
+        self, user_ids: Iterable[str] = (), api_keys: Iterable[str] = ()
+    ) -> None:
+        cache = self.api_keys
+        if cache is None:
+            return
+        stale_users, stale_keys = tuple(user_ids), tuple(api_keys)
+
+        def invalidate() -> None:
+            for user_id in stale_users:
+                cache.invalidate_user(user_id)
+            for api_key in stale_keys:
+                cache.invalidate_key(api_key)
+
+        self.db.after_transaction(invalidate)
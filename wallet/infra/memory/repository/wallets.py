@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass, replace
+
+from wallet.core.domain import Wallet
+from wallet.core.errors import ConflictError, InsufficientFundsError, NotFoundError
+from wallet.core.repository.repository import WalletRepository
+from wallet.core.services.wallet_versions import WalletVersionCache
+from wallet.infra.memory.database import MemoryDatabase
+
+
+@dataclass
+class MemoryWalletRepository(WalletRepository):
+    db: MemoryDatabase
+    versions: WalletVersionCache | None = None
+
+    def create(self, item: Wallet) -> None:
+        with self.db.lock:
+            if item.address in self.db.wallets or item.user_id not in self.db.users:
+                raise ConflictError("Wallet conflict")
+            self.db.write_wallet(item.address, item)
+        self._invalidate(item.address)
+
+    def create_many(self, items: Iterable[Wallet]) -> None:
+        wallets = list(items)
+        with self.db.lock:
+            if len({w.address for w in wallets}) != len(wallets) or any(
+                w.address in self.db.wallets or w.user_id not in self.db.users
+                for w in wallets
+            ):
+                raise ConflictError("Wallet conflict")
+            for wallet in wallets:
+                self.db.write_wallet(wallet.address, wallet)
+        self._invalidate(*(w.address for w in wallets))
+
+    def read(self, item_id: str) -> Wallet:
+        with self.db.lock:
+            wallet = self.db.wallets.get(item_id)
+        if wallet is None:
+            raise NotFoundError("Wallet not found")
+        return wallet
+
+    def update(self, item: Wallet) -> None:
+        with self.db.lock:
+            current = self.db.wallets.get(item.address)
+            if current is None:
+                raise NotFoundError("Wallet not found")
+            if item.user_id not in self.db.users:
+                raise ConflictError("Wallet conflict")
+            self.db.write_wallet(
+                item.address, replace(item, version=current.version + 1)
+            )
+        self._invalidate(item.address)
+
+    def delete(self, item_id: str) -> None:
+        with self.db.lock:
+            if item_id not in self.db.wallets:
+                raise NotFoundError("Wallet not found")
+            if item_id in self.db.transactions_by_address:
+                raise ConflictError("Wallet conflict")
+            self.db.write_wallet(item_id, None)
+        self._invalidate(item_id)
+
+    def read_all(self) -> Iterable[Wallet]:
+        with self.db.lock:
+            return list(self.db.wallets.values())
+
+    def read_by_owner(self, user_id: str) -> Iterable[Wallet]:
+        with self.db.lock:
+            addresses = self.db.addresses_by_owner.get(user_id, {})
+            return [self.db.wallets[address] for address in addresses]
+
+    def count_by_owner(self, user_id: str) -> int:
+        with self.db.lock:
+            return len(self.db.addresses_by_owner.get(user_id, ()))
+
+    def count_by_owners(self, user_ids: Collection[str]) -> dict[str, int]:
+        with self.db.lock:
+            return {
+                user_id: len(self.db.addresses_by_owner[user_id])
+                for user_id in user_ids
+                if self.db.addresses_by_owner.get(user_id)
+            }
+
+    def read_many(self, addresses: Collection[str]) -> Iterable[Wallet]:
+        with self.db.lock:
+            return [
+                self.db.wallets[address]
+                for address in dict.fromkeys(addresses)
+                if address in self.db.wallets
+            ]
+
+    def update_balances(self, balances: Iterable[tuple[str, int]]) -> None:
+        changes = list(balances)
+        with self.db.lock:
+            for address, balance in changes:
+                wallet = self.db.wallets.get(address)
+                if wallet is not None:
+                    self.db.write_wallet(
+                        address,
+                        replace(
+                            wallet, balance_sat=balance, version=wallet.version + 1
+                        ),
+                    )
+        self._invalidate(*(address for address, _ in changes))
+
+    def move_balance(
+        self,
+        user_id: str,
+        from_address: str,
+        to_address: str,
+        amount_sat: int,
+        external_fee_sat: int,
+    ) -> int:
+        with self.db.lock:
+            source = self.read(from_address)
+            if source.user_id != user_id:
+                raise NotFoundError("Source wallet not found")
+            destination = self.read(to_address)
+            if source.balance_sat < amount_sat:
+                raise InsufficientFundsError("Insufficient funds")
+
+            fee_sat = 0 if destination.user_id == user_id else external_fee_sat
+            self.db.write_wallet(
+                from_address,
+                replace(
+                    source,
+                    balance_sat=source.balance_sat - amount_sat,
+                    version=source.version + 1,
+                ),
+            )
+            destination = self.db.wallets[to_address]
+            self.db.write_wallet(
+                to_address,
+                replace(
+                    destination,
+                    balance_sat=destination.balance_sat + amount_sat - fee_sat,
+                    version=destination.version + 1,
+                ),
+            )
+        self._invalidate(from_address, to_address)
+        return fee_sat
+
+    def count(self) -> int:
+        with self.db.lock:
+            return len(self.db.wallets)
+
+    def _invalidate(self, *addresses: str) -> None:
+        versions = self.versions
+        if versions is not None:
+            self.db.after_transaction(lambda: versions.invalidate(addresses))
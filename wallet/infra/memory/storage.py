@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import TracebackType
+
+from wallet.core.repository.storage import Storage, StorageFactory, StorageIntent
+from wallet.core.services.api_keys import ApiKeyCache
+from wallet.core.services.wallet_versions import WalletVersionCache
+from wallet.infra.memory.database import MemoryDatabase
+from wallet.infra.memory.repository.statistics import MemoryStatisticsRepository
+from wallet.infra.memory.repository.transactions import MemoryTransactionRepository
+from wallet.infra.memory.repository.users import MemoryUserRepository
+from wallet.infra.memory.repository.wallets import MemoryWalletRepository
+
+
+@dataclass
+class MemoryUnitOfWork:
+    db: MemoryDatabase
+
+    def __enter__(self) -> MemoryUnitOfWork:
+        self.db.begin()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> bool | None:
+        if exc_type is None:
+            self.db.commit()
+            return None
+        self.db.rollback()
+        return None
+
+
+@dataclass
+class MemoryStorage(Storage):
+    db: MemoryDatabase
+    api_keys: ApiKeyCache | None = None
+    wallet_versions: WalletVersionCache | None = None
+
+    def users(self) -> MemoryUserRepository:
+        return MemoryUserRepository(self.db, self.api_keys)
+
+    def wallets(self) -> MemoryWalletRepository:
+        return MemoryWalletRepository(self.db, self.wallet_versions)
+
+    def transactions(self) -> MemoryTransactionRepository:
+        return MemoryTransactionRepository(self.db)
+
+    def statistics(self) -> MemoryStatisticsRepository:
+        return MemoryStatisticsRepository(self.db)
+
+    def uow(self) -> MemoryUnitOfWork:
+        return MemoryUnitOfWork(self.db)
+
+
+@dataclass
+class MemoryStorageFactory(StorageFactory):
+    db: MemoryDatabase = field(default_factory=MemoryDatabase)
+    api_keys: ApiKeyCache | None = None
+    wallet_versions: WalletVersionCache | None = None
+
+    @contextmanager
+    def storage(
+        self,
+        intent: StorageIntent = "write",  # noqa: ARG002
+    ) -> Iterator[MemoryStorage]:
+        yield MemoryStorage(self.db, self.api_keys, self.wallet_versions)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from contextlib import suppress
+from dataclasses import dataclass, field
+
+from wallet.core.services.pricing import AsyncPriceProvider, BtcUsdQuote, PriceProvider
+
+
+def _validate_windows(
+    ttl_seconds: float,
+    stale_while_revalidate_seconds: float,
+    max_staleness_seconds: float,
+) -> None:
+    if ttl_seconds < 0 or stale_while_revalidate_seconds < 0:
+        raise ValueError("Cache windows must be >= 0")
+    if max_staleness_seconds < ttl_seconds + stale_while_revalidate_seconds:
+        raise ValueError("max_staleness must cover ttl + stale_while_revalidate")
+
+
+@dataclass
+class CachedPriceProvider(PriceProvider):
+    inner: PriceProvider
+    ttl_seconds: float = 30.0
+    stale_while_revalidate_seconds: float = 30.0
+    max_staleness_seconds: float = 300.0
+    clock: Callable[[], float] = time.monotonic
+
+    _quote: BtcUsdQuote | None = field(default=None, init=False, repr=False)
+    _fetched_at: float = field(default=0.0, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    _refreshing: bool = field(default=False, init=False, repr=False)
+    _inflight: Future[BtcUsdQuote] | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        _validate_windows(
+            self.ttl_seconds,
+            self.stale_while_revalidate_seconds,
+            self.max_staleness_seconds,
+        )
+
+    def btc_usd(self) -> BtcUsdQuote:
+        quote, age = self._cached()
+        if quote is not None and age < self.ttl_seconds:
+            return quote
+
+        if (
+            quote is not None
+            and age < self.ttl_seconds + self.stale_while_revalidate_seconds
+        ):
+            self._refresh_in_background()
+            return quote
+
+        try:
+            return self._refresh()
+        except Exception:
+            quote, age = self._cached()
+            if quote is not None and age < self.max_staleness_seconds:
+                return quote
+            raise
+
+    def _cached(self) -> tuple[BtcUsdQuote | None, float]:
+        with self._lock:
+            return self._quote, self.clock() - self._fetched_at
+
+    def _refresh(self) -> BtcUsdQuote:
+        with self._lock:
+            if (
+                self._quote is not None
+                and self.clock() - self._fetched_at < self.ttl_seconds
+            ):
+                return self._quote
+            inflight = self._inflight
+            leader = inflight is None
+            if inflight is None:
+                inflight = self._inflight = Future()
+        if leader:
+            return self._fetch(inflight)
+        return inflight.result()
+
+    def _fetch(self, inflight: Future[BtcUsdQuote]) -> BtcUsdQuote:
+        try:
+            quote = self.inner.btc_usd()
+        except Exception as e:
+            with self._lock:
+                self._inflight = None
+            inflight.set_exception(e)
+            raise
+        with self._lock:
+            self._quote = quote
+            self._fetched_at = self.clock()
+            self._inflight = None
+        inflight.set_result(quote)
+        return quote
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            with suppress(Exception):
+                self._refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+@dataclass
+class AsyncCachedPriceProvider(AsyncPriceProvider):
+    inner: AsyncPriceProvider
+    ttl_seconds: float = 30.0
+    stale_while_revalidate_seconds: float = 30.0
+    max_staleness_seconds: float = 300.0
+    clock: Callable[[], float] = time.monotonic
+
+    _quote: BtcUsdQuote | None = field(default=None, init=False, repr=False)
+    _fetched_at: float = field(default=0.0, init=False, repr=False)
+    _inflight: asyncio.Task[BtcUsdQuote] | None = field(
+        default=None, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        _validate_windows(
+            self.ttl_seconds,
+            self.stale_while_revalidate_seconds,
+            self.max_staleness_seconds,
+        )
+
+    async def btc_usd(self) -> BtcUsdQuote:
+        quote, age = self._quote, self.clock() - self._fetched_at
+        if quote is not None and age < self.ttl_seconds:
+            return quote
+
+        refresh = self._refresh()
+        if (
+            quote is not None
+            and age < self.ttl_seconds + self.stale_while_revalidate_seconds
+        ):
+            return quote
+
+        try:
+            return await asyncio.shield(refresh)
+        except Exception:
+            quote, age = self._quote, self.clock() - self._fetched_at
+            if quote is not None and age < self.max_staleness_seconds:
+                return quote
+            raise
+
+    def _refresh(self) -> asyncio.Task[BtcUsdQuote]:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._fetch())
+            self._inflight.add_done_callback(_consume_exception)
+        return self._inflight
+
+    async def _fetch(self) -> BtcUsdQuote:
+        quote = await self.inner.btc_usd()
+        self._quote = quote
+        self._fetched_at = self.clock()
+        return quote
+
+
+def _consume_exception(task: asyncio.Task[BtcUsdQuote]) -> None:
+    if not task.cancelled():
+        task.exception()
@@ -2,18 +2,34 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
+from typing import Any
 
+import httpx
 import requests
 
-from wallet.core.services.pricing import BtcUsdQuote, PriceProvider
+from wallet.core.services.pricing import AsyncPriceProvider, BtcUsdQuote, PriceProvider
+
+COINBASE_SPOT_URL = "https://api.coinbase.com/v2/prices/BTC-USD/spot"
+
+
+def _parse_quote(data: Any) -> BtcUsdQuote:
+    amount = Decimal(str(data["data"]["amount"]))
+    return BtcUsdQuote(usd_per_btc=amount)
 
 
 @dataclass
 class CoinbasePriceProvider(PriceProvider):
     def btc_usd(self) -> BtcUsdQuote:
-        url = "https://api.coinbase.com/v2/prices/BTC-USD/spot"
-        resp = requests.get(url, timeout=10)
+        resp = requests.get(COINBASE_SPOT_URL, timeout=10)
+        resp.raise_for_status()
+        return _parse_quote(resp.json())
+
+
+@dataclass
+class AsyncCoinbasePriceProvider(AsyncPriceProvider):
+    client: httpx.AsyncClient
+
+    async def btc_usd(self) -> BtcUsdQuote:
+        resp = await self.client.get(COINBASE_SPOT_URL, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
-        amount = Decimal(str(data["data"]["amount"]))
-        return BtcUsdQuote(usd_per_btc=amount)
+        return _parse_quote(resp.json())
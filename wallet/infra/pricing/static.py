@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import cached_property
+
+from wallet.core.services.pricing import AsyncPriceProvider, BtcUsdQuote, PriceProvider
+
+
+@dataclass(frozen=True)
+class StaticPriceProvider(AsyncPriceProvider):
+    usd_per_btc: Decimal = Decimal("50000.00")
+
+    async def btc_usd(self) -> BtcUsdQuote:
+        return self.quote
+
+    @cached_property
+    def quote(self) -> BtcUsdQuote:
+        return BtcUsdQuote(usd_per_btc=self.usd_per_btc)
+
+
+@dataclass(frozen=True)
+class FixedPriceProvider(PriceProvider):
+    usd_per_btc: Decimal = Decimal("50000.00")
+
+    def btc_usd(self) -> BtcUsdQuote:
+        return self.quote
+
+    @cached_property
+    def quote(self) -> BtcUsdQuote:
+        return BtcUsdQuote(usd_per_btc=self.usd_per_btc)
@@ -1,24 +1,81 @@
 from __future__ import annotations
 
 import sqlite3
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 from types import TracebackType
 
+from wallet.infra.sqlite.hooks import HookedConnection
+from wallet.infra.sqlite.tracing import TimedConnection, TracingConnection
+from wallet.settings import DURABLE_PROFILE, StorageProfile
+from wallet.telemetry import waiting_for_lock
 
-def connect(db_path: Path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path, timeout=30)
+
+def connect(
+    db_path: Path,
+    profile: StorageProfile = DURABLE_PROFILE,
+    *,
+    read_only: bool = False,
+    check_same_thread: bool = True,
+    cached_statements: int = 128,
+    timed: bool = False,
+    trace: bool = False,
+    slow_query_ms: float | None = None,
+) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        f"{db_path.resolve().as_uri()}?mode=ro" if read_only else db_path,
+        timeout=profile.busy_timeout_ms / 1000,
+        check_same_thread=check_same_thread,
+        cached_statements=cached_statements,
+        uri=read_only,
+        factory=_connection_class(timed=timed, trace=trace),
+    )
+    if isinstance(conn, TracingConnection) and slow_query_ms is not None:
+        conn.slow_query_seconds = slow_query_ms / 1000
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
+    apply_profile(conn, profile, read_only=read_only)
     return conn
 
 
+def after_transaction(conn: sqlite3.Connection, callback: Callable[[], None]) -> None:
+    if isinstance(conn, HookedConnection):
+        conn.after_transaction(callback)
+    else:
+        callback()
+
+
+def _connection_class(*, timed: bool, trace: bool) -> type[HookedConnection]:
+    if trace:
+        return TracingConnection
+    if timed:
+        return TimedConnection
+    return HookedConnection
+
+
+def apply_profile(
+    conn: sqlite3.Connection, profile: StorageProfile, *, read_only: bool = False
+) -> None:
+    if read_only:
+        conn.execute("PRAGMA query_only = ON;")
+    else:
+        conn.execute(f"PRAGMA journal_mode = {profile.journal_mode};")
+        conn.execute(f"PRAGMA wal_autocheckpoint = {int(profile.wal_autocheckpoint)};")
+    conn.execute(f"PRAGMA synchronous = {profile.synchronous};")
+    conn.execute(f"PRAGMA mmap_size = {int(profile.mmap_size)};")
+    conn.execute(f"PRAGMA cache_size = {int(profile.cache_size)};")
+    conn.execute(f"PRAGMA temp_store = {profile.temp_store};")
+    conn.execute(f"PRAGMA busy_timeout = {int(profile.busy_timeout_ms)};")
+
+
 @dataclass
 class SqliteUnitOfWork:
     conn: sqlite3.Connection
 
     def __enter__(self) -> SqliteUnitOfWork:
-        self.conn.execute("BEGIN IMMEDIATE;")
+        with waiting_for_lock():
+            self.conn.execute("BEGIN IMMEDIATE;")
         return self
 
     def __exit__(
@@ -32,3 +89,21 @@ class SqliteUnitOfWork:
             return None
         self.conn.rollback()
         return None
+
+
+@dataclass
+class SqliteReadTransaction:
+    conn: sqlite3.Connection
+
+    def __enter__(self) -> SqliteReadTransaction:
+        self.conn.execute("BEGIN;")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> bool | None:
+        self.conn.rollback()
+        return None
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from wallet.core.repository.storage import StorageFactory, StorageIntent
+from wallet.core.services.api_keys import ApiKeyCache
+from wallet.core.services.wallet_versions import WalletVersionCache
+from wallet.infra.sqlite.pool import SqliteConnectionPool
+from wallet.infra.sqlite.setup import setup
+from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.settings import Settings
+
+
+@dataclass
+class SqliteStorageFactory(StorageFactory):
+    write_pool: SqliteConnectionPool
+    read_pool: SqliteConnectionPool
+    api_keys: ApiKeyCache | None = None
+    wallet_versions: WalletVersionCache | None = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        api_keys: ApiKeyCache | None = None,
+        wallet_versions: WalletVersionCache | None = None,
+    ) -> SqliteStorageFactory:
+        write_pool = SqliteConnectionPool(
+            db_path=settings.database_path,
+            profile=settings.storage_profile,
+            size=settings.pool_size,
+            timeout_seconds=settings.pool_timeout_seconds,
+            cached_statements=settings.statement_cache_size,
+            timed=settings.metrics,
+            trace=settings.trace_sql,
+            slow_query_ms=settings.slow_query_ms,
+        )
+        with write_pool.connection() as conn:
+            setup(conn)
+
+        read_pool = SqliteConnectionPool(
+            db_path=settings.database_path,
+            profile=settings.storage_profile,
+            size=settings.read_pool_size,
+            timeout_seconds=settings.pool_timeout_seconds,
+            cached_statements=settings.statement_cache_size,
+            timed=settings.metrics,
+            trace=settings.trace_sql,
+            slow_query_ms=settings.slow_query_ms,
+            read_only=True,
+        )
+        return cls(
+            write_pool=write_pool,
+            read_pool=read_pool,
+            api_keys=api_keys,
+            wallet_versions=wallet_versions,
+        )
+
+    @contextmanager
+    def storage(self, intent: StorageIntent = "write") -> Iterator[SqliteStorage]:
+        pool = self.read_pool if intent == "read" else self.write_pool
+        with pool.connection() as conn:
+            yield SqliteStorage(conn, self.api_keys, self.wallet_versions)
+
+    def close(self) -> None:
+        self.read_pool.close()
+        self.write_pool.close()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from wallet.core.domain import Transaction
+from wallet.core.errors import DomainError
+from wallet.core.services.transactions import record_transfer, validate_transfer
+from wallet.core.services.wallet_versions import WalletVersionCache
+from wallet.infra.sqlite.connection import connect
+from wallet.infra.sqlite.storage import SqliteStorage
+from wallet.settings import DURABLE_PROFILE, StorageProfile
+from wallet.telemetry import timed
+
+
+@dataclass(frozen=True)
+class _PendingTransfer:
+    user_id: str
+    from_address: str
+    to_address: str
+    amount_sat: int
+    future: Future[Transaction] = field(default_factory=Future)
+
+
+_STOP = object()
+
+
+@dataclass
+class SqliteGroupCommitWriter:
+    db_path: Path
+    profile: StorageProfile = DURABLE_PROFILE
+    flush_window_seconds: float = 0.002
+    max_batch: int = 256
+    wallet_versions: WalletVersionCache | None = None
+
+    _queue: queue.Queue[_PendingTransfer | object] = field(
+        default_factory=queue.Queue, init=False, repr=False
+    )
+    _thread: threading.Thread | None = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="sqlite-group-commit", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        thread.join()
+
+    def transfer(
+        self, user_id: str, from_address: str, to_address: str, amount_sat: int
+    ) -> Transaction:
+        validate_transfer(from_address, to_address, amount_sat)
+        pending = _PendingTransfer(user_id, from_address, to_address, amount_sat)
+        with timed("db"):
+            with self._lock:
+                if self._thread is None:
+                    raise RuntimeError("Group commit writer is not running")
+                self._queue.put(pending)
+            return pending.future.result()
+
+    def _run(self) -> None:
+        conn = connect(self.db_path, self.profile)
+        try:
+            stopping = False
+            while not stopping:
+                first = self._queue.get()
+                if not isinstance(first, _PendingTransfer):
+                    break
+                batch = [first]
+                stopping = self._collect(batch)
+                self._commit(conn, batch)
+        finally:
+            conn.close()
+            self._fail_pending()
+
+    def _collect(self, batch: list[_PendingTransfer]) -> bool:
+        deadline = time.monotonic() + self.flush_window_seconds
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return False
+            if not isinstance(item, _PendingTransfer):
+                return True
+            batch.append(item)
+        return False
+
+    def _commit(self, conn: sqlite3.Connection, batch: list[_PendingTransfer]) -> None:
+        storage = SqliteStorage(conn, wallet_versions=self.wallet_versions)
+        results: list[Transaction | DomainError] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            for pending in batch:
+                conn.execute("SAVEPOINT transfer;")
+                try:
+                    tx = record_transfer(
+                        storage,
+                        str(uuid.uuid4()),
+                        pending.user_id,
+                        pending.from_address,
+                        pending.to_address,
+                        pending.amount_sat,
+                    )
+                except DomainError as e:
+                    conn.execute("ROLLBACK TO transfer;")
+                    results.append(e)
+                else:
+                    results.append(tx)
+                conn.execute("RELEASE transfer;")
+            conn.commit()
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+
+        for pending, result in zip(batch, results, strict=True):
+            if isinstance(result, DomainError):
+                pending.future.set_exception(result)
+            else:
+                pending.future.set_result(result)
+
+    def _fail_pending(self) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, _PendingTransfer):
+                item.future.set_exception(
+                    RuntimeError("Group commit writer is shutting down")
+                )
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Callable
+from typing import Any
+
+
+class HookedConnection(sqlite3.Connection):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._after_transaction: list[Callable[[], None]] = []
+
+    def after_transaction(self, callback: Callable[[], None]) -> None:
+        if self.in_transaction:
+            self._after_transaction.append(callback)
+        else:
+            callback()
+
+    def commit(self) -> None:
+        try:
+            super().commit()
+        finally:
+            self._end_transaction()
+
+    def rollback(self) -> None:
+        try:
+            super().rollback()
+        finally:
+            self._end_transaction()
+
+    def _end_transaction(self) -> None:
+        if self.in_transaction:
+            return
+        callbacks, self._after_transaction = self._after_transaction, []
+        for callback in callbacks:
+            callback()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from wallet.infra.sqlite.connection import connect
+from wallet.settings import DURABLE_PROFILE, StorageProfile
+
+
+@dataclass
+class SqliteConnectionPool:
+    db_path: Path
+    profile: StorageProfile = DURABLE_PROFILE
+    size: int = 8
+    timeout_seconds: float = 30.0
+    cached_statements: int = 256
+    read_only: bool = False
+    timed: bool = False
+    trace: bool = False
+    slow_query_ms: float | None = None
+
+    _idle: queue.LifoQueue[sqlite3.Connection] = field(
+        default_factory=queue.LifoQueue, init=False, repr=False
+    )
+    _created: int = field(default=0, init=False, repr=False)
+    _closed: bool = field(default=False, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.size < 1:
+            raise ValueError("Pool size must be >= 1")
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def acquire(self) -> sqlite3.Connection:
+        while True:
+            conn = self._checkout()
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            self._discard(conn)
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+    def _checkout(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return self._open()
+            except BaseException:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout_seconds)
+        except queue.Empty as e:
+            raise TimeoutError("Timed out waiting for a database connection") from e
+
+    def _open(self) -> sqlite3.Connection:
+        return connect(
+            self.db_path,
+            self.profile,
+            read_only=self.read_only,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            timed=self.timed,
+            trace=self.trace,
+            slow_query_ms=self.slow_query_ms,
+        )
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with suppress(sqlite3.Error):
+            conn.close()
+        with self._lock:
+            self._created -= 1
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1;").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
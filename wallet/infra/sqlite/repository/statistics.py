@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from wallet.core.domain import (
+    BUCKET_BOUND_FORMAT,
+    BUCKET_FORMATS,
+    Granularity,
+    PlatformStats,
+    StatsBucket,
+)
+from wallet.core.errors import NotFoundError
+from wallet.core.repository.repository import StatisticsRepository
+from wallet.infra.sqlite.setup import bucket_sql, seed_rollups
+
+
+@dataclass
+class SqliteStatisticsRepository(StatisticsRepository):
+    conn: sqlite3.Connection
+
+    def read(self) -> PlatformStats:
+        row = self.conn.execute(
+            "SELECT tx_count, total_fee_sat, total_volume_sat "
+            "FROM platform_stats WHERE id = 1;"
+        ).fetchone()
+        if row is None:
+            raise NotFoundError("Platform statistics not found")
+        return PlatformStats(
+            total_transactions=int(row["tx_count"]),
+            total_fee_sat=int(row["total_fee_sat"]),
+            total_volume_sat=int(row["total_volume_sat"]),
+        )
+
+    def compute(self) -> PlatformStats:
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS tx_count, "
+            "COALESCE(SUM(fee_sat), 0) AS total_fee_sat, "
+            "COALESCE(SUM(amount_sat), 0) AS total_volume_sat "
+            "FROM transactions;"
+        ).fetchone()
+        return PlatformStats(
+            total_transactions=int(row["tx_count"]),
+            total_fee_sat=int(row["total_fee_sat"]),
+            total_volume_sat=int(row["total_volume_sat"]),
+        )
+
+    def rebuild(self) -> PlatformStats:
+        stats = self.compute()
+        self.conn.execute(
+            "INSERT INTO platform_stats(id, tx_count, total_fee_sat, total_volume_sat) "
+            "VALUES(1, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+            "tx_count = excluded.tx_count, "
+            "total_fee_sat = excluded.total_fee_sat, "
+            "total_volume_sat = excluded.total_volume_sat;",
+            (stats.total_transactions, stats.total_fee_sat, stats.total_volume_sat),
+        )
+        seed_rollups(self.conn)
+        return stats
+
+    def read_buckets(
+        self,
+        granularity: Granularity,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[StatsBucket]:
+        sql = (
+            "SELECT bucket_start, tx_count, fee_sat, volume_sat FROM stats_rollups "
+            "WHERE granularity = ? AND tx_count > 0"
+        )
+        params: list[str] = [granularity]
+        if start is not None:
+            sql += " AND bucket_start >= ?"
+            params.append(start.astimezone(UTC).strftime(BUCKET_FORMATS[granularity]))
+        if end is not None:
+            sql += " AND bucket_start < ?"
+            params.append(end.astimezone(UTC).strftime(BUCKET_BOUND_FORMAT))
+        rows = self.conn.execute(sql + " ORDER BY bucket_start;", params).fetchall()
+        return [_bucket(r) for r in rows]
+
+    def compute_buckets(self, granularity: Granularity) -> list[StatsBucket]:
+        rows = self.conn.execute(
+            f"SELECT {bucket_sql(granularity, 'created_at')} AS bucket_start, "
+            "COUNT(*) AS tx_count, SUM(fee_sat) AS fee_sat, "
+            "SUM(amount_sat) AS volume_sat "
+            "FROM transactions GROUP BY bucket_start ORDER BY bucket_start;"
+        ).fetchall()
+        return [_bucket(r) for r in rows]
+
+
+def _bucket(row: sqlite3.Row) -> StatsBucket:
+    return StatsBucket(
+        bucket_start=datetime.strptime(
+            str(row["bucket_start"]), BUCKET_BOUND_FORMAT
+        ).replace(tzinfo=UTC),
+        total_transactions=int(row["tx_count"]),
+        total_fee_sat=int(row["fee_sat"]),
+        total_volume_sat=int(row["volume_sat"]),
+    )
@@ -1,52 +1,74 @@
 from __future__ import annotations
 
 import sqlite3
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable, Iterator
 from dataclasses import dataclass
-from datetime import datetime
 
 from wallet.core.domain import Transaction
 from wallet.core.errors import ConflictError, NotFoundError
-from wallet.core.repository.repository import Repository
+from wallet.core.repository.repository import (
+    TransactionCursor,
+    TransactionRepository,
+)
+from wallet.infra.sqlite.rows import (
+    TRANSACTION_COLUMNS,
+    decode_transaction,
+    to_epoch_us,
+    tuples,
+)
 
 
 @dataclass
-class SqliteTransactionRepository(Repository[Transaction]):
+class SqliteTransactionRepository(TransactionRepository):
     conn: sqlite3.Connection
 
     def create(self, item: Transaction) -> None:
         try:
             self.conn.execute(
-                "INSERT INTO transactions(id, from_address, to_address, "
-                "amount_sat, fee_sat, created_at) VALUES(?, ?, ?, ?, ?, ?);",
+                f"INSERT INTO transactions({TRANSACTION_COLUMNS}) "
+                "VALUES(?, ?, ?, ?, ?, ?);",
                 (
                     item.id,
                     item.from_address,
                     item.to_address,
                     item.amount_sat,
                     item.fee_sat,
-                    item.created_at.isoformat(),
+                    to_epoch_us(item.created_at),
+                ),
+            )
+        except sqlite3.IntegrityError as e:
+            raise ConflictError("Transaction conflict") from e
+
+    def create_many(self, items: Iterable[Transaction]) -> None:
+        try:
+            self.conn.executemany(
+                f"INSERT INTO transactions({TRANSACTION_COLUMNS}) "
+                "VALUES(?, ?, ?, ?, ?, ?);",
+                (
+                    (
+                        item.id,
+                        item.from_address,
+                        item.to_address,
+                        item.amount_sat,
+                        item.fee_sat,
+                        to_epoch_us(item.created_at),
+                    )
+                    for item in items
                 ),
             )
         except sqlite3.IntegrityError as e:
             raise ConflictError("Transaction conflict") from e
 
     def read(self, item_id: str) -> Transaction:
-        row = self.conn.execute(
-            "SELECT id, from_address, to_address, amount_sat, "
-            "fee_sat, created_at FROM transactions WHERE id = ?;",
-            (item_id,),
+        row = tuples(
+            self.conn.execute(
+                f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE id = ?;",
+                (item_id,),
+            )
         ).fetchone()
         if row is None:
             raise NotFoundError("Transaction not found")
-        return Transaction(
-            id=str(row["id"]),
-            from_address=str(row["from_address"]),
-            to_address=str(row["to_address"]),
-            amount_sat=int(row["amount_sat"]),
-            fee_sat=int(row["fee_sat"]),
-            created_at=datetime.fromisoformat(str(row["created_at"])),
-        )
+        return decode_transaction(row)
 
     def update(self, item: Transaction) -> None:
         cur = self.conn.execute(
@@ -57,7 +79,7 @@ class SqliteTransactionRepository(Repository[Transaction]):
                 item.to_address,
                 item.amount_sat,
                 item.fee_sat,
-                item.created_at.isoformat(),
+                to_epoch_us(item.created_at),
                 item.id,
             ),
         )
@@ -70,21 +92,65 @@ class SqliteTransactionRepository(Repository[Transaction]):
             raise NotFoundError("Transaction not found")
 
     def read_all(self) -> Iterable[Transaction]:
-        rows = self.conn.execute(
-            "SELECT id, from_address, to_address, amount_sat, "
-            "fee_sat, created_at FROM transactions;"
+        rows = tuples(
+            self.conn.execute(f"SELECT {TRANSACTION_COLUMNS} FROM transactions;")
         ).fetchall()
-        return [
-            Transaction(
-                id=str(r["id"]),
-                from_address=str(r["from_address"]),
-                to_address=str(r["to_address"]),
-                amount_sat=int(r["amount_sat"]),
-                fee_sat=int(r["fee_sat"]),
-                created_at=datetime.fromisoformat(str(r["created_at"])),
-            )
-            for r in rows
+        return [decode_transaction(r) for r in rows]
+
+    def read_by_addresses(self, addresses: Collection[str]) -> Iterable[Transaction]:
+        return list(self.iter_by_addresses(addresses))
+
+    def iter_by_addresses(
+        self, addresses: Collection[str], batch_size: int = 500
+    ) -> Iterator[Transaction]:
+        if not addresses:
+            return
+
+        selects = [
+            f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE {column} = ?"
+            for column in ("from_address", "to_address")
+            for _ in addresses
         ]
+        cur = tuples(
+            self.conn.execute(
+                " UNION ".join(selects) + " ORDER BY created_at, id;",
+                (*addresses, *addresses),
+            )
+        )
+        while rows := cur.fetchmany(batch_size):
+            yield from map(decode_transaction, rows)
+
+    def read_page_by_addresses(
+        self,
+        addresses: Collection[str],
+        limit: int,
+        after: TransactionCursor | None = None,
+    ) -> list[Transaction]:
+        if not addresses or limit <= 0:
+            return []
+
+        keyset = "" if after is None else " AND (created_at, id) > (?, ?)"
+        keyset_params: tuple[int | str, ...] = (
+            () if after is None else (to_epoch_us(after.created_at), after.id)
+        )
+        selects: list[str] = []
+        params: list[str | int] = []
+        for column in ("from_address", "to_address"):
+            for address in addresses:
+                selects.append(
+                    f"SELECT * FROM (SELECT {TRANSACTION_COLUMNS} "
+                    f"FROM transactions WHERE {column} = ?{keyset} "
+                    "ORDER BY created_at, id LIMIT ?)"
+                )
+                params.extend((address, *keyset_params, limit))
+
+        rows = tuples(
+            self.conn.execute(
+                " UNION ".join(selects) + " ORDER BY created_at, id LIMIT ?;",
+                (*params, limit),
+            )
+        ).fetchall()
+        return [decode_transaction(r) for r in rows]
 
     def count(self) -> int:
         (cnt,) = self.conn.execute("SELECT COUNT(*) FROM transactions;").fetchone()
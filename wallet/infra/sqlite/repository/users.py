@@ -6,12 +6,16 @@ from dataclasses import dataclass
 
 from wallet.core.domain import User
 from wallet.core.errors import ConflictError, NotFoundError
-from wallet.core.repository.repository import Repository
+from wallet.core.repository.repository import UserRepository
+from wallet.core.services.api_keys import ApiKeyCache
+from wallet.infra.sqlite.connection import after_transaction
+from wallet.infra.sqlite.rows import USER_COLUMNS, decode_user, tuples
 
 
 @dataclass
-class SqliteUserRepository(Repository[User]):
+class SqliteUserRepository(UserRepository):
     conn: sqlite3.Connection
+    api_keys: ApiKeyCache | None = None
 
     def create(self, item: User) -> None:
         try:
@@ -20,39 +24,75 @@ class SqliteUserRepository(Repository[User]):
             )
         except sqlite3.IntegrityError as e:
             raise ConflictError("User Conflict") from e
+        self._invalidate(api_keys=[item.api_key])
+
+    def create_many(self, items: Iterable[User]) -> None:
+        users = list(items)
+        try:
+            self.conn.executemany(
+                "INSERT INTO users(id, api_key) VALUES(?, ?);",
+                ((u.id, u.api_key) for u in users),
+            )
+        except sqlite3.IntegrityError as e:
+            raise ConflictError("User Conflict") from e
+        self._invalidate(api_keys=[u.api_key for u in users])
 
     def read(self, item_id: str) -> User:
-        row = self.conn.execute(
-            "SELECT id, api_key FROM users WHERE id = ?;", (item_id,)
+        row = tuples(
+            self.conn.execute(
+                f"SELECT {USER_COLUMNS} FROM users WHERE id = ?;", (item_id,)
+            )
         ).fetchone()
         if row is None:
             raise NotFoundError("User not found")
-        return User(id=str(row["id"]), api_key=str(row["api_key"]))
+        return decode_user(row)
 
     def read_by_api_key(self, api_key: str) -> User:
-        row = self.conn.execute(
-            "SELECT id, api_key FROM users WHERE api_key = ?;", (api_key,)
+        row = tuples(
+            self.conn.execute(
+                f"SELECT {USER_COLUMNS} FROM users WHERE api_key = ?;", (api_key,)
+            )
         ).fetchone()
         if row is None:
             raise NotFoundError("User not found")
-        return User(id=str(row["id"]), api_key=str(row["api_key"]))
+        return decode_user(row)
 
     def update(self, item: User) -> None:
         cur = self.conn.execute(
             "UPDATE users SET api_key = ? WHERE id = ?;", (item.api_key, item.id)
         )
+        self._invalidate(user_ids=[item.id], api_keys=[item.api_key])
         if cur.rowcount == 0:
             raise NotFoundError("User not found")
 
     def delete(self, item_id: str) -> None:
         cur = self.conn.execute("DELETE FROM users WHERE id = ?;", (item_id,))
+        self._invalidate(user_ids=[item_id])
         if cur.rowcount == 0:
             raise NotFoundError("User not found")
 
     def read_all(self) -> Iterable[User]:
-        rows = self.conn.execute("SELECT id, api_key FROM users;").fetchall()
-        return [User(id=str(r["id"]), api_key=str(r["api_key"])) for r in rows]
+        rows = tuples(
+            self.conn.execute(f"SELECT {USER_COLUMNS} FROM users;")
+        ).fetchall()
+        return [decode_user(r) for r in rows]
 
     def count(self) -> int:
         (cnt,) = self.conn.execute("SELECT COUNT(*) FROM users;").fetchone()
         return int(cnt)
+
+    def _invalidate(
+        self, user_ids: Iterable[str] = (), api_keys: Iterable[str] = ()
+    ) -> None:
+        cache = self.api_keys
+        if cache is None:
+            return
+        stale_users, stale_keys = tuple(user_ids), tuple(api_keys)
+
+        def invalidate() -> None:
+            for user_id in stale_users:
+                cache.invalidate_user(user_id)
+            for api_key in stale_keys:
+                cache.invalidate_key(api_key)
+
+        after_transaction(self.conn, invalidate)
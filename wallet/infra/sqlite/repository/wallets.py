@@ -1,66 +1,174 @@
 from __future__ import annotations
 
 import sqlite3
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable
 from dataclasses import dataclass
+from typing import NoReturn
 
 from wallet.core.domain import Wallet
-from wallet.core.errors import ConflictError, NotFoundError
-from wallet.core.repository.repository import Repository
+from wallet.core.errors import ConflictError, InsufficientFundsError, NotFoundError
+from wallet.core.repository.repository import WalletRepository
+from wallet.core.services.wallet_versions import WalletVersionCache
+from wallet.infra.sqlite.connection import after_transaction
+from wallet.infra.sqlite.rows import WALLET_COLUMNS, decode_wallet, tuples
+
+MAX_PARAMS_PER_QUERY = 500
 
 
 @dataclass
-class SqliteWalletRepository(Repository[Wallet]):
+class SqliteWalletRepository(WalletRepository):
     conn: sqlite3.Connection
+    versions: WalletVersionCache | None = None
 
     def create(self, item: Wallet) -> None:
         try:
             self.conn.execute(
-                "INSERT INTO wallets(address, user_id, balance_sat) VALUES(?, ?, ?);",
-                (item.address, item.user_id, item.balance_sat),
+                "INSERT INTO wallets(address, user_id, balance_sat, version) "
+                "VALUES(?, ?, ?, ?);",
+                (item.address, item.user_id, item.balance_sat, item.version),
+            )
+        except sqlite3.IntegrityError as e:
+            raise ConflictError("Wallet conflict") from e
+        self._invalidate(item.address)
+
+    def create_many(self, items: Iterable[Wallet]) -> None:
+        wallets = list(items)
+        try:
+            self.conn.executemany(
+                "INSERT INTO wallets(address, user_id, balance_sat, version) "
+                "VALUES(?, ?, ?, ?);",
+                ((w.address, w.user_id, w.balance_sat, w.version) for w in wallets),
             )
         except sqlite3.IntegrityError as e:
             raise ConflictError("Wallet conflict") from e
+        self._invalidate(*(w.address for w in wallets))
 
     def read(self, item_id: str) -> Wallet:
-        row = self.conn.execute(
-            "SELECT address, user_id, balance_sat FROM wallets WHERE address = ?;",
-            (item_id,),
+        row = tuples(
+            self.conn.execute(
+                f"SELECT {WALLET_COLUMNS} FROM wallets WHERE address = ?;", (item_id,)
+            )
         ).fetchone()
         if row is None:
             raise NotFoundError("Wallet not found")
-        return Wallet(
-            address=str(row["address"]),
-            user_id=str(row["user_id"]),
-            balance_sat=int(row["balance_sat"]),
-        )
+        return decode_wallet(row)
 
     def update(self, item: Wallet) -> None:
         cur = self.conn.execute(
-            "UPDATE wallets SET user_id = ?, balance_sat = ? WHERE address = ?;",
+            "UPDATE wallets SET user_id = ?, balance_sat = ?, version = version + 1 "
+            "WHERE address = ?;",
             (item.user_id, item.balance_sat, item.address),
         )
+        self._invalidate(item.address)
         if cur.rowcount == 0:
             raise NotFoundError("Wallet not found")
 
     def delete(self, item_id: str) -> None:
         cur = self.conn.execute("DELETE FROM wallets WHERE address = ?;", (item_id,))
+        self._invalidate(item_id)
         if cur.rowcount == 0:
             raise NotFoundError("Wallet not found")
 
     def read_all(self) -> Iterable[Wallet]:
-        rows = self.conn.execute(
-            "SELECT address, user_id, balance_sat FROM wallets;"
+        rows = tuples(
+            self.conn.execute(f"SELECT {WALLET_COLUMNS} FROM wallets;")
         ).fetchall()
-        return [
-            Wallet(
-                address=str(r["address"]),
-                user_id=str(r["user_id"]),
-                balance_sat=int(r["balance_sat"]),
+        return [decode_wallet(r) for r in rows]
+
+    def read_by_owner(self, user_id: str) -> Iterable[Wallet]:
+        rows = tuples(
+            self.conn.execute(
+                f"SELECT {WALLET_COLUMNS} FROM wallets WHERE user_id = ?;", (user_id,)
             )
-            for r in rows
-        ]
+        ).fetchall()
+        return [decode_wallet(r) for r in rows]
+
+    def count_by_owner(self, user_id: str) -> int:
+        (cnt,) = self.conn.execute(
+            "SELECT COUNT(*) FROM wallets WHERE user_id = ?;", (user_id,)
+        ).fetchone()
+        return int(cnt)
+
+    def count_by_owners(self, user_ids: Collection[str]) -> dict[str, int]:
+        params = list(user_ids)
+        counts: dict[str, int] = {}
+        for i in range(0, len(params), MAX_PARAMS_PER_QUERY):
+            chunk = params[i : i + MAX_PARAMS_PER_QUERY]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self.conn.execute(
+                "SELECT user_id, COUNT(*) AS cnt FROM wallets "
+                f"WHERE user_id IN ({placeholders}) GROUP BY user_id;",
+                chunk,
+            ).fetchall()
+            counts.update((str(r["user_id"]), int(r["cnt"])) for r in rows)
+        return counts
+
+    def read_many(self, addresses: Collection[str]) -> Iterable[Wallet]:
+        params = list(addresses)
+        out: list[Wallet] = []
+        for i in range(0, len(params), MAX_PARAMS_PER_QUERY):
+            chunk = params[i : i + MAX_PARAMS_PER_QUERY]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = tuples(
+                self.conn.execute(
+                    f"SELECT {WALLET_COLUMNS} FROM wallets "
+                    f"WHERE address IN ({placeholders});",
+                    chunk,
+                )
+            ).fetchall()
+            out.extend(map(decode_wallet, rows))
+        return out
+
+    def update_balances(self, balances: Iterable[tuple[str, int]]) -> None:
+        changes = list(balances)
+        self.conn.executemany(
+            "UPDATE wallets SET balance_sat = ?, version = version + 1 "
+            "WHERE address = ?;",
+            ((balance, address) for address, balance in changes),
+        )
+        self._invalidate(*(address for address, _ in changes))
+
+    def move_balance(
+        self,
+        user_id: str,
+        from_address: str,
+        to_address: str,
+        amount_sat: int,
+        external_fee_sat: int,
+    ) -> int:
+        cur = self.conn.execute(
+            "UPDATE wallets SET balance_sat = balance_sat - ?, version = version + 1 "
+            "WHERE address = ? AND user_id = ? AND balance_sat >= ?;",
+            (amount_sat, from_address, user_id, amount_sat),
+        )
+        if cur.rowcount == 0:
+            self._raise_debit_error(user_id, from_address, to_address)
+
+        rows = self.conn.execute(
+            "UPDATE wallets SET balance_sat = balance_sat + ? - "
+            "CASE WHEN user_id = ? THEN 0 ELSE ? END, version = version + 1 "
+            "WHERE address = ? RETURNING user_id;",
+            (amount_sat, user_id, external_fee_sat, to_address),
+        ).fetchall()
+        self._invalidate(from_address, to_address)
+        if not rows:
+            raise NotFoundError("Wallet not found")
+        return 0 if rows[0]["user_id"] == user_id else external_fee_sat
+
+    def _raise_debit_error(
+        self, user_id: str, from_address: str, to_address: str
+    ) -> NoReturn:
+        source = self.read(from_address)
+        if source.user_id != user_id:
+            raise NotFoundError("Source wallet not found")
+        self.read(to_address)
+        raise InsufficientFundsError("Insufficient funds")
 
     def count(self) -> int:
         (cnt,) = self.conn.execute("SELECT COUNT(*) FROM wallets;").fetchone()
         return int(cnt)
+
+    def _invalidate(self, *addresses: str) -> None:
+        versions = self.versions
+        if versions is not None:
+            after_transaction(self.conn, lambda: versions.invalidate(addresses))
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from wallet.core.domain import Transaction, User, Wallet
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+MICROSECOND = timedelta(microseconds=1)
+
+TRANSACTION_COLUMNS = "id, from_address, to_address, amount_sat, fee_sat, created_at"
+WALLET_COLUMNS = "address, user_id, balance_sat, version"
+USER_COLUMNS = "id, api_key"
+
+
+def tuples(cursor: sqlite3.Cursor) -> sqlite3.Cursor:
+    cursor.row_factory = None
+    return cursor
+
+
+def to_epoch_us(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_epoch_us(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+
+def decode_transaction(row: tuple[Any, ...]) -> Transaction:
+    tx_id, from_address, to_address, amount_sat, fee_sat, created_at = row
+    return Transaction(
+        tx_id, from_address, to_address, amount_sat, fee_sat, from_epoch_us(created_at)
+    )
+
+
+def decode_wallet(row: tuple[Any, ...]) -> Wallet:
+    return Wallet(*row)
+
+
+def decode_user(row: tuple[Any, ...]) -> User:
+    return User(*row)
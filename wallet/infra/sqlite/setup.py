@@ -2,10 +2,40 @@ from __future__ import annotations
 
 import sqlite3
 
+from wallet.core.domain import BUCKET_FORMATS, Granularity
+from wallet.infra.sqlite.connection import SqliteUnitOfWork
+from wallet.infra.sqlite.rows import TRANSACTION_COLUMNS
+
+SCHEMA_VERSION = 4
+LEGACY_CREATED_AT = "created_at TEXT NOT NULL"
+CREATED_AT = "created_at INTEGER NOT NULL"
+TRANSACTIONS_TABLE = f"""(
+            id TEXT PRIMARY KEY,
+            from_address TEXT NOT NULL,
+            to_address TEXT NOT NULL,
+            amount_sat INTEGER NOT NULL,
+            fee_sat INTEGER NOT NULL,
+            {CREATED_AT},
+            FOREIGN KEY(from_address) REFERENCES wallets(address),
+            FOREIGN KEY(to_address) REFERENCES wallets(address)
+        )"""
+ROLLUP_TRIGGERS = (
+    "trg_stats_rollups_insert",
+    "trg_stats_rollups_delete",
+    "trg_stats_rollups_update",
+)
+
 
 def setup(connection: sqlite3.Connection) -> None:
+    has_rollups = _table_exists(connection, "stats_rollups")
+    retype_created_at(connection)
+    (version,) = connection.execute("PRAGMA user_version;").fetchone()
+    if version < SCHEMA_VERSION:
+        connection.executescript(
+            "".join(f"DROP TRIGGER IF EXISTS {name};" for name in ROLLUP_TRIGGERS)
+        )
     connection.executescript(
-        """
+        f"""
         CREATE TABLE IF NOT EXISTS users (
             id TEXT PRIMARY KEY,
             api_key TEXT NOT NULL UNIQUE
@@ -15,24 +45,230 @@ def setup(connection: sqlite3.Connection) -> None:
             address TEXT PRIMARY KEY,
             user_id TEXT NOT NULL,
             balance_sat INTEGER NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0,
             FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
         );
 
-        CREATE TABLE IF NOT EXISTS transactions (
-            id TEXT PRIMARY KEY,
-            from_address TEXT NOT NULL,
-            to_address TEXT NOT NULL,
-            amount_sat INTEGER NOT NULL,
-            fee_sat INTEGER NOT NULL,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY(from_address) REFERENCES wallets(address),
-            FOREIGN KEY(to_address) REFERENCES wallets(address)
-        );
+        CREATE TABLE IF NOT EXISTS transactions {TRANSACTIONS_TABLE};
 
         CREATE INDEX IF NOT EXISTS idx_wallets_user_id ON wallets(user_id);
-        CREATE INDEX IF NOT EXISTS idx_tx_from ON transactions(from_address);
-        CREATE INDEX IF NOT EXISTS idx_tx_to ON transactions(to_address);
+        DROP INDEX IF EXISTS idx_tx_from;
+        DROP INDEX IF EXISTS idx_tx_to;
+        CREATE INDEX IF NOT EXISTS idx_tx_from_created
+            ON transactions(from_address, created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_tx_to_created
+            ON transactions(to_address, created_at, id);
         CREATE INDEX IF NOT EXISTS idx_tx_created_at ON transactions(created_at);
+
+        CREATE TABLE IF NOT EXISTS platform_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            tx_count INTEGER NOT NULL,
+            total_fee_sat INTEGER NOT NULL,
+            total_volume_sat INTEGER NOT NULL
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_platform_stats_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            UPDATE platform_stats SET
+                tx_count = tx_count + 1,
+                total_fee_sat = total_fee_sat + NEW.fee_sat,
+                total_volume_sat = total_volume_sat + NEW.amount_sat
+            WHERE id = 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_platform_stats_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            UPDATE platform_stats SET
+                tx_count = tx_count - 1,
+                total_fee_sat = total_fee_sat - OLD.fee_sat,
+                total_volume_sat = total_volume_sat - OLD.amount_sat
+            WHERE id = 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_platform_stats_update
+        AFTER UPDATE OF amount_sat, fee_sat ON transactions
+        BEGIN
+            UPDATE platform_stats SET
+                total_fee_sat = total_fee_sat - OLD.fee_sat + NEW.fee_sat,
+                total_volume_sat = total_volume_sat - OLD.amount_sat + NEW.amount_sat
+            WHERE id = 1;
+        END;
+
+        CREATE TABLE IF NOT EXISTS stats_rollups (
+            granularity TEXT NOT NULL,
+            bucket_start TEXT NOT NULL,
+            tx_count INTEGER NOT NULL,
+            fee_sat INTEGER NOT NULL,
+            volume_sat INTEGER NOT NULL,
+            PRIMARY KEY (granularity, bucket_start)
+        ) WITHOUT ROWID;
         """
+        + _rollup_triggers()
     )
+    add_wallet_version(connection)
+    if connection.execute("SELECT 1 FROM platform_stats;").fetchone() is None:
+        connection.execute(
+            "INSERT OR IGNORE INTO platform_stats"
+            "(id, tx_count, total_fee_sat, total_volume_sat) "
+            "SELECT 1, COUNT(*), COALESCE(SUM(fee_sat), 0), "
+            "COALESCE(SUM(amount_sat), 0) FROM transactions;"
+        )
+    if not has_rollups:
+        seed_rollups(connection)
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
     connection.commit()
+
+
+def retype_created_at(connection: sqlite3.Connection) -> int:
+    if not _has_legacy_created_at(connection):
+        return 0
+    (foreign_keys,) = connection.execute("PRAGMA foreign_keys;").fetchone()
+    connection.execute("PRAGMA foreign_keys = OFF;")
+    try:
+        with SqliteUnitOfWork(connection):
+            if not _has_legacy_created_at(connection):
+                return 0
+            return _rebuild_transactions(connection)
+    finally:
+        connection.execute(f"PRAGMA foreign_keys = {int(foreign_keys)};")
+
+
+def _has_legacy_created_at(connection: sqlite3.Connection) -> bool:
+    row = connection.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'transactions';"
+    ).fetchone()
+    return row is not None and LEGACY_CREATED_AT in row[0]
+
+
+def _rebuild_transactions(connection: sqlite3.Connection) -> int:
+    dependents = [
+        sql
+        for (sql,) in connection.execute(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = 'transactions' "
+            "AND type IN ('index', 'trigger') AND sql IS NOT NULL;"
+        )
+    ]
+    connection.execute("DROP TABLE IF EXISTS transactions_new;")
+    connection.execute(f"CREATE TABLE transactions_new {TRANSACTIONS_TABLE};")
+    copied = connection.execute(
+        f"INSERT INTO transactions_new({TRANSACTION_COLUMNS}) "
+        "SELECT id, from_address, to_address, amount_sat, fee_sat, "
+        f"{epoch_us_sql('created_at')} FROM transactions;"
+    ).rowcount
+    connection.execute("DROP TABLE transactions;")
+    connection.execute("ALTER TABLE transactions_new RENAME TO transactions;")
+    for sql in dependents:
+        connection.execute(sql)
+    if _table_exists(connection, "stats_rollups"):
+        seed_rollups(connection)
+
+    violations = connection.execute(
+        "PRAGMA foreign_key_check(transactions);"
+    ).fetchall()
+    if violations:
+        raise sqlite3.IntegrityError(
+            f"Rebuilt transactions table has {len(violations)} foreign key violations"
+        )
+    problems = [r[0] for r in connection.execute("PRAGMA integrity_check;")]
+    if problems != ["ok"]:
+        raise sqlite3.DatabaseError(
+            "Rebuilt transactions table failed integrity_check: " + "; ".join(problems)
+        )
+    return copied
+
+
+def add_wallet_version(connection: sqlite3.Connection) -> bool:
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(wallets);")}
+    if "version" in columns:
+        return False
+    connection.execute(
+        "ALTER TABLE wallets ADD COLUMN version INTEGER NOT NULL DEFAULT 0;"
+    )
+    return True
+
+
+def epoch_us_sql(column: str) -> str:
+    has_fraction = f"substr({column}, 20, 1) = '.'"
+    whole_seconds = (
+        f"substr({column}, 1, 19) || "
+        f"substr({column}, CASE WHEN {has_fraction} THEN 27 ELSE 20 END)"
+    )
+    iso_us = (
+        f"CAST(strftime('%s', {whole_seconds}) AS INTEGER) * 1000000 + "
+        f"CASE WHEN {has_fraction} THEN CAST(substr({column}, 21, 6) AS INTEGER) "
+        "ELSE 0 END"
+    )
+    return (
+        f"(CASE WHEN typeof({column}) = 'integer' THEN {column} "
+        f"WHEN {column} GLOB '*-*' THEN {iso_us} "
+        f"ELSE CAST({column} AS INTEGER) END)"
+    )
+
+
+def bucket_sql(granularity: Granularity, column: str) -> str:
+    return f"strftime('{BUCKET_FORMATS[granularity]}', {column} / 1000000, 'unixepoch')"
+
+
+def seed_rollups(connection: sqlite3.Connection) -> None:
+    connection.execute("DELETE FROM stats_rollups;")
+    for granularity in BUCKET_FORMATS:
+        connection.execute(
+            "INSERT INTO stats_rollups"
+            "(granularity, bucket_start, tx_count, fee_sat, volume_sat) "
+            f"SELECT ?, {bucket_sql(granularity, 'created_at')} AS bucket, "
+            "COUNT(*), SUM(fee_sat), SUM(amount_sat) "
+            "FROM transactions GROUP BY bucket;",
+            (granularity,),
+        )
+
+
+def _rollup_triggers() -> str:
+    add = "\n".join(
+        f"""
+            INSERT INTO stats_rollups
+                (granularity, bucket_start, tx_count, fee_sat, volume_sat)
+            VALUES ('{g}', {bucket_sql(g, "NEW.created_at")}, 1,
+                    NEW.fee_sat, NEW.amount_sat)
+            ON CONFLICT(granularity, bucket_start) DO UPDATE SET
+                tx_count = tx_count + 1,
+                fee_sat = fee_sat + excluded.fee_sat,
+                volume_sat = volume_sat + excluded.volume_sat;"""
+        for g in BUCKET_FORMATS
+    )
+    remove = "\n".join(
+        f"""
+            UPDATE stats_rollups SET
+                tx_count = tx_count - 1,
+                fee_sat = fee_sat - OLD.fee_sat,
+                volume_sat = volume_sat - OLD.amount_sat
+            WHERE granularity = '{g}'
+                AND bucket_start = {bucket_sql(g, "OLD.created_at")};"""
+        for g in BUCKET_FORMATS
+    )
+    return f"""
+        CREATE TRIGGER IF NOT EXISTS trg_stats_rollups_insert
+        AFTER INSERT ON transactions
+        BEGIN{add}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_stats_rollups_delete
+        AFTER DELETE ON transactions
+        BEGIN{remove}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_stats_rollups_update
+        AFTER UPDATE OF amount_sat, fee_sat, created_at ON transactions
+        WHEN OLD.amount_sat != NEW.amount_sat OR OLD.fee_sat != NEW.fee_sat
+            OR OLD.created_at != NEW.created_at
+        BEGIN{remove}{add}
+        END;
+        """
+
+
+def _table_exists(connection: sqlite3.Connection, name: str) -> bool:
+    row = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (name,)
+    ).fetchone()
+    return row is not None
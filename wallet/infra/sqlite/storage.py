@@ -4,7 +4,10 @@ import sqlite3
 from dataclasses import dataclass
 
 from wallet.core.repository.storage import Storage, UnitOfWork
+from wallet.core.services.api_keys import ApiKeyCache
+from wallet.core.services.wallet_versions import WalletVersionCache
 from wallet.infra.sqlite.connection import SqliteUnitOfWork
+from wallet.infra.sqlite.repository.statistics import SqliteStatisticsRepository
 from wallet.infra.sqlite.repository.transactions import SqliteTransactionRepository
 from wallet.infra.sqlite.repository.users import SqliteUserRepository
 from wallet.infra.sqlite.repository.wallets import SqliteWalletRepository
@@ -13,15 +16,20 @@ from wallet.infra.sqlite.repository.wallets import SqliteWalletRepository
 @dataclass
 class SqliteStorage(Storage):
     conn: sqlite3.Connection
+    api_keys: ApiKeyCache | None = None
+    wallet_versions: WalletVersionCache | None = None
 
     def users(self) -> SqliteUserRepository:
-        return SqliteUserRepository(self.conn)
+        return SqliteUserRepository(self.conn, self.api_keys)
 
     def wallets(self) -> SqliteWalletRepository:
-        return SqliteWalletRepository(self.conn)
+        return SqliteWalletRepository(self.conn, self.wallet_versions)
 
     def transactions(self) -> SqliteTransactionRepository:
         return SqliteTransactionRepository(self.conn)
 
+    def statistics(self) -> SqliteStatisticsRepository:
+        return SqliteStatisticsRepository(self.conn)
+
     def uow(self) -> UnitOfWork:
         return SqliteUnitOfWork(self.conn)
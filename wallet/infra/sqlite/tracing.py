@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+from typing import Any
+
+from wallet.infra.sqlite.hooks import HookedConnection
+from wallet.telemetry import count_rows, count_statement, timed
+
+logger = logging.getLogger("wallet.sql")
+slow_logger = logging.getLogger("wallet.sql.slow")
+
+
+class TimedCursor(sqlite3.Cursor):
+    def execute(self, sql: str, parameters: Any = (), /) -> TimedCursor:
+        with timed("db"):
+            super().execute(sql, parameters)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> TimedCursor:
+        with timed("db"):
+            super().executemany(sql, seq_of_parameters)
+        return self
+
+    def fetchone(self) -> Any:
+        with timed("db"):
+            return super().fetchone()
+
+    def fetchmany(self, size: int | None = None) -> list[Any]:
+        with timed("db"):
+            return super().fetchmany(self.arraysize if size is None else size)
+
+    def fetchall(self) -> list[Any]:
+        with timed("db"):
+            return super().fetchall()
+
+
+class TimedConnection(HookedConnection):
+    def execute(self, sql: str, parameters: Any = (), /) -> TimedCursor:
+        return self.cursor(TimedCursor).execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> TimedCursor:
+        return self.cursor(TimedCursor).executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script: str, /) -> sqlite3.Cursor:
+        with timed("db"):
+            return super().executescript(sql_script)
+
+    def commit(self) -> None:
+        with timed("db"):
+            super().commit()
+
+    def rollback(self) -> None:
+        with timed("db"):
+            super().rollback()
+
+
+class TracingCursor(TimedCursor):
+    def execute(self, sql: str, parameters: Any = (), /) -> TracingCursor:
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        self._trace(sql, parameters, time.perf_counter() - start, explain=True)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> TracingCursor:
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self._trace(sql, (), time.perf_counter() - start, explain=False)
+        return self
+
+    def fetchone(self) -> Any:
+        row = super().fetchone()
+        if row is not None:
+            count_rows(1)
+        return row
+
+    def fetchmany(self, size: int | None = None) -> list[Any]:
+        rows = super().fetchmany(size)
+        count_rows(len(rows))
+        return rows
+
+    def fetchall(self) -> list[Any]:
+        rows = super().fetchall()
+        count_rows(len(rows))
+        return rows
+
+    def _trace(self, sql: str, parameters: Any, seconds: float, explain: bool) -> None:
+        count_statement()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%.3f ms %s", seconds * 1000, sql)
+
+        conn = self.connection
+        threshold = getattr(conn, "slow_query_seconds", None)
+        if threshold is None or seconds < threshold:
+            return
+        plan = _explain(conn, sql, parameters) if explain else []
+        slow_logger.warning(
+            "slow query (%.3f ms): %s%s",
+            seconds * 1000,
+            sql,
+            "".join(f"\n  {line}" for line in plan),
+        )
+
+
+class TracingConnection(TimedConnection):
+    slow_query_seconds: float | None = None
+
+    def execute(self, sql: str, parameters: Any = (), /) -> TracingCursor:
+        return self.cursor(TracingCursor).execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> TracingCursor:
+        return self.cursor(TracingCursor).executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script: str, /) -> sqlite3.Cursor:
+        count_statement()
+        return super().executescript(sql_script)
+
+
+def _explain(conn: sqlite3.Connection, sql: str, parameters: Any) -> list[str]:
+    try:
+        rows = (
+            sqlite3.Cursor(conn)
+            .execute(f"EXPLAIN QUERY PLAN {sql}", parameters)
+            .fetchall()
+        )
+    except sqlite3.Error:
+        return []
+    return [str(row[3]) for row in rows]
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import httpx
+
+from wallet.api.app import create_app
+from wallet.core.services.wallets import MAX_WALLETS_PER_USER
+from wallet.settings import Settings
+
+ENDPOINTS = ("transfer", "wallet", "history", "stats")
+DEFAULT_MIX = "transfer=40,wallet=30,history=20,stats=10"
+TRANSFER_AMOUNT_SAT = 1_000
+HISTORY_PAGE_SIZE = 50
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    users: int = 50
+    wallets_per_user: int = 2
+    requests: int = 2_000
+    concurrency: int = 16
+    mix: dict[str, int] = field(default_factory=lambda: parse_mix(DEFAULT_MIX))
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.users < 1 or self.wallets_per_user < 1:
+            raise ValueError("users and wallets_per_user must be >= 1")
+        if self.wallets_per_user > MAX_WALLETS_PER_USER:
+            raise ValueError(f"wallets_per_user must be <= {MAX_WALLETS_PER_USER}")
+        if self.requests < 0 or self.concurrency < 1:
+            raise ValueError("requests must be >= 0 and concurrency >= 1")
+
+
+@dataclass(frozen=True)
+class SeededUser:
+    api_key: str
+    addresses: list[str]
+
+
+@dataclass(frozen=True)
+class EndpointReport:
+    name: str
+    count: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    elapsed_seconds: float
+    endpoints: list[EndpointReport]
+
+    @property
+    def total_requests(self) -> int:
+        return sum(e.count for e in self.endpoints)
+
+    @property
+    def total_errors(self) -> int:
+        return sum(e.errors for e in self.endpoints)
+
+    @property
+    def throughput(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.total_requests / self.elapsed_seconds
+
+
+def parse_mix(text: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for part in text.split(","):
+        name, sep, weight = part.partition("=")
+        name = name.strip()
+        if not sep or name not in ENDPOINTS or not weight.strip().isdigit():
+            raise ValueError(f"Invalid mix entry: {part!r}")
+        mix[name] = int(weight)
+    if sum(mix.values()) == 0:
+        raise ValueError("Mix weights must not all be zero")
+    return mix
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+@asynccontextmanager
+async def in_process_client(settings: Settings) -> AsyncIterator[httpx.AsyncClient]:
+    app = create_app(settings)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://loadtest"
+        ) as client,
+    ):
+        yield client
+
+
+async def seed_users(
+    client: httpx.AsyncClient, profile: LoadProfile
+) -> list[SeededUser]:
+    semaphore = asyncio.Semaphore(profile.concurrency)
+
+    async def seed_user() -> SeededUser:
+        async with semaphore:
+            r = await client.post("/users")
+            r.raise_for_status()
+            api_key = r.json()["api_key"]
+            addresses: list[str] = []
+            for _ in range(profile.wallets_per_user):
+                r = await client.post("/wallets", headers={"X-API-KEY": api_key})
+                r.raise_for_status()
+                addresses.append(r.json()["address"])
+            return SeededUser(api_key=api_key, addresses=addresses)
+
+    return list(await asyncio.gather(*(seed_user() for _ in range(profile.users))))
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    profile: LoadProfile,
+    admin_api_key: str,
+    users: list[SeededUser],
+) -> LoadReport:
+    rng = random.Random(profile.seed)
+    names = list(profile.mix)
+    weights = [profile.mix[name] for name in names]
+    all_addresses = [a for user in users for a in user.addresses]
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    errors: dict[str, int] = dict.fromkeys(names, 0)
+
+    def request_for(name: str) -> Callable[[], Awaitable[httpx.Response]]:
+        user = rng.choice(users)
+        headers = {"X-API-KEY": user.api_key}
+        if name == "transfer":
+            from_address = rng.choice(user.addresses)
+            to_address = rng.choice(all_addresses)
+            while to_address == from_address and len(all_addresses) > 1:
+                to_address = rng.choice(all_addresses)
+            payload = {
+                "from_address": from_address,
+                "to_address": to_address,
+                "amount_sat": TRANSFER_AMOUNT_SAT,
+            }
+            return lambda: client.post("/transactions", json=payload, headers=headers)
+        if name == "wallet":
+            address = rng.choice(user.addresses)
+            return lambda: client.get(f"/wallets/{address}", headers=headers)
+        if name == "history":
+            params = {"limit": HISTORY_PAGE_SIZE}
+            return lambda: client.get("/transactions", params=params, headers=headers)
+        admin = {"X-API-KEY": admin_api_key}
+        return lambda: client.get("/statistics", headers=admin)
+
+    remaining = profile.requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            (name,) = rng.choices(names, weights)
+            send = request_for(name)
+            start = time.perf_counter()
+            try:
+                response = await send()
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append((time.perf_counter() - start) * 1_000)
+            errors[name] += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(profile.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return LoadReport(
+        elapsed_seconds=elapsed,
+        endpoints=[
+            EndpointReport(
+                name=name,
+                count=len(latencies[name]),
+                errors=errors[name],
+                p50_ms=percentile(latencies[name], 50),
+                p95_ms=percentile(latencies[name], 95),
+                p99_ms=percentile(latencies[name], 99),
+            )
+            for name in names
+        ],
+    )
+
+
+def format_report(report: LoadReport) -> list[str]:
+    lines = [
+        f"{'endpoint':<10} {'requests':>9} {'errors':>7} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    ]
+    lines.extend(
+        f"{e.name:<10} {e.count:>9} {e.errors:>7} "
+        f"{e.p50_ms:>9.2f} {e.p95_ms:>9.2f} {e.p99_ms:>9.2f}"
+        for e in report.endpoints
+    )
+    lines.append(
+        f"{report.total_requests} requests, {report.total_errors} errors "
+        f"in {report.elapsed_seconds:.2f}s ({report.throughput:.0f} req/s)"
+    )
+    return lines
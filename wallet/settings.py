@@ -1,10 +1,90 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from decimal import Decimal
 from pathlib import Path
 
+JOURNAL_MODES = frozenset({"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"})
+SYNCHRONOUS_LEVELS = frozenset({"OFF", "NORMAL", "FULL", "EXTRA"})
+TEMP_STORES = frozenset({"DEFAULT", "FILE", "MEMORY"})
+STORAGE_BACKENDS = frozenset({"sqlite", "memory"})
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    journal_mode: str = "WAL"
+    synchronous: str = "FULL"
+    mmap_size: int = 0
+    cache_size: int = -2_000
+    temp_store: str = "DEFAULT"
+    busy_timeout_ms: int = 30_000
+    wal_autocheckpoint: int = 1_000
+
+    def __post_init__(self) -> None:
+        if self.journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Unknown journal_mode: {self.journal_mode}")
+        if self.synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Unknown synchronous level: {self.synchronous}")
+        if self.temp_store not in TEMP_STORES:
+            raise ValueError(f"Unknown temp_store: {self.temp_store}")
+        if self.mmap_size < 0 or self.busy_timeout_ms < 0:
+            raise ValueError("mmap_size and busy_timeout_ms must be >= 0")
+
+
+DURABLE_PROFILE = StorageProfile()
+THROUGHPUT_PROFILE = StorageProfile(
+    journal_mode="WAL",
+    synchronous="NORMAL",
+    mmap_size=256 * 1024 * 1024,
+    cache_size=-64_000,
+    temp_store="MEMORY",
+    wal_autocheckpoint=4_000,
+)
+STORAGE_PROFILES = {
+    "durable": DURABLE_PROFILE,
+    "throughput": THROUGHPUT_PROFILE,
+}
+
 
 @dataclass(frozen=True)
 class Settings:
     database_path: Path
     admin_api_key: str = "ADMIN-API-KEY"
+    storage_profile: StorageProfile = DURABLE_PROFILE
+    price_ttl_seconds: float = 30.0
+    price_stale_while_revalidate_seconds: float = 30.0
+    price_max_staleness_seconds: float = 300.0
+    pool_size: int = 8
+    read_pool_size: int = 8
+    pool_timeout_seconds: float = 30.0
+    statement_cache_size: int = 256
+    group_commit: bool = False
+    group_commit_window_ms: float = 2.0
+    group_commit_max_batch: int = 256
+    storage_backend: str = "sqlite"
+    stub_usd_per_btc: Decimal | None = None
+    api_key_cache_size: int = 10_000
+    api_key_cache_ttl_seconds: float = 60.0
+    api_key_negative_ttl_seconds: float = 5.0
+    wallet_version_cache_size: int = 10_000
+    wallet_version_cache_ttl_seconds: float = 5.0
+    metrics: bool = True
+    debug: bool = False
+    sql_trace: bool = False
+    slow_query_ms: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.storage_backend not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown storage_backend: {self.storage_backend}")
+        if self.group_commit and self.storage_backend != "sqlite":
+            raise ValueError("group_commit requires the sqlite storage backend")
+        if self.api_key_cache_size < 0:
+            raise ValueError("api_key_cache_size must be >= 0")
+        if self.wallet_version_cache_size < 0:
+            raise ValueError("wallet_version_cache_size must be >= 0")
+        if self.slow_query_ms is not None and self.slow_query_ms < 0:
+            raise ValueError("slow_query_ms must be >= 0")
+
+    @property
+    def trace_sql(self) -> bool:
+        return self.sql_trace or self.debug or self.slow_query_ms is not None
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Literal
+
+Phase = Literal["db", "price", "serialization", "lock_wait"]
+PHASES: tuple[Phase, ...] = ("db", "price", "serialization", "lock_wait")
+
+
+@dataclass
+class RequestTimings:
+    seconds: dict[Phase, float] = field(
+        default_factory=lambda: dict.fromkeys(PHASES, 0.0)
+    )
+    statements: int = 0
+    rows: int = 0
+
+    def add(self, phase: Phase, seconds: float) -> None:
+        self.seconds[phase] += seconds
+
+
+@dataclass
+class LevelGauge:
+    value: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def inc(self) -> None:
+        with self._lock:
+            self.value += 1
+
+    def dec(self) -> None:
+        with self._lock:
+            self.value -= 1
+
+
+current_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "current_timings", default=None
+)
+lock_waiters = LevelGauge()
+
+
+def record(phase: Phase, seconds: float) -> None:
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+def count_statement() -> None:
+    timings = current_timings.get()
+    if timings is not None:
+        timings.statements += 1
+
+
+def count_rows(rows: int) -> None:
+    timings = current_timings.get()
+    if timings is not None:
+        timings.rows += rows
+
+
+class PhaseTimer:
+    __slots__ = ("phase", "start", "timings")
+
+    def __init__(self, phase: Phase, timings: RequestTimings) -> None:
+        self.phase = phase
+        self.timings = timings
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.timings.add(self.phase, time.perf_counter() - self.start)
+
+
+NO_TIMER: AbstractContextManager[None] = nullcontext()
+
+
+def timed(phase: Phase) -> AbstractContextManager[None]:
+    timings = current_timings.get()
+    if timings is None:
+        return NO_TIMER
+    return PhaseTimer(phase, timings)
+
+
+@contextmanager
+def waiting_for_lock() -> Iterator[None]:
+    lock_waiters.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        lock_waiters.dec()
+        record("lock_wait", time.perf_counter() - start)